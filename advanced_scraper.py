@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
-import requests
 from bs4 import BeautifulSoup
+from async_fetcher import get_fetcher
 import time
 import json
 import re
@@ -45,10 +45,14 @@ def try_alternative_data_sources():
     for approach in approaches:
         print(f"\n📡 Trying {approach['name']}...")
         
-        for url in approach['urls']:
+        # The approach's URLs are fetched together, then checked in order
+        responses = get_fetcher().get_many(approach['urls'], timeout=10)
+        
+        for url, response in zip(approach['urls'], responses):
             try:
                 print(f"  Testing: {url}")
-                response = requests.get(url, timeout=10)
+                if isinstance(response, Exception):
+                    raise response
                 print(f"    Status: {response.status_code}")
                 
                 if response.status_code == 200:
@@ -1,26 +1,27 @@
 #!/usr/bin/env python3
 
-import requests
-from bs4 import BeautifulSoup
-import time
 import random
 import json
-import re
-from datetime import datetime
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+import os
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import WebDriverPool
+from page_readiness import PageReadiness, PERFORMANCE_LOGGING
+from browser_profiles import apply_profile, start_session
+from collection_orchestrator import HostLimiter
+from async_fetcher import get_fetcher
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline
+from snapshot_cache import SnapshotCache
+from draw_extraction import DrawExtractor, game_type_for_url, get_extraction_plans
 import warnings
 warnings.filterwarnings('ignore')
 
 class AdvancedPowerBallScraper:
-    def __init__(self):
+    def __init__(self, driver_pool=None, fetcher=None, browser_profile='full'):
         self.base_url = "https://www.nationallottery.co.za/results"
         self.data_dir = "data"
         self.powerball_file = os.path.join(self.data_dir, "powerball_data.csv")
@@ -28,49 +29,84 @@ class AdvancedPowerBallScraper:
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = DrawStore(self.data_dir)
         
         # PowerBall number ranges
         self.main_numbers_range = (1, 50)  # 5 numbers from 1-50
         self.powerball_range = (1, 20)     # 1 powerball from 1-20
         
+        # Keep-alive HTTP connections shared with every other collector
+        self.fetcher = fetcher or get_fetcher()
+        
+        # Warm Chrome sessions shared by every page; created on first use.
+        # browser_profile='lean' blocks images, fonts, styles and trackers.
+        self.browser_profile = browser_profile
+        self.driver_pool = driver_pool
+        self._owns_driver_pool = driver_pool is None
+        
+        # Waits on page conditions instead of fixed sleeps, and spaces out page loads
+        self.readiness = PageReadiness()
+        self.host_limiter = HostLimiter(max_per_host=1, min_interval=2.0)
+        
+        # Draw parsing shared with the other collectors, reusing the
+        # extraction plan each results page was last parsed with
+        self.extractor = DrawExtractor(plans=get_extraction_plans())
+        
+    def stealth_options(self):
+        """Chrome options with stealth features"""
+        chrome_options = Options()
+            
+        # Stealth options
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Normal browser options
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--start-maximized")
+        
+        # User agent
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        
+        # Additional stealth
+        chrome_options.add_argument("--disable-web-security")
+        chrome_options.add_argument("--allow-running-insecure-content")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-plugins")
+        chrome_options.add_argument("--disable-images")  # Faster loading
+        
+        # Network events for idle detection
+        chrome_options.set_capability(*PERFORMANCE_LOGGING)
+        return apply_profile(chrome_options, self.browser_profile)
+    
+    def hide_webdriver(self, driver):
+        """Execute stealth script on a new session"""
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        start_session(driver, self.browser_profile)
+    
+    def get_driver_pool(self):
+        """Get the driver pool, creating a private one if none was passed in"""
+        if self.driver_pool is None:
+            self.driver_pool = WebDriverPool(size=1, options_factory=self.stealth_options, on_create=self.hide_webdriver)
+        return self.driver_pool
+    
     def setup_stealth_driver(self):
-        """Setup Chrome driver with stealth features"""
+        """Get a Chrome session with stealth features from the driver pool"""
         try:
-            chrome_options = Options()
-            
-            # Stealth options
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Normal browser options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--start-maximized")
-            
-            # User agent
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            # Additional stealth
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--allow-running-insecure-content")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")  # Faster loading
-            
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Execute stealth script
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            return driver
+            return self.get_driver_pool().acquire()
         except Exception as e:
             print(f"Error setting up stealth driver: {e}")
             return None
     
+    def close(self):
+        """Quit the pooled sessions if this scraper started them"""
+        if self._owns_driver_pool and self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
+    
     def try_requests_with_rotation(self):
         """Try requests with different approaches"""
         print("🔄 Trying requests with rotation...")
@@ -114,49 +150,42 @@ class AdvancedPowerBallScraper:
             "https://www.nationallottery.co.za/",
         ]
         
-        for url in urls_to_try:
-            print(f"  Testing: {url}")
+        # Every URL is tried at once with one set of headers; the ones that
+        # fail move on to the next set. Pacing and retries are the fetcher's job.
+        pending = urls_to_try
+        for i, headers in enumerate(headers_list):
+            if not pending:
+                break
+            print(f"  Attempt {i+1} with headers on {len(pending)} URLs...")
+            responses = self.fetcher.get_many(pending, headers=headers, timeout=20, allow_redirects=True)
             
-            for i, headers in enumerate(headers_list):
+            failed = []
+            for url, response in zip(pending, responses):
+                print(f"  Testing: {url}")
+                if isinstance(response, Exception):
+                    print(f"    ❌ Error: {response}")
+                    failed.append(url)
+                    continue
+                
                 try:
-                    print(f"    Attempt {i+1} with headers...")
-                    
-                    # Create session
-                    session = requests.Session()
-                    session.headers.update(headers)
-                    
-                    # Add random delay
-                    time.sleep(random.uniform(1, 3))
-                    
-                    # Make request
-                    response = session.get(url, timeout=20, allow_redirects=True)
-                    
                     print(f"    Status: {response.status_code}")
                     print(f"    Content-Type: {response.headers.get('content-type', 'Unknown')}")
                     print(f"    Content-Length: {len(response.content)}")
                     
                     if response.status_code == 200:
-                        # Check if we got lottery data
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        text = soup.get_text()
-                        
-                        # Look for lottery numbers
-                        numbers = re.findall(r'\b(\d{1,2})\b', text)
-                        if len(numbers) > 20:  # Likely lottery data
-                            print(f"    ✅ Found potential lottery data! {len(numbers)} numbers")
-                            
-                            # Try to extract draws
-                            draws = self.extract_draws_from_soup(soup, url)
-                            if draws:
-                                print(f"    ✅ Extracted {len(draws)} draws!")
-                                return draws
+                        # Try to extract draws
+                        draws = self.extract_draws(response.content, url)
+                        if draws:
+                            print(f"    ✅ Extracted {len(draws)} draws!")
+                            return draws
                         
                         print(f"    ⚠️  No clear lottery data found")
                     
                 except Exception as e:
                     print(f"    ❌ Error: {e}")
-                
-                time.sleep(random.uniform(2, 5))  # Random delay between attempts
+                failed.append(url)
+            
+            pending = failed
         
         return []
     
@@ -180,15 +209,16 @@ class AdvancedPowerBallScraper:
                 print(f"  Testing: {url}")
                 
                 try:
-                    # Navigate to page
-                    driver.get(url)
+                    # Navigate to page, no sooner than min_interval after the last one
+                    with self.host_limiter.slot(url):
+                        driver.get(url)
                     
-                    # Wait for page to load
-                    time.sleep(random.uniform(3, 6))
+                    # Wait for page to load (replaces a 3-6s random sleep)
+                    rows = self.readiness.wait_for_results(driver, replaces=4.5)
                     
                     # Scroll to load content
                     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
+                    rows = self.readiness.wait_for_more_rows(driver, rows, replaces=2)
                     
                     # Try to find and click "Load More" or similar buttons
                     try:
@@ -206,170 +236,36 @@ class AdvancedPowerBallScraper:
                                 if load_more.is_displayed():
                                     print(f"    Found load more button: {selector}")
                                     driver.execute_script("arguments[0].click();", load_more)
-                                    time.sleep(3)
+                                    self.readiness.wait_for_more_rows(driver, rows, replaces=3)
                                     break
                             except:
                                 continue
                     except:
                         pass
                     
-                    # Get page source
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    
-                    # Extract draws
-                    draws = self.extract_draws_from_soup(soup, url)
+                    # Extract draws from the page source
+                    draws = self.extract_draws(driver.page_source, url)
                     if draws:
                         print(f"    ✅ Extracted {len(draws)} draws from {url}")
                         all_draws.extend(draws)
                     else:
                         print(f"    ❌ No draws found in {url}")
                     
-                    # Random delay between pages
-                    time.sleep(random.uniform(2, 5))
-                    
                 except Exception as e:
                     print(f"    ❌ Error with {url}: {e}")
             
             return all_draws
             
         finally:
-            driver.quit()
+            self.driver_pool.release(driver, WebDriverPool.is_healthy(driver))
     
-    def extract_draws_from_soup(self, soup, url):
-        """Extract draws from BeautifulSoup object"""
-        draws = []
-        
-        # Determine game type from URL
-        game_type = "PowerBall Plus" if "plus" in url.lower() else "PowerBall"
-        
-        # Try different selectors
-        selectors_to_try = [
-            'table tr',
-            '.results-table tr',
-            '.draw-item',
-            '.result-item',
-            '.lottery-result',
-            'tr[data-draw]',
-            '.draw-row',
-            '[class*="result"]',
-            '[class*="draw"]',
-            '.number',
-            '.ball'
-        ]
-        
-        for selector in selectors_to_try:
-            elements = soup.select(selector)
-            if elements:
-                print(f"    Found {len(elements)} elements with selector: {selector}")
-                
-                for element in elements:
-                    try:
-                        draw_data = self.extract_draw_from_element(element, game_type)
-                        if draw_data:
-                            draws.append(draw_data)
-                    except Exception as e:
-                        continue
-                
-                if draws:
-                    break
-        
+    def extract_draws(self, page, url):
+        """Extract draws from a page's HTML (or a BeautifulSoup object)"""
+        draws = self.extractor.extract(page, game_type_for_url(url), source=url)
+        for draw_data in draws:
+            draw_data['source'] = 'web_scraping'
         return draws
     
-    def extract_draw_from_element(self, element, game_type):
-        """Extract draw data from a single element"""
-        try:
-            text = element.get_text(strip=True)
-            if not text or len(text) < 10:
-                return None
-            
-            # Look for date patterns
-            date_patterns = [
-                r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-                r'(\d{1,2}\s+\w+\s+\d{4})',
-                r'(\w+\s+\d{1,2},?\s+\d{4})',
-                r'(\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2})'
-            ]
-            
-            draw_date = None
-            for pattern in date_patterns:
-                date_match = re.search(pattern, text)
-                if date_match:
-                    draw_date = self.parse_draw_date(date_match.group(1))
-                    if draw_date:
-                        break
-            
-            if not draw_date:
-                return None
-            
-            # Extract numbers
-            main_numbers, powerballs = self.extract_numbers_from_text(text)
-            
-            # Validate we have the right number of numbers
-            if len(main_numbers) >= 5 and len(powerballs) >= 1:
-                # Take first 5 main numbers and first powerball
-                main_numbers = sorted(main_numbers[:5])
-                powerball = powerballs[0]
-                
-                # Validate ranges
-                if all(self.main_numbers_range[0] <= n <= self.main_numbers_range[1] for n in main_numbers):
-                    if self.powerball_range[0] <= powerball <= self.powerball_range[1]:
-                        return {
-                            'draw_date': draw_date,
-                            'main_numbers': main_numbers,
-                            'powerball': powerball,
-                            'game_type': game_type,
-                            'draw_day': draw_date.strftime('%A'),
-                            'source': 'web_scraping'
-                        }
-            
-        except Exception as e:
-            return None
-        
-        return None
-    
-    def parse_draw_date(self, date_str):
-        """Parse various date formats"""
-        try:
-            date_str = date_str.strip().replace('\n', ' ').replace('\t', ' ')
-            date_str = re.sub(r'\s+', ' ', date_str)
-            
-            formats = [
-                "%d %B %Y",      # 15 January 2024
-                "%d %b %Y",      # 15 Jan 2024
-                "%d/%m/%Y",      # 15/01/2024
-                "%Y-%m-%d",      # 2024-01-15
-                "%d-%m-%Y",      # 15-01-2024
-                "%B %d, %Y",     # January 15, 2024
-                "%b %d, %Y",     # Jan 15, 2024
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            # Try to extract date from string
-            date_match = re.search(r'(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{4})', date_str)
-            if date_match:
-                day, month, year = date_match.groups()
-                return datetime(int(year), int(month), int(day))
-                
-        except Exception as e:
-            pass
-            
-        return None
-    
-    def extract_numbers_from_text(self, text):
-        """Extract numbers from text content"""
-        numbers = re.findall(r'\b(\d{1,2})\b', text)
-        numbers = [int(n) for n in numbers if n.isdigit()]
-        
-        main_numbers = [n for n in numbers if self.main_numbers_range[0] <= n <= self.main_numbers_range[1]]
-        powerballs = [n for n in numbers if self.powerball_range[0] <= n <= self.powerball_range[1]]
-        
-        return main_numbers, powerballs
-    
     def collect_real_data(self):
         """Main method to collect real data using advanced techniques"""
         print("🚀 Advanced PowerBall Data Collection")
@@ -389,7 +285,12 @@ class AdvancedPowerBallScraper:
         # Try Selenium if requests failed
         if not all_draws:
             print("\n2. Trying Selenium stealth...")
-            draws = self.try_selenium_stealth()
+            self.readiness.reset()
+            try:
+                draws = self.try_selenium_stealth()
+            finally:
+                self.close()
+            print(self.readiness.summary())
             if draws:
                 print(f"✅ Selenium method found {len(draws)} draws")
                 all_draws.extend(draws)
@@ -400,29 +301,9 @@ class AdvancedPowerBallScraper:
         if all_draws:
             print(f"\n💾 Saving {len(all_draws)} real draws...")
             
-            # Separate by game type
-            powerball_draws = [d for d in all_draws if d['game_type'] == 'PowerBall']
-            powerball_plus_draws = [d for d in all_draws if d['game_type'] == 'PowerBall Plus']
-            
-            # Save individual files
-            if powerball_draws:
-                df_pb = pd.DataFrame(powerball_draws)
-                df_pb = df_pb.sort_values('draw_date', ascending=False)
-                df_pb.to_csv(self.powerball_file, index=False)
-                print(f"✅ Saved {len(powerball_draws)} PowerBall draws")
-            
-            if powerball_plus_draws:
-                df_pbp = pd.DataFrame(powerball_plus_draws)
-                df_pbp = df_pbp.sort_values('draw_date', ascending=False)
-                df_pbp.to_csv(self.powerball_plus_file, index=False)
-                print(f"✅ Saved {len(powerball_plus_draws)} PowerBall Plus draws")
-            
-            # Save combined data
-            df_all = pd.DataFrame(all_draws)
-            df_all = df_all.sort_values('draw_date', ascending=False)
-            combined_file = os.path.join(self.data_dir, "all_powerball_data.csv")
-            df_all.to_csv(combined_file, index=False)
-            print(f"✅ Saved {len(all_draws)} total draws to {combined_file}")
+            # Validated, and only draws the store doesn't have yet are written
+            report = DrawPipeline(self.store).run(all_draws)
+            print(f"✅ Added {report['stored']} new draws to {self.store.combined_file}")
             
             # Show sample
             print(f"\n📋 Sample of real data:")
@@ -434,8 +315,26 @@ class AdvancedPowerBallScraper:
             print("\n❌ No real data could be collected")
             return []
 
+    def replay_snapshots(self, snapshot_cache=None, save=True):
+        """Run extraction and the draw pipeline over every page in the snapshot
+        cache, with no network. Useful for reprocessing after a parser change
+        and for benchmarking the parsing pipeline. save=False stores nothing."""
+        snapshot_cache = snapshot_cache or SnapshotCache()
+        print(f"🔁 Replaying {len(snapshot_cache.latest_snapshots())} cached pages...")
+        
+        def snapshot_draws():
+            # One page in memory at a time
+            for snapshot in snapshot_cache.latest_snapshots():
+                draws = self.extract_draws(snapshot_cache.body(snapshot), snapshot['url'])
+                print(f"  {snapshot['url']} ({snapshot['fetched_at']}): {len(draws)} draws")
+                yield from draws
+        
+        # A bulk reload: put the files back in date order at the end
+        report = DrawPipeline(self.store if save else None, compact=True).run(snapshot_draws())
+        print(self.extractor.plans.summary())
+        return report
+
 if __name__ == "__main__":
-    import os
     scraper = AdvancedPowerBallScraper()
     scraper.collect_real_data()
 
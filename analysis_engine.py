@@ -9,11 +9,29 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import json
 import os
+import hashlib
+from draw_arrays import DrawArrays, unseen_draws, lagged_coincidences, MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+from monte_carlo_engine import MonteCarloEngine
+from randomness_tests import run_randomness_tests
+from analytics_cube import AnalyticsCube
+from decay_scores import DecayedFrequencyScores, DEFAULT_HALF_LIVES
+from online_regression import FeatureTrends
+from bayesian_model import DirichletNumberModel
+from result_cache import cached_result
 
 class PowerBallAnalyzer:
-    def __init__(self, data_file="data/all_powerball_data.csv"):
+    def __init__(self, data_file="data/all_powerball_data.csv", monte_carlo=None, trend_thresholds=None, result_cache=None):
         self.data_file = data_file
+        self.result_cache = result_cache
         self.data = None
+        self._dataset_version = None
+        self.monte_carlo = monte_carlo
+        self.trend_thresholds = trend_thresholds
+        self._draw_arrays = {}
+        self._cube = None
+        self._decay_scores = {}
+        self._feature_trends = {}
+        self._bayesian_models = {}
         self.load_data()
         
     def load_data(self):
@@ -22,14 +40,76 @@ class PowerBallAnalyzer:
             if os.path.exists(self.data_file):
                 df = pd.read_csv(self.data_file)
                 df['draw_date'] = pd.to_datetime(df['draw_date'])
-                self.data = df
+                # Newest first; the store appends new draws at the end of the file
+                self.data = df.sort_values('draw_date', ascending=False, kind='stable').reset_index(drop=True)
             else:
                 print(f"Data file {self.data_file} not found. Please run data collection first.")
                 self.data = pd.DataFrame()
         except Exception as e:
             print(f"Error loading data: {e}")
             self.data = pd.DataFrame()
+        self._dataset_version = None
+        self._draw_arrays = {}
+        self._cube = None
+        self._decay_scores = {}
+        self._feature_trends = {}
+        self._bayesian_models = {}
     
+    def get_dataset_version(self):
+        """Short hash of the loaded draws, used to key cached results"""
+        if self._dataset_version is None:
+            hashed = pd.util.hash_pandas_object(self.data, index=False).to_numpy() if not self.data.empty else np.empty(0)
+            self._dataset_version = hashlib.sha1(hashed.tobytes()).hexdigest()[:12]
+        return self._dataset_version
+    
+    def apply_new_draws(self, new_draws):
+        """Append newly collected draws and fold them into the running statistics.
+        
+        Draws later than everything already loaded update the cube, decay
+        scores, trend accumulators and posteriors in place. A draw older than
+        the latest loaded one (a backfill) drops that game's running state
+        instead, so it is rebuilt on next use.
+        """
+        new_draws = unseen_draws(self.data, new_draws)
+        if new_draws.empty:
+            return 0
+        
+        previous = {game_type: self.get_draw_arrays(game_type) for game_type in new_draws['game_type'].dropna().unique()}
+        self.data = pd.concat([new_draws, self.data], ignore_index=True)
+        self.data = self.data.sort_values('draw_date', ascending=False, kind='stable').reset_index(drop=True)
+        self._dataset_version = None
+        self._draw_arrays = {}
+        
+        for game_type, old_arrays in previous.items():
+            arrays = DrawArrays.from_frame(new_draws, game_type)
+            if self._cube is not None:
+                self._cube.add_draws(game_type, arrays)
+            bayesian_keys = [key for key in self._bayesian_models if key[0] == game_type]
+            
+            if len(old_arrays) and len(arrays) and arrays.draw_dates[0] <= old_arrays.draw_dates[-1]:
+                self._decay_scores.pop(game_type, None)
+                self._feature_trends.pop(game_type, None)
+                for key in bayesian_keys:
+                    del self._bayesian_models[key]
+                continue
+            
+            for main, powerball, draw_date in zip(arrays.main, arrays.powerball, arrays.draw_dates):
+                if game_type in self._decay_scores:
+                    self._decay_scores[game_type].update(main, powerball, draw_date)
+                if game_type in self._feature_trends:
+                    self._feature_trends[game_type].append(main, powerball)
+                for key in bayesian_keys:
+                    self._bayesian_models[key].update(main, powerball)
+        
+        return len(new_draws)
+    
+    def get_draw_arrays(self, game_type="PowerBall"):
+        """Get the parsed, chronologically ordered draw arrays for a game"""
+        if game_type not in self._draw_arrays:
+            self._draw_arrays[game_type] = DrawArrays.from_frame(self.data, game_type)
+        return self._draw_arrays[game_type]
+    
+    @cached_result
     def get_frequency_analysis(self, game_type="PowerBall"):
         """Analyze frequency of numbers"""
         if self.data.empty:
@@ -87,6 +167,7 @@ class PowerBallAnalyzer:
             'least_frequent_powerball': powerball_counter.most_common()[-10:]
         }
     
+    @cached_result
     def get_pattern_analysis(self, game_type="PowerBall"):
         """Analyze patterns in the data"""
         if self.data.empty:
@@ -157,8 +238,14 @@ class PowerBallAnalyzer:
         
         return patterns
     
-    def get_trend_analysis(self, game_type="PowerBall", days=30):
-        """Analyze recent trends"""
+    @cached_result
+    def get_trend_analysis(self, game_type="PowerBall", days=30, as_of=None):
+        """Analyze recent trends: the draws in the days up to as_of.
+        
+        as_of defaults to the game's latest draw, so the window depends
+        only on the data and a cached report stays right until new draws
+        arrive; pass a date for a window ending somewhere else.
+        """
         if self.data.empty:
             return {}
         
@@ -167,8 +254,9 @@ class PowerBallAnalyzer:
             return {}
         
         # Get recent data
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_data = game_data[game_data['draw_date'] >= cutoff_date]
+        as_of = game_data['draw_date'].max() if as_of is None else pd.Timestamp(as_of)
+        cutoff_date = as_of - timedelta(days=days)
+        recent_data = game_data[(game_data['draw_date'] >= cutoff_date) & (game_data['draw_date'] <= as_of)]
         
         if recent_data.empty:
             return {}
@@ -193,49 +281,293 @@ class PowerBallAnalyzer:
         cold_numbers.sort(key=lambda x: x[1])
         cold_numbers = cold_numbers[:10]
         
+        # Trend lines over the same window, straight from the running accumulators
+        trends = self.get_feature_trends(game_type)
+        start, stop = self._window(game_type, cutoff_date, as_of)
+        
         return {
             'period_days': days,
+            'as_of': as_of.strftime('%Y-%m-%d'),
             'total_draws': len(recent_data),
             'hot_numbers': hot_numbers,
             'cold_numbers': cold_numbers,
-            'trend_direction': self._calculate_trend_direction(recent_data)
+            'trend_direction': self._calculate_trend_direction(game_type, start, stop),
+            'feature_trends': trends.report(start, stop),
+            'full_history_trends': trends.report(),
+            'sliding_window_trends': trends.sliding_report()
         }
     
+    @cached_result
     def get_draw_day_analysis(self, game_type="PowerBall"):
-        """Analyze patterns by draw day"""
+        """Analyze patterns by draw day.
+        
+        Days come from draw_date through the analytics cube, not the stored
+        draw_day column, so rows without a valid date or valid numbers are
+        not counted; ties in the frequency lists are ordered by number.
+        """
         if self.data.empty:
             return {}
         
-        game_data = self.data[self.data['game_type'] == game_type].copy()
-        if game_data.empty:
+        day_analysis = {}
+        for day, cell in self.get_analytics_cube().breakdown('weekday', game_type).items():
+            day_analysis[day] = self._summarize_cube_cell(cell, top_n=5)
+        
+        return day_analysis
+    
+    @cached_result
+    def get_period_analysis(self, game_type="PowerBall", period="month", **filters):
+        """Analyze patterns by weekday, month or year from the analytics cube"""
+        if self.data.empty:
             return {}
         
-        day_analysis = {}
+        return {
+            value: self._summarize_cube_cell(cell, top_n=5)
+            for value, cell in self.get_analytics_cube().breakdown(period, game_type, **filters).items()
+        }
+    
+    @cached_result
+    def get_drilldown_analysis(self, game_type=None, weekday=None, month=None, year=None):
+        """Analyze any slice of the data, e.g. Fridays in 2024 for PowerBall Plus"""
+        if self.data.empty:
+            return {}
         
-        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            day_data = game_data[game_data['draw_day'] == day]
-            if day_data.empty:
-                continue
-            
-            # Analyze numbers for this day
-            day_numbers = []
-            for numbers_str in day_data['main_numbers']:
-                try:
-                    numbers = eval(numbers_str) if isinstance(numbers_str, str) else numbers_str
-                    day_numbers.extend(numbers)
-                except:
-                    continue
-            
-            day_counter = Counter(day_numbers)
-            
-            day_analysis[day] = {
-                'total_draws': len(day_data),
-                'most_frequent': day_counter.most_common(5),
-                'least_frequent': day_counter.most_common()[-5:],
-                'avg_sum': np.mean([sum(eval(numbers_str) if isinstance(numbers_str, str) else numbers_str) for numbers_str in day_data['main_numbers']])
+        cell = self.get_analytics_cube().query(game_type, weekday, month, year)
+        if not cell['draws']:
+            return {}
+        
+        summary = self._summarize_cube_cell(cell, top_n=10)
+        summary['filters'] = {'game_type': game_type, 'weekday': weekday, 'month': month, 'year': year}
+        summary['main_counts'] = cell['main_counts'].tolist()
+        summary['powerball_counts'] = cell['powerball_counts'].tolist()
+        return summary
+    
+    def get_analytics_cube(self):
+        """Get the pre-aggregated (game_type, weekday, month, year) cube"""
+        if self._cube is None:
+            self._cube = AnalyticsCube.from_frame(self.data)
+        return self._cube
+    
+    def _summarize_cube_cell(self, cell, top_n=5):
+        """Turn aggregated cube counts into the report format"""
+        main_counts = cell['main_counts']
+        # Most common first, ties broken by number
+        order = np.lexsort((np.arange(MAIN_NUMBERS), -main_counts))
+        drawn = [(int(i + 1), int(main_counts[i])) for i in order if main_counts[i] > 0]
+        
+        return {
+            'total_draws': cell['draws'],
+            'most_frequent': drawn[:top_n],
+            'least_frequent': drawn[-top_n:],
+            'avg_sum': cell['avg_sum']
+        }
+    
+    @cached_result
+    def get_significance_analysis(self, game_type="PowerBall", n_histories=None):
+        """Test the frequency, pattern and draw day statistics against a uniform null model"""
+        arrays = self.get_draw_arrays(game_type)
+        if len(arrays) == 0:
+            return {}
+        
+        if self.monte_carlo is None:
+            cache_file = os.path.join(os.path.dirname(self.data_file), "monte_carlo_cache.npz")
+            self.monte_carlo = MonteCarloEngine(cache_file=cache_file)
+        engine = self.monte_carlo
+        
+        statistics = engine.evaluate(arrays, n_histories)
+        frequency_stats = [s for s in statistics if s.startswith(('main_', 'powerball_'))]
+        
+        # Each draw day's sub-history is itself a uniform history of that length
+        draw_day = {}
+        for day in pd.unique(arrays.draw_days):
+            day_stats = engine.evaluate(arrays.subset(arrays.draw_days == day), n_histories)
+            draw_day[day] = {
+                'total_draws': int((arrays.draw_days == day).sum()),
+                'avg_sum': day_stats['sum_mean'],
+                'main_chi_square': day_stats['main_chi_square'],
+                'main_max_frequency': day_stats['main_max_frequency']
             }
         
-        return day_analysis
+        return {
+            'total_draws': len(arrays),
+            'n_histories': n_histories or engine.n_histories,
+            'confidence': engine.confidence,
+            'frequency': {s: statistics[s] for s in frequency_stats},
+            'pattern': {s: v for s, v in statistics.items() if s not in frequency_stats},
+            'number_bands': engine.number_frequency_bands(arrays, n_histories),
+            'draw_day': draw_day
+        }
+    
+    @cached_result
+    def get_randomness_analysis(self, game_types=None, n_permutations=2000, seed=None):
+        """Run the randomness test suite on each game's history"""
+        if self.data.empty:
+            return {}
+        
+        if game_types is None:
+            game_types = sorted(self.data['game_type'].dropna().unique())
+        
+        report = {}
+        for game_type in game_types:
+            results = run_randomness_tests(self.get_draw_arrays(game_type), n_permutations, seed)
+            if results:
+                report[game_type] = results
+        
+        return report
+    
+    @cached_result
+    def get_lag_analysis(self, game_type="PowerBall", max_lag=10):
+        """Analyze how often numbers repeat from 1..max_lag draws back"""
+        arrays = self.get_draw_arrays(game_type)
+        n_draws = len(arrays)
+        if n_draws < 2:
+            return {}
+        
+        # Every lag at once from the autocorrelation of each number's 0/1 series
+        main_repeats = lagged_coincidences(arrays.incidence, max_lag)
+        powerball_repeats = lagged_coincidences(arrays.powerball_incidence, max_lag)
+        max_lag = len(main_repeats) - 1
+        
+        main_p = NUMBERS_PER_DRAW / MAIN_NUMBERS
+        powerball_p = 1 / POWERBALL_NUMBERS
+        pairs = n_draws - np.arange(max_lag + 1)
+        
+        lags = []
+        for k in range(1, max_lag + 1):
+            lags.append({
+                'lag': k,
+                'pairs': int(pairs[k]),
+                'main_repeats': int(main_repeats[k].sum()),
+                'main_rate': float(main_repeats[k].sum() / pairs[k]),
+                'expected_main_rate': NUMBERS_PER_DRAW * main_p,
+                'powerball_repeats': int(powerball_repeats[k].sum()),
+                'powerball_rate': float(powerball_repeats[k].sum() / pairs[k]),
+                'expected_powerball_rate': powerball_p
+            })
+        
+        # Per-number autocorrelation: lag-k co-occurrence rate against p^2
+        frequency = main_repeats[0] / n_draws
+        variance = frequency * (1 - frequency)
+        coincidence_rate = main_repeats[1:] / pairs[1:, None]
+        autocorrelation = np.divide(coincidence_rate - frequency ** 2, variance,
+                                    out=np.zeros_like(coincidence_rate), where=variance > 0)
+        
+        numbers = []
+        for num in range(1, MAIN_NUMBERS + 1):
+            numbers.append({
+                'number': num,
+                'frequency': int(main_repeats[0, num - 1]),
+                'repeats': main_repeats[1:, num - 1].tolist(),
+                'expected_repeats': (pairs[1:] * main_p ** 2).tolist(),
+                'autocorrelation': autocorrelation[:, num - 1].tolist()
+            })
+        
+        lag1 = main_repeats[1] if max_lag >= 1 else np.zeros(MAIN_NUMBERS)
+        return {
+            'total_draws': n_draws,
+            'max_lag': max_lag,
+            'lags': lags,
+            'numbers': numbers,
+            'most_repeated_lag1': sorted(((i + 1, int(c)) for i, c in enumerate(lag1)), key=lambda x: -x[1])[:10]
+        }
+    
+    @cached_result
+    def get_cross_game_analysis(self, game_types=("PowerBall", "PowerBall Plus")):
+        """Compare two games drawn on the same dates"""
+        first, second = (self.get_draw_arrays(game_type) for game_type in game_types)
+        if len(first) == 0 or len(second) == 0:
+            return {}
+        
+        # Align the two histories by draw date once
+        first_dates, first_index = np.unique(first.draw_dates, return_index=True)
+        second_dates, second_index = np.unique(second.draw_dates, return_index=True)
+        dates, a, b = np.intersect1d(first_dates, second_dates, assume_unique=True, return_indices=True)
+        first_rows, second_rows = first_index[a], second_index[b]
+        n_dates = len(dates)
+        if n_dates == 0:
+            return {}
+        
+        first_incidence = first.incidence[first_rows].astype(np.int32)
+        second_incidence = second.incidence[second_rows].astype(np.int32)
+        
+        # Shared main numbers per date and the number x number joint frequency table
+        shared = (first_incidence * second_incidence).sum(axis=1)
+        joint = first_incidence.T @ second_incidence
+        powerball_matches = first.powerball[first_rows] == second.powerball[second_rows]
+        
+        # Per-draw features for both games, correlated in one corrcoef call
+        feature_names = ['sum', 'even_count', 'low_count', 'powerball']
+        features = []
+        for arrays, rows in ((first, first_rows), (second, second_rows)):
+            main = arrays.main[rows]
+            features.extend([
+                main.sum(axis=1),
+                (main % 2 == 0).sum(axis=1),
+                (main <= MAIN_NUMBERS // 2).sum(axis=1),
+                arrays.powerball[rows]
+            ])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = np.corrcoef(np.array(features, dtype=np.float64))
+        n_features = len(feature_names)
+        
+        main_p = NUMBERS_PER_DRAW / MAIN_NUMBERS
+        return {
+            'game_types': list(game_types),
+            'aligned_draws': n_dates,
+            'date_range': [str(dates[0])[:10], str(dates[-1])[:10]],
+            'shared_numbers': {
+                'mean': float(shared.mean()),
+                'expected_mean': NUMBERS_PER_DRAW * main_p,
+                'distribution': {int(k): int(v) for k, v in enumerate(np.bincount(shared, minlength=NUMBERS_PER_DRAW + 1))}
+            },
+            'powerball_match_rate': float(powerball_matches.mean()),
+            'expected_powerball_match_rate': 1 / POWERBALL_NUMBERS,
+            'joint_frequency': [
+                {'number': num, 'joint': int(joint[num - 1, num - 1]), 'expected': n_dates * main_p ** 2}
+                for num in range(1, MAIN_NUMBERS + 1)
+            ],
+            'joint_matrix': joint.tolist(),
+            'feature_correlation': {
+                name: float(np.nan_to_num(correlation[i, n_features + i]))
+                for i, name in enumerate(feature_names)
+            }
+        }
+    
+    def get_decay_scores(self, game_type="PowerBall", half_lives=None):
+        """Get the running time-decayed frequency scores for a game"""
+        scores = self._decay_scores.get(game_type)
+        if scores is None or (half_lives and not set(half_lives) <= set(scores.half_lives)):
+            wanted = tuple(sorted(set(half_lives or DEFAULT_HALF_LIVES) | set(scores.half_lives if scores else ())))
+            scores = DecayedFrequencyScores.from_arrays(self.get_draw_arrays(game_type), wanted)
+            self._decay_scores[game_type] = scores
+        return scores
+    
+    @cached_result
+    def get_decayed_frequency_analysis(self, game_type="PowerBall", half_lives=None):
+        """Analyze number frequencies with recent draws weighted more heavily"""
+        scores = self.get_decay_scores(game_type, half_lives)
+        if scores.n_draws == 0:
+            return {}
+        
+        return {
+            'total_draws': scores.n_draws,
+            'half_lives': {h: scores.summary(h) for h in (half_lives or scores.half_lives)}
+        }
+    
+    def get_bayesian_model(self, game_type="PowerBall", decay=1.0):
+        """Get the Dirichlet posterior number model for a game"""
+        key = (game_type, decay)
+        if key not in self._bayesian_models:
+            self._bayesian_models[key] = DirichletNumberModel.from_arrays(self.get_draw_arrays(game_type), decay=decay)
+        return self._bayesian_models[key]
+    
+    @cached_result
+    def get_bayesian_analysis(self, game_type="PowerBall", decay=1.0, level=0.9):
+        """Posterior inclusion probabilities with credible intervals per number"""
+        model = self.get_bayesian_model(game_type, decay)
+        if model.n_draws == 0:
+            return {}
+        
+        return model.summary(level)
     
     def get_analysis(self, analysis_type="frequency"):
         """Get analysis based on type"""
@@ -247,9 +579,22 @@ class PowerBallAnalyzer:
             return self.get_trend_analysis()
         elif analysis_type == "draw_day":
             return self.get_draw_day_analysis()
+        elif analysis_type == "significance":
+            return self.get_significance_analysis()
+        elif analysis_type == "randomness":
+            return self.get_randomness_analysis()
+        elif analysis_type == "lag":
+            return self.get_lag_analysis()
+        elif analysis_type == "cross_game":
+            return self.get_cross_game_analysis()
+        elif analysis_type == "decayed_frequency":
+            return self.get_decayed_frequency_analysis()
+        elif analysis_type == "bayesian":
+            return self.get_bayesian_analysis()
         else:
             return {}
     
+    @cached_result
     def get_draw_history(self, limit=50):
         """Get recent draw history"""
         if self.data.empty:
@@ -274,38 +619,29 @@ class PowerBallAnalyzer:
         
         return history
     
-    def _calculate_trend_direction(self, data):
-        """Calculate if numbers are trending up or down"""
-        try:
-            # Calculate average sum over time
-            sums = []
-            for numbers_str in data['main_numbers']:
-                try:
-                    numbers = eval(numbers_str) if isinstance(numbers_str, str) else numbers_str
-                    sums.append(sum(numbers))
-                except:
-                    continue
-            
-            if len(sums) < 2:
-                return "insufficient_data"
-            
-            # Simple linear trend
-            x = np.arange(len(sums))
-            y = np.array(sums)
-            
-            # Calculate slope
-            slope = np.polyfit(x, y, 1)[0]
-            
-            if slope > 1:
-                return "increasing"
-            elif slope < -1:
-                return "decreasing"
-            else:
-                return "stable"
-                
-        except:
-            return "unknown"
+    def _calculate_trend_direction(self, game_type, start=0, stop=None):
+        """Calculate if draw sums are trending up or down over draw indexes [start, stop)"""
+        trends = self.get_feature_trends(game_type)
+        fit = trends.window_fit('sum', start, stop)
+        if fit['n'] < 2:
+            return "insufficient_data"
+        return trends.classify('sum', fit['slope'])
     
+    def _window(self, game_type, start_date, end_date):
+        """Draw indexes [start, stop) of the draws from start_date to end_date"""
+        dates = self.get_draw_arrays(game_type).draw_dates
+        return (int(np.searchsorted(dates, np.datetime64(start_date, 'ns'))),
+                int(np.searchsorted(dates, np.datetime64(end_date, 'ns'), side='right')))
+    
+    def get_feature_trends(self, game_type="PowerBall"):
+        """Get the running trend-line accumulators for a game"""
+        if game_type not in self._feature_trends:
+            self._feature_trends[game_type] = FeatureTrends.from_arrays(
+                self.get_draw_arrays(game_type), thresholds=self.trend_thresholds
+            )
+        return self._feature_trends[game_type]
+    
+    @cached_result
     def create_frequency_chart(self, game_type="PowerBall"):
         """Create frequency visualization"""
         freq_data = self.get_frequency_analysis(game_type)
@@ -345,6 +681,7 @@ class PowerBallAnalyzer:
         
         return fig.to_json()
     
+    @cached_result
     def create_pattern_chart(self, game_type="PowerBall"):
         """Create pattern visualization"""
         pattern_data = self.get_pattern_analysis(game_type)
@@ -394,6 +731,74 @@ class PowerBallAnalyzer:
         
         return fig.to_json()
 
+    @cached_result
+    def create_lag_chart(self, game_type="PowerBall", max_lag=10):
+        """Create lag-k repeat rate visualization"""
+        lag_data = self.get_lag_analysis(game_type, max_lag)
+        if not lag_data:
+            return None
+        
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=('Main Numbers Repeated from k Draws Back', 'PowerBall Repeated from k Draws Back'),
+            vertical_spacing=0.1
+        )
+        
+        lags = [item['lag'] for item in lag_data['lags']]
+        for row, prefix in ((1, 'main'), (2, 'powerball')):
+            fig.add_trace(
+                go.Bar(x=lags, y=[item[f'{prefix}_rate'] for item in lag_data['lags']], name='Observed'),
+                row=row, col=1
+            )
+            fig.add_trace(
+                go.Scatter(x=lags, y=[item[f'expected_{prefix}_rate'] for item in lag_data['lags']],
+                           mode='lines', name='Expected'),
+                row=row, col=1
+            )
+        
+        fig.update_layout(
+            title=f'Lag Repeat Analysis - {game_type}',
+            height=800,
+            showlegend=False
+        )
+        
+        return fig.to_json()
+
+    @cached_result
+    def create_cross_game_chart(self, game_types=("PowerBall", "PowerBall Plus")):
+        """Create cross-game comparison visualization"""
+        cross_data = self.get_cross_game_analysis(game_types)
+        if not cross_data:
+            return None
+        
+        fig = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=('Joint Number Frequency', 'Shared Numbers per Draw Date'),
+            column_widths=[0.6, 0.4]
+        )
+        
+        numbers = list(range(1, MAIN_NUMBERS + 1))
+        fig.add_trace(
+            go.Heatmap(z=cross_data['joint_matrix'], x=numbers, y=numbers, colorscale='Viridis'),
+            row=1, col=1
+        )
+        
+        distribution = cross_data['shared_numbers']['distribution']
+        fig.add_trace(
+            go.Bar(x=list(distribution.keys()), y=list(distribution.values()), name='Shared Numbers'),
+            row=1, col=2
+        )
+        
+        fig.update_xaxes(title_text=game_types[1], row=1, col=1)
+        fig.update_yaxes(title_text=game_types[0], row=1, col=1)
+        fig.update_layout(
+            title=f'Cross-Game Analysis - {game_types[0]} vs {game_types[1]}',
+            height=600,
+            showlegend=False
+        )
+        
+        return fig.to_json()
+
 if __name__ == "__main__":
     analyzer = PowerBallAnalyzer()
     
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from draw_arrays import DrawArrays, MAIN_NUMBERS, POWERBALL_NUMBERS
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+# Cube axes, in storage order
+DIMENSIONS = ('game_type', 'weekday', 'month', 'year')
+
+
+class AnalyticsCube:
+    """Pre-aggregated per-number counts keyed by (game_type, weekday, month, year).
+
+    Every measure is a dense array over the four dimensions, so any slice or
+    roll-up is a small NumPy sum instead of a filter over the draws frame.
+    """
+
+    def __init__(self):
+        self.game_types = []
+        self.years = []
+        self._allocate(0, 0)
+
+    def _allocate(self, n_games, n_years):
+        shape = (n_games, len(WEEKDAYS), len(MONTHS), n_years)
+        self.draws = np.zeros(shape, dtype=np.int64)
+        self.sum_totals = np.zeros(shape, dtype=np.int64)
+        self.main_counts = np.zeros(shape + (MAIN_NUMBERS,), dtype=np.int64)
+        self.powerball_counts = np.zeros(shape + (POWERBALL_NUMBERS,), dtype=np.int64)
+        self._query_cache = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        cube = cls()
+        cube.add_frame(df)
+        return cube
+
+    def add_frame(self, df):
+        """Fold every game in a draws DataFrame into the cube"""
+        if df is None or df.empty:
+            return
+        for game_type in df['game_type'].dropna().unique():
+            self.add_draws(game_type, DrawArrays.from_frame(df, game_type))
+
+    def add_draws(self, game_type, arrays):
+        """Fold new draws of one game into the cube in a single bincount pass"""
+        if len(arrays) == 0:
+            return
+
+        dates = pd.DatetimeIndex(arrays.draw_dates)
+        self._ensure_axes(game_type, np.unique(dates.year))
+
+        game = self.game_types.index(game_type)
+        n_years = len(self.years)
+        year = dates.year.to_numpy() - self.years[0]
+        cells = ((dates.weekday.to_numpy() * len(MONTHS) + dates.month.to_numpy() - 1) * n_years + year)
+        n_cells = len(WEEKDAYS) * len(MONTHS) * n_years
+        cell_shape = (len(WEEKDAYS), len(MONTHS), n_years)
+
+        self.draws[game] += np.bincount(cells, minlength=n_cells).reshape(cell_shape)
+        self.sum_totals[game] += np.bincount(cells, weights=arrays.main.sum(axis=1), minlength=n_cells).astype(np.int64).reshape(cell_shape)
+
+        main_index = (cells[:, None] * MAIN_NUMBERS + arrays.main - 1).ravel()
+        self.main_counts[game] += np.bincount(main_index, minlength=n_cells * MAIN_NUMBERS).reshape(cell_shape + (MAIN_NUMBERS,))
+
+        powerball_index = cells * POWERBALL_NUMBERS + arrays.powerball - 1
+        self.powerball_counts[game] += np.bincount(powerball_index, minlength=n_cells * POWERBALL_NUMBERS).reshape(cell_shape + (POWERBALL_NUMBERS,))
+
+        self._query_cache = {}
+
+    def _ensure_axes(self, game_type, years):
+        """Grow the game and year axes to cover new values"""
+        years = [int(y) for y in years]
+        if game_type in self.game_types and self.years and self.years[0] <= min(years) and max(years) <= self.years[-1]:
+            return
+
+        old_games, old_years = len(self.game_types), self.years
+        if game_type not in self.game_types:
+            self.game_types.append(game_type)
+        all_years = (old_years or years) + years
+        self.years = list(range(min(all_years), max(all_years) + 1))
+
+        measures = (self.draws, self.sum_totals, self.main_counts, self.powerball_counts)
+        self._allocate(len(self.game_types), len(self.years))
+        if old_games and old_years:
+            offset = old_years[0] - self.years[0]
+            years_slice = slice(offset, offset + len(old_years))
+            for new, old in zip((self.draws, self.sum_totals, self.main_counts, self.powerball_counts), measures):
+                new[:old_games, :, :, years_slice] = old
+
+    def _selector(self, dimension, value):
+        """Translate a filter value into an index (or slice for "all")"""
+        if value is None:
+            return slice(None)
+        if isinstance(value, (list, tuple)):
+            return [self._selector(dimension, v) for v in value]
+        if dimension == 'game_type':
+            return self.game_types.index(value)
+        if dimension == 'weekday':
+            if isinstance(value, str):
+                return WEEKDAYS.index(value)
+            if not 0 <= int(value) < len(WEEKDAYS):
+                raise ValueError(f"Weekdays are 0 (Monday) to 6 (Sunday), not {value}")
+            return int(value)
+        if dimension == 'month':
+            if isinstance(value, str):
+                return MONTHS.index(value)
+            if not 1 <= int(value) <= len(MONTHS):
+                raise ValueError(f"Months are 1 to 12, not {value}")
+            return int(value) - 1
+        if int(value) not in self.years:
+            raise ValueError(f"No draws in {value}")
+        return int(value) - self.years[0]
+
+    def query(self, game_type=None, weekday=None, month=None, year=None):
+        """Aggregate measures for a slice; None means roll up that dimension"""
+        key = tuple(tuple(v) if isinstance(v, list) else v for v in (game_type, weekday, month, year))
+        if key in self._query_cache:
+            return self._query_cache[key]
+
+        try:
+            selectors = [self._selector(d, v) for d, v in zip(DIMENSIONS, (game_type, weekday, month, year))]
+        except ValueError:
+            selectors = None
+
+        if selectors is None or not self.game_types:
+            result = {
+                'draws': 0,
+                'sum_total': 0,
+                'main_counts': np.zeros(MAIN_NUMBERS, dtype=np.int64),
+                'powerball_counts': np.zeros(POWERBALL_NUMBERS, dtype=np.int64)
+            }
+        else:
+            # Apply list filters one axis at a time so they never broadcast together
+            draws, sum_totals, main_counts, powerball_counts = self.draws, self.sum_totals, self.main_counts, self.powerball_counts
+            for axis, selector in enumerate(selectors):
+                index = (slice(None),) * axis + (selector if isinstance(selector, list) else
+                                                  [selector] if isinstance(selector, int) else selector,)
+                draws, sum_totals = draws[index], sum_totals[index]
+                main_counts, powerball_counts = main_counts[index], powerball_counts[index]
+            result = {
+                'draws': int(draws.sum()),
+                'sum_total': int(sum_totals.sum()),
+                'main_counts': main_counts.reshape(-1, MAIN_NUMBERS).sum(axis=0),
+                'powerball_counts': powerball_counts.reshape(-1, POWERBALL_NUMBERS).sum(axis=0)
+            }
+
+        result['avg_sum'] = result['sum_total'] / result['draws'] if result['draws'] else 0.0
+        self._query_cache[key] = result
+        return result
+
+    def breakdown(self, dimension, game_type=None, **filters):
+        """Aggregate measures for every value of one dimension"""
+        if dimension == 'weekday':
+            values = WEEKDAYS
+        elif dimension == 'month':
+            values = MONTHS
+        elif dimension == 'year':
+            values = self.years
+        else:
+            values = self.game_types
+
+        breakdown = {}
+        for value in values:
+            selection = dict(filters, game_type=game_type)
+            selection[dimension] = value
+            result = self.query(**selection)
+            if result['draws']:
+                breakdown[value] = result
+        return breakdown
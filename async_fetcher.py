@@ -0,0 +1,193 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from snapshot_cache import SnapshotCache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+# Statuses worth another try; anything else is handed back to the caller
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; returns how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class AsyncFetcher:
+    """HTTP GETs over one shared keep-alive connection pool.
+
+    Requests run on a requests.Session (so its pooled connections are
+    reused across pages and collectors) through asyncio.to_thread, on an
+    event loop owned by the fetcher. Each host gets a concurrency limit
+    and a token bucket, and failures are retried with jittered
+    exponential backoff instead of fixed sleeps.
+
+    With a snapshot_cache every 200 response is stored, refetches are
+    conditional (a 304 is answered from the stored copy), and responses
+    carry `unchanged` when the content hash matches the last fetch. With
+    replay=True pages come from the snapshot cache and the network is
+    never touched.
+
+    Coroutines (fetch, fetch_all) can be awaited from async code; get and
+    get_many are blocking wrappers for the existing synchronous collectors
+    and are safe to call from several threads at once.
+    """
+
+    def __init__(self, headers=None, max_per_host=4, rate=2.0, burst=4, retries=3,
+                 backoff=0.5, max_backoff=10.0, timeout=20, pool_size=10, snapshot_cache=None, replay=False):
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.max_per_host = max_per_host
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+        if replay and snapshot_cache is None:
+            raise ValueError("replay=True needs a snapshot_cache to replay pages from")
+        self.snapshot_cache = snapshot_cache
+        self.replay = replay
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._semaphores = {}
+        self._buckets = {}
+        self._loop = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.retries_made = 0
+
+    def _host_limits(self, url):
+        host = urlparse(url).netloc
+        # asyncio semaphores belong to one loop; the rate limit is shared by all
+        key = (id(asyncio.get_running_loop()), host)
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self.max_per_host)
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._semaphores[key], self._buckets[host]
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given retry (0-based)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _get(self, url, headers, timeout, **kwargs):
+        merged = dict(self.headers)
+        if self.snapshot_cache is not None:
+            merged.update(self.snapshot_cache.conditional_headers(url))
+        merged.update(headers or {})
+        self.requests_made += 1
+        response = self.session.get(url, headers=merged, timeout=timeout or self.timeout, **kwargs)
+        if self.snapshot_cache is not None:
+            response = self.snapshot_cache.store_response(url, response)
+        return response
+
+    async def fetch(self, url, headers=None, timeout=None, **kwargs):
+        """GET a URL, retrying connection errors and retryable statuses.
+
+        Returns the final response (whatever its status) or raises the last
+        error once the retries run out.
+        """
+        if self.replay:
+            return self.snapshot_cache.replay(url)
+
+        semaphore, bucket = self._host_limits(url)
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                delay = bucket.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    response = await asyncio.to_thread(self._get, url, headers, timeout, **kwargs)
+                    if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                        return response
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt == self.retries:
+                        raise
+
+            self.retries_made += 1
+            await asyncio.sleep(self.backoff_delay(attempt))
+
+    async def fetch_all(self, urls, headers=None, timeout=None, **kwargs):
+        """Fetch URLs concurrently; failures come back as exceptions in place"""
+        return await asyncio.gather(
+            *(self.fetch(url, headers, timeout, **kwargs) for url in urls),
+            return_exceptions=True
+        )
+
+    def _event_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='fetch')
+                loop.set_default_executor(self._executor)
+                threading.Thread(target=loop.run_forever, name='async-fetcher', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coroutine):
+        """Run a coroutine on the fetcher's loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop()).result()
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """Blocking fetch()"""
+        return self.run(self.fetch(url, headers, timeout, **kwargs))
+
+    def get_many(self, urls, headers=None, timeout=None, **kwargs):
+        """Blocking fetch_all()"""
+        return self.run(self.fetch_all(urls, headers, timeout, **kwargs))
+
+    def close(self):
+        """Stop the event loop and close pooled connections"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._executor.shutdown(wait=False)
+        self.session.close()
+        self._semaphores = {}
+        self._buckets = {}
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_fetcher():
+    """The process-wide fetcher every collector shares by default, snapshotting to data/snapshots"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = AsyncFetcher(snapshot_cache=SnapshotCache())
+        return _shared_fetcher
@@ -0,0 +1,131 @@
+import numpy as np
+from scipy import stats
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+
+
+class DirichletNumberModel:
+    """Dirichlet posteriors over which numbers a draw picks.
+
+    The share of main-number picks going to each of the 50 numbers, and the
+    probability of each of the 20 powerballs, get symmetric Dirichlet priors
+    that are updated conjugately by adding counts, O(50) per draw. With
+    decay < 1 older evidence is discounted by that factor per draw before
+    each update, so the posterior tracks recent draws. Each number's
+    marginal is a Beta distribution, which gives the credible intervals.
+    """
+
+    def __init__(self, prior=1.0, powerball_prior=1.0, decay=1.0):
+        self.prior = float(prior)
+        self.powerball_prior = float(powerball_prior)
+        self.decay = float(decay)
+        self.main_counts = np.zeros(MAIN_NUMBERS)
+        self.powerball_counts = np.zeros(POWERBALL_NUMBERS)
+        self.n_draws = 0
+
+    @classmethod
+    def from_arrays(cls, arrays, prior=1.0, powerball_prior=1.0, decay=1.0):
+        """Build the posterior for a whole history in one pass"""
+        model = cls(prior, powerball_prior, decay)
+        n_draws = len(arrays)
+        if n_draws == 0:
+            return model
+
+        weights = model.decay ** np.arange(n_draws - 1, -1, -1, dtype=np.float64)
+        model.main_counts = weights @ arrays.incidence
+        model.powerball_counts = weights @ arrays.powerball_incidence
+        model.n_draws = n_draws
+        return model
+
+    def update(self, main_numbers, powerball):
+        """Fold one new draw into the posterior"""
+        if self.decay != 1.0:
+            self.main_counts *= self.decay
+            self.powerball_counts *= self.decay
+        self.main_counts[np.asarray(main_numbers) - 1] += 1
+        self.powerball_counts[int(powerball) - 1] += 1
+        self.n_draws += 1
+
+    @property
+    def main_alpha(self):
+        return self.prior + self.main_counts
+
+    @property
+    def powerball_alpha(self):
+        return self.powerball_prior + self.powerball_counts
+
+    def posterior_means(self):
+        """Posterior mean inclusion probability per main number and powerball"""
+        main_alpha, powerball_alpha = self.main_alpha, self.powerball_alpha
+        return (NUMBERS_PER_DRAW * main_alpha / main_alpha.sum(),
+                powerball_alpha / powerball_alpha.sum())
+
+    def _marginals(self, alpha):
+        return stats.beta(alpha, alpha.sum() - alpha)
+
+    def credible_intervals(self, level=0.9):
+        """Equal-tailed credible intervals of each number's inclusion probability"""
+        tail = (1 - level) / 2
+        main = self._marginals(self.main_alpha)
+        powerball = self._marginals(self.powerball_alpha)
+        return (NUMBERS_PER_DRAW * np.stack([main.ppf(tail), main.ppf(1 - tail)], axis=1),
+                np.stack([powerball.ppf(tail), powerball.ppf(1 - tail)], axis=1))
+
+    def prob_above_uniform(self):
+        """Posterior probability that each number is drawn more often than uniform"""
+        return (self._marginals(self.main_alpha).sf(1 / MAIN_NUMBERS),
+                self._marginals(self.powerball_alpha).sf(1 / POWERBALL_NUMBERS))
+
+    def sample_tickets(self, count=5, rng=None):
+        """Draw whole tickets from the posterior predictive in batch.
+
+        Every ticket gets its own probability vector from the posterior, then
+        five distinct main numbers are taken from it with the Gumbel top-k
+        trick and the powerball with a Gumbel argmax.
+        """
+        rng = rng or np.random.default_rng()
+        main_theta = rng.dirichlet(self.main_alpha, size=count)
+        powerball_theta = rng.dirichlet(self.powerball_alpha, size=count)
+
+        keys = np.log(np.maximum(main_theta, 1e-300)) + rng.gumbel(size=main_theta.shape)
+        main = np.sort(np.argpartition(-keys, NUMBERS_PER_DRAW, axis=1)[:, :NUMBERS_PER_DRAW], axis=1) + 1
+        keys = np.log(np.maximum(powerball_theta, 1e-300)) + rng.gumbel(size=powerball_theta.shape)
+        powerballs = keys.argmax(axis=1) + 1
+        return main, powerballs
+
+    def summary(self, level=0.9, top_n=10):
+        """Posterior means, credible intervals and hot/cold numbers"""
+        main_mean, powerball_mean = self.posterior_means()
+        main_interval, powerball_interval = self.credible_intervals(level)
+        main_hot, powerball_hot = self.prob_above_uniform()
+        main_order = np.argsort(-main_hot, kind='stable')
+        powerball_order = np.argsort(-powerball_hot, kind='stable')
+
+        return {
+            'total_draws': self.n_draws,
+            'effective_draws': float(self.powerball_counts.sum()),
+            'credible_level': level,
+            'decay': self.decay,
+            'main_numbers': [
+                {
+                    'number': num + 1,
+                    'posterior_mean': float(main_mean[num]),
+                    'credible_interval': [float(main_interval[num, 0]), float(main_interval[num, 1])],
+                    'prob_above_expected': float(main_hot[num])
+                }
+                for num in range(MAIN_NUMBERS)
+            ],
+            'powerballs': [
+                {
+                    'number': num + 1,
+                    'posterior_mean': float(powerball_mean[num]),
+                    'credible_interval': [float(powerball_interval[num, 0]), float(powerball_interval[num, 1])],
+                    'prob_above_expected': float(powerball_hot[num])
+                }
+                for num in range(POWERBALL_NUMBERS)
+            ],
+            'hot_numbers': [(int(n + 1), float(main_hot[n])) for n in main_order[:top_n]],
+            'cold_numbers': [(int(n + 1), float(main_hot[n])) for n in main_order[::-1][:top_n]],
+            'hot_powerballs': [(int(n + 1), float(powerball_hot[n])) for n in powerball_order[:top_n]],
+            'expected_main_rate': NUMBERS_PER_DRAW / MAIN_NUMBERS,
+            'expected_powerball_rate': 1 / POWERBALL_NUMBERS
+        }
@@ -0,0 +1,111 @@
+import time
+import numpy as np
+
+PROFILES = ('full', 'lean')
+
+# Chrome content settings: 2 = block. The results table needs none of these.
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.stylesheets': 2,
+    'profile.managed_default_content_settings.fonts': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.notifications': 2,
+    'profile.managed_default_content_settings.geolocation': 2,
+}
+
+# Requests dropped through DevTools on every lean session
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css', '*.mp4', '*.webm',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*facebook.com/tr*', '*hotjar.com*', '*clarity.ms*',
+]
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+    "--window-size=1024,768",
+    "--disk-cache-size=1048576",
+    "--media-cache-size=1048576",
+    "--disable-background-networking",
+    "--mute-audio",
+]
+
+
+def apply_profile(chrome_options, profile='full'):
+    """Add a profile's arguments and preferences to Chrome options.
+
+    'full' leaves the options alone. 'lean' blocks every non-document
+    resource it can through preferences, disables extensions, and
+    shrinks the viewport and caches; a later --window-size wins over an
+    earlier one.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{profile}'; expected one of {PROFILES}")
+    if profile == 'lean':
+        for argument in LEAN_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option('prefs', LEAN_PREFS)
+    return chrome_options
+
+
+def start_session(driver, profile='full'):
+    """Per-session setup for a profile; use as (part of) WebDriverPool's on_create"""
+    if profile == 'lean':
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Could not enable request blocking: {e}")
+
+
+def compare_profiles(urls, profiles=PROFILES, runs=3, user_agent=None):
+    """Load each URL runs times per profile on a fresh session, cache cleared
+    between loads, and report mean page-load time and bytes transferred."""
+    from driver_pool import WebDriverPool, headless_options
+    from page_readiness import PageReadiness
+
+    readiness = PageReadiness()
+    results = {}
+    for profile in profiles:
+        pool = WebDriverPool(
+            size=1,
+            options_factory=lambda profile=profile: headless_options(user_agent, profile=profile),
+            on_create=lambda driver, profile=profile: start_session(driver, profile)
+        )
+        loads = []
+        try:
+            with pool.driver() as driver:
+                driver.execute_cdp_cmd('Network.enable', {})
+                for _ in range(runs):
+                    for url in urls:
+                        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                        readiness.traffic(driver)  # drain anything logged before this load
+                        start = time.time()
+                        driver.get(url)
+                        rows = readiness.wait_for_results(driver)
+                        elapsed = time.time() - start
+                        # The readiness poller drains the performance log, so it keeps the tally
+                        loads.append(dict(readiness.traffic(driver), seconds=elapsed, rows=rows))
+        finally:
+            pool.close()
+
+        results[profile] = {
+            'loads': len(loads),
+            'page_load_seconds': float(np.mean([l['seconds'] for l in loads])),
+            'bytes': float(np.mean([l['bytes'] for l in loads])),
+            'requests': float(np.mean([l['requests'] for l in loads])),
+            'blocked': float(np.mean([l['blocked'] for l in loads])),
+            'result_rows': float(np.mean([l['rows'] for l in loads]))
+        }
+
+    print(f"{'profile':<8} {'load (s)':>9} {'KB':>10} {'requests':>9} {'blocked':>8} {'rows':>6}")
+    for profile, r in results.items():
+        print(f"{profile:<8} {r['page_load_seconds']:>9.2f} {r['bytes'] / 1024:>10.1f} "
+              f"{r['requests']:>9.1f} {r['blocked']:>8.1f} {r['result_rows']:>6.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    base_url = "https://www.nationallottery.co.za/results"
+    compare_profiles([f"{base_url}/powerball", f"{base_url}/powerball-plus"])
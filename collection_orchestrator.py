@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# One result page to fetch: scrape(url, game_type) returns a list of draw dicts
+PageJob = namedtuple('PageJob', ['game_type', 'url', 'scrape'])
+
+
+class HostLimiter:
+    """Per-host politeness: at most max_per_host pages in flight against one
+    host, and consecutive requests to it started at least min_interval
+    seconds apart."""
+
+    def __init__(self, max_per_host=2, min_interval=0.5):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+
+        with semaphore:
+            # Reserve a start time under the lock, sleep outside it
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start_at + self.min_interval
+            if start_at > now:
+                time.sleep(start_at - now)
+            yield
+
+
+class CollectionOrchestrator:
+    """Fetch and parse result pages concurrently on a bounded thread pool.
+
+    Every page is an independent job, so total collection time is close
+    to the slowest page rather than the sum of all of them. stream()
+    yields each page's draws as it completes.
+    """
+
+    def __init__(self, max_workers=4, host_limiter=None):
+        self.max_workers = max_workers
+        self.host_limiter = host_limiter or HostLimiter()
+        self.timings = {}
+        self.elapsed = 0.0
+
+    def _run_job(self, job):
+        with self.host_limiter.slot(job.url):
+            start = time.time()
+            try:
+                return job.scrape(job.url, job.game_type)
+            finally:
+                self.timings[job.url] = time.time() - start
+
+    def stream(self, jobs):
+        """Run every PageJob, yielding each page's draws as soon as it is parsed.
+
+        A source for DrawPipeline: storing starts with the first page in,
+        and duplicates across pages are left to the pipeline's dedupe.
+        """
+        jobs = list(jobs)
+        self.timings = {}
+        start = time.time()
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+                futures = {pool.submit(self._run_job, job): job for job in jobs}
+                for future in as_completed(futures):
+                    try:
+                        draws = future.result() or []
+                    except Exception as e:
+                        print(f"Error collecting {futures[future].url}: {e}")
+                        continue
+                    yield from draws
+
+        self.elapsed = time.time() - start
+        slowest = max(self.timings.values(), default=0.0)
+        print(f"Collected {len(jobs)} pages in {self.elapsed:.1f}s (slowest page {slowest:.1f}s)")
+
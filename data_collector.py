@@ -3,278 +3,190 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import time
 import json
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import re
+from functools import partial
+from driver_pool import WebDriverPool, headless_options
+from page_readiness import PageReadiness
+from browser_profiles import start_session
+from collection_orchestrator import CollectionOrchestrator, PageJob
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline
+from draw_extraction import DrawExtractor, get_extraction_plans
 
 class PowerBallDataCollector:
-    def __init__(self):
+    def __init__(self, driver_pool=None, max_workers=2, browser_profile='full', data_dir="data"):
         self.base_url = "https://www.nationallottery.co.za/results"
-        self.data_dir = "data"
+        self.data_dir = data_dir
         self.powerball_file = os.path.join(self.data_dir, "powerball_data.csv")
         self.powerball_plus_file = os.path.join(self.data_dir, "powerball_plus_data.csv")
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = DrawStore(self.data_dir)
         
         # PowerBall number ranges
         self.main_numbers_range = (1, 50)  # 5 numbers from 1-50
         self.powerball_range = (1, 20)     # 1 powerball from 1-20
         
+        # Warm Chrome sessions shared by every page; created on first use.
+        # browser_profile='lean' blocks images, fonts, styles and trackers.
+        self.browser_profile = browser_profile
+        self.driver_pool = driver_pool
+        self._owns_driver_pool = driver_pool is None
+        
+        # Result pages fetched at once; the driver pool gets a session per worker
+        self.max_workers = max_workers
+        
+        # Waits on page conditions instead of fixed sleeps
+        self.readiness = PageReadiness()
+        
+        # Draw parsing shared with the other collectors, reusing the
+        # extraction plan each results page was last parsed with
+        self.extractor = DrawExtractor(plans=get_extraction_plans())
+        
+    def get_driver_pool(self):
+        """Get the driver pool, creating a private one if none was passed in"""
+        if self.driver_pool is None:
+            self.driver_pool = WebDriverPool(
+                size=self.max_workers,
+                options_factory=partial(headless_options, profile=self.browser_profile),
+                on_create=partial(start_session, profile=self.browser_profile)
+            )
+        return self.driver_pool
+    
     def setup_driver(self):
-        """Setup Chrome driver for web scraping"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
+        """Get a Chrome session for web scraping from the driver pool"""
+        return self.get_driver_pool().acquire()
     
-    def parse_draw_date(self, date_str):
-        """Parse various date formats from the website"""
-        try:
-            # Try different date formats
-            formats = [
-                "%d %B %Y",
-                "%d %b %Y", 
-                "%d/%m/%Y",
-                "%Y-%m-%d"
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str.strip(), fmt)
-                except ValueError:
-                    continue
-            
-            # If all formats fail, try to extract date from string
-            date_match = re.search(r'(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{4})', date_str)
-            if date_match:
-                day, month, year = date_match.groups()
-                return datetime(int(year), int(month), int(day))
-                
-        except Exception as e:
-            print(f"Error parsing date '{date_str}': {e}")
-            
-        return None
+    def release_driver(self, driver):
+        """Hand a session back to the pool instead of quitting Chrome"""
+        self.get_driver_pool().release(driver, WebDriverPool.is_healthy(driver))
     
-    def collect_powerball_data(self, start_year=2020):
-        """Collect PowerBall historical data"""
-        print("Collecting PowerBall data...")
-        
-        driver = self.setup_driver()
-        all_draws = []
-        
-        try:
-            # Navigate to PowerBall results page
-            url = f"{self.base_url}/powerball"
-            driver.get(url)
-            
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "results-table"))
-            )
-            
-            # Scroll to load more historical data
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            scroll_attempts = 0
-            max_scrolls = 20
-            
-            while scroll_attempts < max_scrolls:
-                # Scroll down
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Check if new content loaded
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-                scroll_attempts += 1
-            
-            # Extract draw data
-            draw_elements = driver.find_elements(By.CSS_SELECTOR, ".draw-item, .result-item, tr")
-            
-            for element in draw_elements:
-                try:
-                    # Extract draw information
-                    draw_data = self.extract_draw_data(element)
-                    if draw_data and self.is_valid_draw(draw_data):
-                        all_draws.append(draw_data)
-                except Exception as e:
-                    continue
-            
-            print(f"Collected {len(all_draws)} PowerBall draws")
-            
-        except Exception as e:
-            print(f"Error collecting PowerBall data: {e}")
-        finally:
-            driver.quit()
-        
-        # Save to CSV
-        if all_draws:
-            df = pd.DataFrame(all_draws)
-            df = df.sort_values('draw_date', ascending=False)
-            df.to_csv(self.powerball_file, index=False)
-            print(f"PowerBall data saved to {self.powerball_file}")
+    def close(self):
+        """Quit the pooled sessions if this collector started them"""
+        if self._owns_driver_pool and self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
+    
+    def reached_known_draw(self, driver, game_type, since, url=None):
+        """Whether the oldest row loaded so far is on or before since"""
+        if since is None:
+            return False
         
-        return all_draws
+        # The oldest row that parses as a draw is the last one on the page
+        draws = self.extractor.extract(driver.page_source, game_type, source=url)
+        return bool(draws) and draws[-1]['draw_date'] <= since
     
-    def collect_powerball_plus_data(self, start_year=2020):
-        """Collect PowerBall Plus historical data"""
-        print("Collecting PowerBall Plus data...")
+    def scrape_results_page(self, url, game_type, since=None):
+        """Load one results page, scrolling until no more history loads.
+        
+        With since (the latest stored draw date) scrolling stops as soon as
+        a known draw is on the page, and only newer draws are returned.
+        """
+        print(f"Collecting {game_type} data...")
         
         driver = self.setup_driver()
         all_draws = []
         
         try:
-            # Navigate to PowerBall Plus results page
-            url = f"{self.base_url}/powerball-plus"
             driver.get(url)
             
             # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "results-table"))
-            )
+            rows = self.readiness.wait_for_results(driver)
             
-            # Scroll to load more historical data
-            last_height = driver.execute_script("return document.body.scrollHeight")
+            # Scroll to load more historical data, unless it's already stored
             scroll_attempts = 0
             max_scrolls = 20
             
-            while scroll_attempts < max_scrolls:
+            while scroll_attempts < max_scrolls and not self.reached_known_draw(driver, game_type, since, url):
+                # Scroll down and wait for more rows; none means the history is all loaded
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                new_rows = self.readiness.wait_for_more_rows(driver, rows, replaces=2)
+                if new_rows <= rows:
                     break
-                last_height = new_height
+                rows = new_rows
                 scroll_attempts += 1
             
-            # Extract draw data
-            draw_elements = driver.find_elements(By.CSS_SELECTOR, ".draw-item, .result-item, tr")
+            # Extract draw data from one copy of the page, not element by element;
+            # DrawPipeline validates it on the way into the store
+            for draw_data in self.extractor.extract(driver.page_source, game_type, source=url):
+                if since is None or draw_data['draw_date'] > since:
+                    all_draws.append(draw_data)
             
-            for element in draw_elements:
-                try:
-                    draw_data = self.extract_draw_data(element, is_plus=True)
-                    if draw_data and self.is_valid_draw(draw_data):
-                        all_draws.append(draw_data)
-                except Exception as e:
-                    continue
-            
-            print(f"Collected {len(all_draws)} PowerBall Plus draws")
+            print(f"Collected {len(all_draws)} {'new ' if since is not None else ''}{game_type} draws")
             
         except Exception as e:
-            print(f"Error collecting PowerBall Plus data: {e}")
+            print(f"Error collecting {game_type} data: {e}")
         finally:
-            driver.quit()
-        
-        # Save to CSV
-        if all_draws:
-            df = pd.DataFrame(all_draws)
-            df = df.sort_values('draw_date', ascending=False)
-            df.to_csv(self.powerball_plus_file, index=False)
-            print(f"PowerBall Plus data saved to {self.powerball_plus_file}")
+            self.release_driver(driver)
         
         return all_draws
     
-    def extract_draw_data(self, element, is_plus=False):
-        """Extract draw data from a single element"""
-        try:
-            # Get text content
-            text = element.text.strip()
-            if not text:
-                return None
-            
-            # Look for date pattern
-            date_match = re.search(r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4}|\d{1,2}\s+\w+\s+\d{4})', text)
-            if not date_match:
-                return None
-            
-            draw_date = self.parse_draw_date(date_match.group(1))
-            if not draw_date:
-                return None
-            
-            # Extract numbers
-            numbers = re.findall(r'\b(\d{1,2})\b', text)
-            if len(numbers) < 6:  # Need at least 5 main numbers + 1 powerball
-                return None
-            
-            # Convert to integers
-            numbers = [int(n) for n in numbers]
-            
-            # Separate main numbers and powerball
-            main_numbers = sorted(numbers[:5])
-            powerball = numbers[5]
-            
-            # Validate number ranges
-            if not all(self.main_numbers_range[0] <= n <= self.main_numbers_range[1] for n in main_numbers):
-                return None
-            if not (self.powerball_range[0] <= powerball <= self.powerball_range[1]):
-                return None
-            
-            return {
-                'draw_date': draw_date,
-                'main_numbers': main_numbers,
-                'powerball': powerball,
-                'game_type': 'PowerBall Plus' if is_plus else 'PowerBall',
-                'draw_day': draw_date.strftime('%A')
-            }
-            
-        except Exception as e:
-            return None
+    def history_floor(self, game_type, start_year):
+        """Scroll no further back than the latest stored draw or the start of start_year"""
+        floor = datetime(start_year, 1, 1) - timedelta(days=1)
+        latest = self.store.latest_draw_date(game_type)
+        return floor if latest is None else max(latest, floor)
     
-    def is_valid_draw(self, draw_data):
-        """Validate if draw data is complete and correct"""
-        if not draw_data:
-            return False
+    def collect_powerball_data(self, start_year=2020):
+        """Collect PowerBall draws from start_year on that aren't stored yet.
         
-        required_fields = ['draw_date', 'main_numbers', 'powerball', 'game_type']
-        if not all(field in draw_data for field in required_fields):
-            return False
+        One scroll session; for years of history use historical_backfill.py.
+        """
+        since = self.history_floor('PowerBall', start_year)
+        all_draws = self.scrape_results_page(f"{self.base_url}/powerball", 'PowerBall', since)
         
-        if len(draw_data['main_numbers']) != 5:
-            return False
+        # Add the new draws to the store
+        report = DrawPipeline(self.store).run(all_draws)
+        print(f"Added {report['stored']} PowerBall draws to {self.powerball_file}")
         
-        if not all(self.main_numbers_range[0] <= n <= self.main_numbers_range[1] for n in draw_data['main_numbers']):
-            return False
+        return all_draws
+    
+    def collect_powerball_plus_data(self, start_year=2020):
+        """Collect PowerBall Plus draws from start_year on that aren't stored yet.
         
-        if not (self.powerball_range[0] <= draw_data['powerball'] <= self.powerball_range[1]):
-            return False
+        One scroll session; for years of history use historical_backfill.py.
+        """
+        since = self.history_floor('PowerBall Plus', start_year)
+        all_draws = self.scrape_results_page(f"{self.base_url}/powerball-plus", 'PowerBall Plus', since)
+        
+        # Add the new draws to the store
+        report = DrawPipeline(self.store).run(all_draws)
+        print(f"Added {report['stored']} PowerBall Plus draws to {self.powerball_plus_file}")
         
-        return True
+        return all_draws
+    
+    def result_pages(self, high_water_marks=None):
+        """Every results page to collect, one job per page"""
+        marks = high_water_marks or {}
+        return [
+            PageJob('PowerBall', f"{self.base_url}/powerball",
+                    partial(self.scrape_results_page, since=marks.get('PowerBall'))),
+            PageJob('PowerBall Plus', f"{self.base_url}/powerball-plus",
+                    partial(self.scrape_results_page, since=marks.get('PowerBall Plus')))
+        ]
     
     def collect_all_data(self):
         """Collect all historical data"""
         print("Starting data collection...")
         
-        # Collect PowerBall data
-        powerball_data = self.collect_powerball_data()
+        # Only draws newer than what is already stored are collected
+        marks = self.store.high_water_marks()
+        self.readiness.reset()
         
-        # Collect PowerBall Plus data
-        powerball_plus_data = self.collect_powerball_plus_data()
+        # Both games load in parallel, each on its own pooled session, and
+        # stream into the store as each page is parsed
+        try:
+            pages = CollectionOrchestrator(max_workers=self.max_workers).stream(self.result_pages(marks))
+            report = DrawPipeline(self.store, keep=True).run(pages)
+        finally:
+            self.close()
         
-        # Combine and save all data
-        all_data = powerball_data + powerball_plus_data
-        if all_data:
-            df = pd.DataFrame(all_data)
-            df = df.sort_values('draw_date', ascending=False)
-            combined_file = os.path.join(self.data_dir, "all_powerball_data.csv")
-            df.to_csv(combined_file, index=False)
-            print(f"All data saved to {combined_file}")
+        all_data = report['draws'].to_dict('records')
+        print(f"Added {report['stored']} new draws to {self.store.combined_file}")
+        print(self.readiness.summary())
+        print(self.extractor.plans.summary())
         
         return all_data
     
@@ -0,0 +1,98 @@
+import numpy as np
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+
+# Half-lives in draws; with two draws a week 8 draws is about a month
+DEFAULT_HALF_LIVES = (8, 26, 104)
+
+
+class DecayedFrequencyScores:
+    """Exponentially time-decayed per-number frequency scores.
+
+    Each half-life h keeps a running score per number in which a draw k
+    draws ago counts 0.5 ** (k / h). All half-lives are updated together in
+    O(50) per new draw.
+    """
+
+    def __init__(self, half_lives=DEFAULT_HALF_LIVES):
+        self.half_lives = tuple(half_lives)
+        self.decay = 0.5 ** (1 / np.array(self.half_lives, dtype=np.float64))
+        self.main_scores = np.zeros((len(self.half_lives), MAIN_NUMBERS))
+        self.powerball_scores = np.zeros((len(self.half_lives), POWERBALL_NUMBERS))
+        # Total decayed weight of all draws seen, per half-life
+        self.total_weight = np.zeros(len(self.half_lives))
+        self.n_draws = 0
+        self.last_draw_date = None
+
+    @classmethod
+    def from_arrays(cls, arrays, half_lives=DEFAULT_HALF_LIVES):
+        """Build scores for a whole history in one matrix product"""
+        scores = cls(half_lives)
+        n_draws = len(arrays)
+        if n_draws == 0:
+            return scores
+
+        # weights[h, t] = decay_h ** (draws after t)
+        age = np.arange(n_draws - 1, -1, -1)
+        weights = scores.decay[:, None] ** age[None, :]
+
+        scores.main_scores = weights @ arrays.incidence
+        scores.powerball_scores = weights @ arrays.powerball_incidence
+        scores.total_weight = weights.sum(axis=1)
+        scores.n_draws = n_draws
+        scores.last_draw_date = arrays.draw_dates[-1]
+        return scores
+
+    def update(self, main_numbers, powerball, draw_date=None):
+        """Fold one new draw into every half-life's scores"""
+        self.main_scores *= self.decay[:, None]
+        self.powerball_scores *= self.decay[:, None]
+        self.total_weight = self.total_weight * self.decay + 1
+
+        self.main_scores[:, np.asarray(main_numbers) - 1] += 1
+        self.powerball_scores[:, int(powerball) - 1] += 1
+        self.n_draws += 1
+        if draw_date is not None:
+            self.last_draw_date = draw_date
+
+    def _index(self, half_life):
+        if half_life is None:
+            return 0
+        return self.half_lives.index(half_life)
+
+    def rates(self, half_life=None):
+        """Decayed inclusion rate per number (0.1 / 0.05 expected for mains / powerball)"""
+        i = self._index(half_life)
+        total = self.total_weight[i] or 1.0
+        return self.main_scores[i] / total, self.powerball_scores[i] / total
+
+    def weights(self, half_life=None):
+        """Normalized sampling weights for the predictor's ticket sampler"""
+        i = self._index(half_life)
+        main = self.main_scores[i] + 1e-9
+        powerball = self.powerball_scores[i] + 1e-9
+        return main / main.sum(), powerball / powerball.sum()
+
+    def summary(self, half_life=None, top_n=10):
+        """Hot/cold numbers by decayed score for one half-life"""
+        i = self._index(half_life)
+        main_rates, powerball_rates = self.rates(half_life)
+        main_order = np.argsort(-self.main_scores[i], kind='stable')
+        powerball_order = np.argsort(-self.powerball_scores[i], kind='stable')
+
+        return {
+            'half_life': self.half_lives[i],
+            'effective_draws': float(self.total_weight[i]),
+            'main_numbers': [
+                {'number': num + 1, 'score': float(self.main_scores[i, num]), 'rate': float(main_rates[num])}
+                for num in range(MAIN_NUMBERS)
+            ],
+            'powerballs': [
+                {'number': num + 1, 'score': float(self.powerball_scores[i, num]), 'rate': float(powerball_rates[num])}
+                for num in range(POWERBALL_NUMBERS)
+            ],
+            'hot_numbers': [(int(n + 1), float(self.main_scores[i, n])) for n in main_order[:top_n]],
+            'cold_numbers': [(int(n + 1), float(self.main_scores[i, n])) for n in main_order[::-1][:top_n]],
+            'hot_powerballs': [(int(n + 1), float(self.powerball_scores[i, n])) for n in powerball_order[:top_n]],
+            'expected_main_rate': NUMBERS_PER_DRAW / MAIN_NUMBERS,
+            'expected_powerball_rate': 1 / POWERBALL_NUMBERS
+        }
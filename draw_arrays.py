@@ -0,0 +1,152 @@
+import re
+import hashlib
+import numpy as np
+import pandas as pd
+
+# PowerBall number ranges
+MAIN_NUMBERS = 50       # 5 numbers from 1-50
+POWERBALL_NUMBERS = 20  # 1 powerball from 1-20
+NUMBERS_PER_DRAW = 5
+
+# Matches the plain integers in "[1, 5, 12, 23, 45]" as well as
+# "[np.int64(1), ...]" written by the sample data generator
+_NUMBER_PATTERN = re.compile(r'(?<![\w.])\d+')
+
+
+def parse_numbers(value):
+    """Parse a stored main_numbers value into a list of ints"""
+    if isinstance(value, str):
+        return [int(n) for n in _NUMBER_PATTERN.findall(value)]
+    try:
+        return [int(n) for n in value]
+    except TypeError:
+        return []
+
+
+def incidence_matrix(numbers, size=MAIN_NUMBERS):
+    """Build a draws x numbers 0/1 matrix from an array of 1-based numbers"""
+    numbers = np.asarray(numbers)
+    if numbers.ndim == 1:
+        numbers = numbers[:, None]
+    matrix = np.zeros((len(numbers), size), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(numbers)), numbers.shape[1])
+    matrix[rows, numbers.ravel() - 1] = 1
+    return matrix
+
+
+class DrawArrays:
+    """Chronologically ordered NumPy view of one game's draw history"""
+
+    def __init__(self, main, powerball, draw_dates, draw_days):
+        self.main = main                # (N, 5) sorted 1-based main numbers
+        self.powerball = powerball      # (N,) 1-based powerballs
+        self.draw_dates = draw_dates    # (N,) datetime64[ns]
+        self.draw_days = draw_days      # (N,) weekday names
+        self._incidence = None
+        self._powerball_incidence = None
+
+    @classmethod
+    def from_frame(cls, df, game_type=None):
+        """Parse a draws DataFrame (optionally one game) into arrays"""
+        if df is None or df.empty:
+            return cls.empty()
+
+        if game_type is not None:
+            df = df[df['game_type'] == game_type]
+
+        parsed = df['main_numbers'].map(parse_numbers)
+        powerball = pd.to_numeric(df['powerball'], errors='coerce')
+        valid = (parsed.map(len) == NUMBERS_PER_DRAW) & powerball.notna()
+        if not valid.any():
+            return cls.empty()
+
+        df = df[valid]
+        main = np.sort(np.array(parsed[valid].tolist(), dtype=np.int16), axis=1)
+        powerball = powerball[valid].to_numpy(dtype=np.int16)
+        draw_dates = pd.to_datetime(df['draw_date']).to_numpy()
+
+        # Keep only draws inside the valid number ranges
+        in_range = ((main >= 1) & (main <= MAIN_NUMBERS)).all(axis=1)
+        in_range &= (powerball >= 1) & (powerball <= POWERBALL_NUMBERS)
+
+        # Oldest draw first, whatever order the file was written in
+        order = np.argsort(draw_dates[in_range], kind='stable')
+        draw_dates = draw_dates[in_range][order]
+        if 'draw_day' in df.columns:
+            draw_days = df['draw_day'].to_numpy()[in_range][order]
+        else:
+            draw_days = pd.DatetimeIndex(draw_dates).day_name().to_numpy()
+
+        return cls(main[in_range][order], powerball[in_range][order], draw_dates, draw_days)
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.empty((0, NUMBERS_PER_DRAW), dtype=np.int16),
+            np.empty(0, dtype=np.int16),
+            np.empty(0, dtype='datetime64[ns]'),
+            np.empty(0, dtype=object)
+        )
+
+    def __len__(self):
+        return len(self.main)
+
+    @property
+    def incidence(self):
+        """(N, 50) 0/1 matrix of main numbers drawn"""
+        if self._incidence is None:
+            self._incidence = incidence_matrix(self.main, MAIN_NUMBERS)
+        return self._incidence
+
+    @property
+    def powerball_incidence(self):
+        """(N, 20) 0/1 matrix of powerballs drawn"""
+        if self._powerball_incidence is None:
+            self._powerball_incidence = incidence_matrix(self.powerball, POWERBALL_NUMBERS)
+        return self._powerball_incidence
+
+    def version(self):
+        """Short content hash identifying this exact history"""
+        digest = hashlib.sha1()
+        for array in (self.main, self.powerball, self.draw_dates):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()[:12]
+
+    def subset(self, mask):
+        """Arrays for the draws selected by a boolean mask"""
+        return DrawArrays(self.main[mask], self.powerball[mask], self.draw_dates[mask], self.draw_days[mask])
+
+
+def unseen_draws(existing, collected):
+    """Rows of collected whose (draw_date, game_type) is not already in existing"""
+    if collected is None or len(collected) == 0:
+        return pd.DataFrame(columns=existing.columns if existing is not None else None)
+
+    collected = pd.DataFrame(collected).copy()
+    collected['draw_date'] = pd.to_datetime(collected['draw_date'])
+    collected = collected.drop_duplicates(['draw_date', 'game_type'])
+    if existing is None or existing.empty:
+        return collected.reset_index(drop=True)
+
+    known = pd.MultiIndex.from_arrays([pd.to_datetime(existing['draw_date']).dt.normalize(), existing['game_type']])
+    keys = pd.MultiIndex.from_arrays([collected['draw_date'].dt.normalize(), collected['game_type']])
+    return collected[~keys.isin(known)].reset_index(drop=True)
+
+
+def lagged_coincidences(incidence, max_lag):
+    """Count, per column, how often a 1 at draw t is followed by a 1 at t+k.
+
+    Returns a (max_lag + 1, columns) array whose row k is
+    sum_t incidence[t] * incidence[t + k], computed for every lag at once
+    through FFT autocorrelation of each column's 0/1 series.
+    """
+    n_draws = len(incidence)
+    max_lag = min(max_lag, max(n_draws - 1, 0))
+    if n_draws == 0:
+        return np.zeros((max_lag + 1, incidence.shape[1]), dtype=np.int64)
+
+    # Zero-pad to avoid circular wrap-around, rounded up to a fast FFT size
+    n_fft = 1 << int(np.ceil(np.log2(2 * n_draws)))
+    spectrum = np.fft.rfft(incidence.astype(np.float64), n=n_fft, axis=0)
+    autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=0)[:max_lag + 1]
+    return np.rint(autocorrelation).astype(np.int64)
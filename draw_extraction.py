@@ -0,0 +1,522 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+from functools import lru_cache
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+
+try:
+    from lxml import etree
+except ImportError:  # fall back to BeautifulSoup's pure-Python parser
+    etree = None
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+MONTHS.update({name[:3]: number for name, number in list(MONTHS.items())})
+MONTHS['sept'] = 9
+
+# Every date layout the results pages use, by name
+DATE_FORMATS = {
+    'dmy': r'(?P<dmy_day>\d{1,2})[/-](?P<dmy_month>\d{1,2})[/-](?P<dmy_year>\d{4})',  # 15/01/2024
+    'ymd': r'(?P<ymd_year>\d{4})[/-](?P<ymd_month>\d{1,2})[/-](?P<ymd_day>\d{1,2})',  # 2024-01-15
+    'dm': r'(?P<dm_day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<dm_month>[A-Za-z]{3,9})\.?,?\s+(?P<dm_year>\d{4})',
+    'md': r'(?P<md_month>[A-Za-z]{3,9})\.?\s+(?P<md_day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<md_year>\d{4})',
+}
+
+
+def _date_pattern(*formats):
+    alternatives = '|'.join(f"(?P<{name}>{DATE_FORMATS[name]})" for name in formats)
+    return re.compile(rf'(?<!\d)(?:{alternatives})(?!\d)')
+
+
+# One pattern for all of them; the group that matched (match.lastgroup)
+# says how to read it, so no format is tried and failed. An extraction
+# plan uses just the one format its source was found to use.
+DATE_PATTERN = _date_pattern(*DATE_FORMATS)
+FORMAT_PATTERNS = {name: _date_pattern(name) for name in DATE_FORMATS}
+
+# Ball numbers: one or two digits standing on their own
+NUMBER_PATTERN = re.compile(r'\b\d{1,2}\b')
+
+# Elements that may hold one draw: table rows, and anything whose class
+# mentions a draw or result (.draw-item, .result-item, .lottery-result, ...)
+ROW_TAGS = frozenset(['tr'])
+ROW_CLASS_PATTERN = re.compile(r'draw|result|lottery', re.IGNORECASE)
+MIN_ROW_TEXT = 10
+
+# Narrows the walk to rows and classed elements inside lxml, in document order
+CANDIDATE_XPATH = '//tr | //*[@class]'
+
+# Classes that mark the cell holding the PowerBall
+POWERBALL_CLASS_PATTERN = re.compile(r'power|bonus|\bpb\b', re.IGNORECASE)
+
+DEFAULT_PLAN_FILE = "data/extraction_plans.json"
+
+# How one source lays out its draws: the rows' tag and class, the date
+# format, and which cells hold the date, the balls and the PowerBall.
+# The column fields are None when a row's text is read as a whole.
+ExtractionPlan = namedtuple('ExtractionPlan', [
+    'tag', 'css_class', 'date_format', 'date_column', 'number_columns', 'powerball_column'
+])
+
+
+def game_type_for_url(url):
+    return "PowerBall Plus" if "plus" in url.lower() else "PowerBall"
+
+
+def _date_from_match(match):
+    date_format = match.lastgroup
+    day, month, year = match.group(f'{date_format}_day', f'{date_format}_month', f'{date_format}_year')
+    if date_format in ('dm', 'md'):
+        month = MONTHS.get(month.lower())
+        if month is None:
+            return None  # "5 balls 2024": a word that isn't a month
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _find_date(text, pattern=DATE_PATTERN):
+    """The first real date in text and its match, or (None, None)"""
+    for match in pattern.finditer(text):
+        draw_date = _date_from_match(match)
+        if draw_date is not None:
+            return draw_date, match
+    return None, None
+
+
+@lru_cache(maxsize=4096)
+def parse_draw_date(date_str):
+    """Parse a draw date in any of the site's formats; None if it isn't one"""
+    return _find_date(date_str)[0]
+
+
+def _numbers(text):
+    return [int(n) for n in NUMBER_PATTERN.findall(text)]
+
+
+class _LxmlPage:
+    """A page parsed by lxml, with what the extractor needs from it"""
+
+    def __init__(self, html):
+        self.root = etree.HTML(html)
+
+    def candidates(self):
+        if self.root is None:
+            return []  # empty document
+        return [el for el in self.root.xpath(CANDIDATE_XPATH)
+                if el.tag in ROW_TAGS or ROW_CLASS_PATTERN.search(el.get('class') or '')]
+
+    def select(self, tag, css_class):
+        if self.root is None:
+            return []
+        return [el for el in self.root.iter(tag) if (el.get('class') or '') == css_class]
+
+    def selector(self, el):
+        return el.tag, el.get('class') or ''
+
+    def text(self, el):
+        return ' '.join(el.itertext())
+
+    def parent(self, el):
+        return el.getparent()
+
+    def cells(self, el):
+        return [child for child in el if isinstance(child.tag, str)]
+
+    def is_powerball(self, el):
+        return any(POWERBALL_CLASS_PATTERN.search(e.get('class') or '') for e in el.iter(etree.Element))
+
+
+class _SoupPage:
+    """The same for a BeautifulSoup tree"""
+
+    def __init__(self, soup):
+        self.root = soup
+
+    def candidates(self):
+        return [el for el in self.root.find_all(True)
+                if el.name in ROW_TAGS or ROW_CLASS_PATTERN.search(self.selector(el)[1])]
+
+    def select(self, tag, css_class):
+        return [el for el in self.root.find_all(tag) if self.selector(el)[1] == css_class]
+
+    def selector(self, el):
+        return el.name, ' '.join(el.get('class') or ())
+
+    def text(self, el):
+        return el.get_text(' ')
+
+    def parent(self, el):
+        return el.parent
+
+    def cells(self, el):
+        return el.find_all(True, recursive=False)
+
+    def is_powerball(self, el):
+        return any(POWERBALL_CLASS_PATTERN.search(self.selector(e)[1]) for e in [el] + el.find_all(True))
+
+
+class ExtractionPlans:
+    """The extraction plan that worked for each source URL, kept in a JSON file.
+
+    path=None keeps the plans in memory only.
+    """
+
+    def __init__(self, path=DEFAULT_PLAN_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._plans = {}
+        self.hits = 0
+        self.fallbacks = 0
+        self.discoveries = 0
+
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._plans = {source: ExtractionPlan(**plan) for source, plan in json.load(f).items()}
+            except (ValueError, TypeError) as e:
+                print(f"Ignoring unreadable extraction plans in {path}: {e}")
+
+    def get(self, source):
+        return self._plans.get(source)
+
+    def put(self, source, plan):
+        """Record the plan that just worked for a source"""
+        with self._lock:
+            if self._plans.get(source) == plan:
+                return
+            self._plans[source] = plan
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_file = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump({s: p._asdict() for s, p in self._plans.items()}, f, indent=2)
+                os.replace(tmp_file, self.path)
+
+    def record(self, outcome):
+        """Count a page parsed by 'hits', 'fallbacks' or 'discoveries'"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def report(self):
+        with self._lock:
+            return {
+                'plans': len(self._plans),
+                'hits': self.hits,
+                'fallbacks': self.fallbacks,
+                'discoveries': self.discoveries
+            }
+
+    def summary(self):
+        report = self.report()
+        return (f"🧭 {report['hits']} pages parsed with a cached plan, "
+                f"{report['discoveries']} by discovery ({report['fallbacks']} plans no longer matched)")
+
+
+_plan_stores = {}
+_plan_stores_lock = threading.Lock()
+
+
+def get_extraction_plans(path=DEFAULT_PLAN_FILE):
+    """The process-wide plan store for a file, shared by every collector"""
+    with _plan_stores_lock:
+        if path not in _plan_stores:
+            _plan_stores[path] = ExtractionPlans(path)
+        return _plan_stores[path]
+
+
+def is_complete_draw(draw):
+    """Five different main numbers; extraction already checked the ranges"""
+    return len(set(draw['main_numbers'])) == NUMBERS_PER_DRAW
+
+
+class DrawExtractor:
+    """Draws from results pages, shared by every collector.
+
+    A page is parsed once (lxml when installed, html.parser otherwise).
+    Given a source URL and a plan store, the plan recorded for that
+    source is applied directly: one row selector, one date format, known
+    columns and ball order. Discovery runs when there is no plan, or when the plan finds
+    nothing or a draw that doesn't validate, and the plan it implies is
+    recorded for next time.
+
+    Discovery walks the page once. Each table row or draw/result-classed
+    element is a candidate; candidates are classified innermost first,
+    and an element holding a draw that was already found is skipped, so
+    a results table doesn't come back as one more "draw". A row is a draw
+    when its text has a date and, once the date is taken out, at least
+    six ball numbers in range: the first five are the main numbers, the
+    sixth the PowerBall, unless a cell classed as the PowerBall says
+    otherwise.
+    """
+
+    def __init__(self, keep_raw_text=False, plans=None):
+        self.keep_raw_text = keep_raw_text
+        self.plans = plans
+        self.parser = 'lxml' if etree is not None else 'html.parser'
+
+    def _page(self, page):
+        if isinstance(page, (str, bytes)):
+            if etree is not None:
+                return _LxmlPage(page)
+            from bs4 import BeautifulSoup
+            page = BeautifulSoup(page, 'html.parser')
+        return _SoupPage(page)
+
+    def _build_draw(self, draw_date, numbers, game_type, text):
+        if len(numbers) < NUMBERS_PER_DRAW + 1:
+            return None
+
+        main_numbers = sorted(numbers[:NUMBERS_PER_DRAW])
+        powerball = numbers[NUMBERS_PER_DRAW]
+        if not all(1 <= n <= MAIN_NUMBERS for n in main_numbers):
+            return None
+        if not 1 <= powerball <= POWERBALL_NUMBERS:
+            return None
+
+        draw = {
+            'draw_date': draw_date,
+            'main_numbers': main_numbers,
+            'powerball': powerball,
+            'game_type': game_type,
+            'draw_day': draw_date.strftime('%A')
+        }
+        if self.keep_raw_text:
+            draw['raw_text'] = text[:100]  # for debugging
+        return draw
+
+    def parse_row(self, text, game_type, date_pattern=DATE_PATTERN):
+        """A draw dict from one row's text, or None"""
+        if not text or len(text) < MIN_ROW_TEXT:
+            return None
+
+        draw_date, match = _find_date(text, date_pattern)
+        if draw_date is None:
+            return None
+
+        rest = f"{text[:match.start()]} {text[match.end():]}"
+        return self._build_draw(draw_date, _numbers(rest), game_type, text)
+
+    def extract(self, page, game_type, source=None):
+        """Every draw on a page, in page order.
+
+        page is raw HTML (str or bytes) or an already-parsed BeautifulSoup;
+        source is the URL it came from, which selects the cached plan.
+        """
+        page = self._page(page)
+        use_plans = self.plans is not None and source is not None
+
+        plan = self.plans.get(source) if use_plans else None
+        if plan is not None:
+            draws = self._extract_with_plan(page, plan, game_type)
+            if draws and all(is_complete_draw(d) for d in draws):
+                self.plans.record('hits')
+                return draws
+            self.plans.record('fallbacks')
+
+        rows, draws = self._discover(page, game_type)
+        if use_plans:
+            self.plans.record('discoveries')
+            plan = self._learn_plan(page, rows, draws, game_type)
+            if plan is not None:
+                self.plans.put(source, plan)
+        return draws
+
+    def _discover(self, page, game_type):
+        """Every candidate row classified; returns (row elements, draws)"""
+        # Document order puts descendants after their ancestors, so walking
+        # backwards classifies the innermost rows first
+        rows, draws = [], []
+        holds_draw = {}
+        for el in reversed(page.candidates()):
+            if id(el) in holds_draw:
+                continue
+            draw = self._parse_element(page, el, game_type)
+            if draw is None:
+                continue
+            rows.append(el)
+            draws.append(draw)
+            ancestor = page.parent(el)
+            while ancestor is not None and id(ancestor) not in holds_draw:
+                holds_draw[id(ancestor)] = ancestor  # the value keeps lxml's proxy alive
+                ancestor = page.parent(ancestor)
+        rows.reverse()
+        draws.reverse()
+        return rows, draws
+
+    def _powerball_column(self, page, cells, texts):
+        """The cell classed as the PowerBall and holding one number, if any"""
+        return next((i for i, cell in enumerate(cells)
+                     if page.is_powerball(cell) and len(NUMBER_PATTERN.findall(texts[i])) == 1), None)
+
+    def _parse_element(self, page, el, game_type):
+        """parse_row for an element, honouring a PowerBall cell wherever it sits"""
+        text = page.text(el)
+        cells = page.cells(el)
+        if len(text) < MIN_ROW_TEXT or len(cells) < 2:
+            return self.parse_row(text, game_type)
+
+        texts = [page.text(cell) for cell in cells]
+        powerball_column = self._powerball_column(page, cells, texts)
+        if powerball_column is None:
+            return self.parse_row(text, game_type)
+
+        rest = ' '.join(t for i, t in enumerate(texts) if i != powerball_column)
+        draw_date, match = _find_date(rest)
+        if draw_date is None:
+            return None
+        main_numbers = _numbers(f"{rest[:match.start()]} {rest[match.end():]}")[:NUMBERS_PER_DRAW]
+        if len(main_numbers) < NUMBERS_PER_DRAW:
+            return None
+        return self._build_draw(draw_date, main_numbers + _numbers(texts[powerball_column]), game_type, text)
+
+    def _extract_with_plan(self, page, plan, game_type):
+        date_pattern = FORMAT_PATTERNS[plan.date_format]
+        draws = []
+        for el in page.select(plan.tag, plan.css_class):
+            if plan.date_column is None:
+                draw = self.parse_row(page.text(el), game_type, date_pattern)
+            else:
+                draw = self._parse_cells(page, el, plan, date_pattern, game_type)
+            if draw is not None:
+                draws.append(draw)
+        return draws
+
+    def _parse_cells(self, page, el, plan, date_pattern, game_type):
+        cells = page.cells(el)
+        columns = [plan.date_column, *plan.number_columns]
+        if plan.powerball_column is not None:
+            columns.append(plan.powerball_column)
+        if len(cells) <= max(columns):
+            return None  # e.g. a header row
+
+        draw_date = _find_date(page.text(cells[plan.date_column]), date_pattern)[0]
+        if draw_date is None:
+            return None
+
+        numbers = _numbers(' '.join(page.text(cells[i]) for i in plan.number_columns))
+        if plan.powerball_column is not None:
+            powerball = _numbers(page.text(cells[plan.powerball_column]))
+            if len(numbers) < NUMBERS_PER_DRAW or not powerball:
+                return None
+            numbers = numbers[:NUMBERS_PER_DRAW] + powerball[:1]
+        text = page.text(el) if self.keep_raw_text else ''
+        return self._build_draw(draw_date, numbers, game_type, text)
+
+    def _learn_plan(self, page, rows, draws, game_type):
+        """The plan that reproduces discovery's draws on this page, or None"""
+        found = [(el, draw) for el, draw in zip(rows, draws) if is_complete_draw(draw)]
+        if not found:
+            return None
+
+        # The most common kind of row holding a draw
+        selector = Counter(page.selector(el) for el, _ in found).most_common(1)[0][0]
+        expected = [draw for el, draw in found if page.selector(el) == selector]
+        el, draw = next((el, draw) for el, draw in found if page.selector(el) == selector)
+        date_format = _find_date(page.text(el))[1].lastgroup
+
+        plans = [ExtractionPlan(*selector, date_format, None, None, None)]
+        layout = self._learn_columns(page, el, draw)
+        if layout is not None:
+            plans.insert(0, ExtractionPlan(*selector, date_format, *layout))
+
+        def key(d):
+            return d['draw_date'], d['main_numbers'], d['powerball']
+        for plan in plans:
+            planned = self._extract_with_plan(page, plan, game_type)
+            if [key(d) for d in planned] == [key(d) for d in expected]:
+                return plan
+        return None
+
+    def _learn_columns(self, page, el, draw):
+        """(date_column, number_columns, powerball_column) of a draw row, or None"""
+        cells = page.cells(el)
+        if len(cells) < 2:
+            return None
+        texts = [page.text(cell) for cell in cells]
+
+        date_column = next((i for i, text in enumerate(texts) if parse_draw_date(text) == draw['draw_date']), None)
+        if date_column is None:
+            return None
+
+        # A cell classed as the PowerBall pins it down wherever it sits;
+        # otherwise it is the sixth number, as in discovery
+        powerball_column = self._powerball_column(page, cells, texts)
+        needed = NUMBERS_PER_DRAW if powerball_column is not None else NUMBERS_PER_DRAW + 1
+
+        number_columns, count = [], 0
+        for i, text in enumerate(texts):
+            if i in (date_column, powerball_column):
+                continue
+            found = len(NUMBER_PATTERN.findall(text))
+            if found:
+                number_columns.append(i)
+                count += found
+            if count >= needed:
+                break
+        else:
+            return None
+        return date_column, number_columns, powerball_column
+
+
+_default_extractor = DrawExtractor()
+
+
+def extract_draws(page, game_type):
+    """Draws on a page with the shared default extractor"""
+    return _default_extractor.extract(page, game_type)
+
+
+def benchmark_extraction(pages, repeats=5, extractor=None):
+    """Rows per second extracting draws from saved pages.
+
+    pages is a list of (html, source URL). With a plan store on the
+    extractor, the first pass discovers each source's plan and the rest
+    reuse it.
+    """
+    extractor = extractor or _default_extractor
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for html, url in pages:
+            rows += len(extractor.extract(html, game_type_for_url(url), source=url))
+    elapsed = time.perf_counter() - start
+
+    size = sum(len(html) for html, _ in pages)
+    report = {
+        'parser': extractor.parser,
+        'plans': extractor.plans is not None,
+        'pages': len(pages) * repeats,
+        'rows': rows,
+        'seconds': round(elapsed, 4),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else 0.0,
+        'mb_per_second': round(size * repeats / elapsed / 1e6, 2) if elapsed else 0.0
+    }
+    print(f"⚡ {report['rows']} rows from {report['pages']} pages in {report['seconds']:.3f}s "
+          f"({report['rows_per_second']:.0f} rows/s, {report['mb_per_second']:.1f} MB/s, {report['parser']}"
+          f"{', cached plans' if report['plans'] else ''})")
+    return report
+
+
+if __name__ == "__main__":
+    # Benchmark on the pages saved by the fetch layer, discovering every
+    # page and then with plans cached per source
+    from snapshot_cache import SnapshotCache
+    cache = SnapshotCache()
+    pages = [(cache.body(s), s['url']) for s in cache.latest_snapshots()]
+    if pages:
+        benchmark_extraction(pages)
+        plans = ExtractionPlans(path=None)
+        benchmark_extraction(pages, extractor=DrawExtractor(plans=plans))
+        print(plans.summary())
+    else:
+        print("❌ No saved pages in the snapshot cache; run a collection first")
@@ -0,0 +1,189 @@
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from draw_arrays import parse_numbers, MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+from draw_store import GAME_FILES
+
+REQUIRED_FIELDS = ['draw_date', 'main_numbers', 'powerball', 'game_type']
+
+# Dedupe keys are ints: days since the epoch times the number of games, plus the game
+GAME_CODES = {game_type: code for code, game_type in enumerate(GAME_FILES)}
+
+_DONE = object()
+
+
+def batched(draws, size):
+    """Lists of up to size draws from any iterable"""
+    batch = []
+    for draw in draws:
+        batch.append(draw)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _main_matrix(values):
+    """(draws x 5) array of main numbers and a mask of the rows that have exactly 5"""
+    numbers = values.map(parse_numbers)
+    complete = (numbers.map(len) == NUMBERS_PER_DRAW).to_numpy()
+    main = np.zeros((len(numbers), NUMBERS_PER_DRAW), dtype=np.int64)
+    if complete.any():
+        main[complete] = np.array(numbers[complete].tolist(), dtype=np.int64)
+    return main, complete
+
+
+def validate_draws(frame):
+    """is_valid_draw over a whole DataFrame of draws at once; a boolean mask.
+
+    A draw is valid with a parseable date, a known game, five different
+    main numbers from 1-50 and a PowerBall from 1-20.
+    """
+    if frame.empty or not all(field in frame.columns for field in REQUIRED_FIELDS):
+        return np.zeros(len(frame), dtype=bool)
+
+    main, complete = _main_matrix(frame['main_numbers'])
+    in_range = ((main >= 1) & (main <= MAIN_NUMBERS)).all(axis=1)
+    distinct = (np.diff(np.sort(main, axis=1), axis=1) != 0).all(axis=1)
+
+    powerball = pd.to_numeric(frame['powerball'], errors='coerce').to_numpy(dtype=float)
+    powerball_ok = (powerball >= 1) & (powerball <= POWERBALL_NUMBERS) & (powerball % 1 == 0)
+
+    dated = pd.to_datetime(frame['draw_date'], errors='coerce', format='mixed').notna().to_numpy()
+    known_game = frame['game_type'].isin(list(GAME_FILES)).to_numpy()
+    return complete & in_range & distinct & powerball_ok & dated & known_game
+
+
+def is_valid_draw(draw):
+    """validate_draws for a single draw dict"""
+    return bool(draw) and bool(validate_draws(pd.DataFrame([draw]))[0])
+
+
+def draw_keys(frame):
+    """One int per (draw date, game type); frame must hold known games only"""
+    days = pd.to_datetime(frame['draw_date'], format='mixed').dt.normalize().to_numpy().astype('datetime64[D]').astype(np.int64)
+    return days * len(GAME_CODES) + frame['game_type'].map(GAME_CODES).to_numpy(dtype=np.int64)
+
+
+class DrawPipeline:
+    """collect -> parse -> validate -> dedupe -> store, streaming.
+
+    Sources are any iterables of draw dicts: a collector's page stream,
+    a generator over cached snapshots, manual entries. Each runs on its
+    own thread and hands fixed-size batches to a bounded queue, so a
+    fast source waits for the store rather than piling up draws in
+    memory. Batches are validated as arrays, dropped if their (date,
+    game) key is already stored or seen earlier in the run, and appended
+    to the store in bulk, so a run writes only the rows it adds. Memory
+    holds a few batches and one int per known draw.
+
+    With store=None nothing is written, and only the run's own
+    duplicates are dropped. keep=True also hands back the stored draws.
+    compact=True rewrites the store in date order at the end; only worth
+    it after bulk loads, since readers sort on load anyway.
+    Callers that need to know when a given set of draws is stored (e.g.
+    to checkpoint it) can drive a run themselves with start(), add()
+    and finish().
+    """
+
+    def __init__(self, store=None, batch_size=500, buffer_size=4, keep=False, compact=False):
+        self.store = store
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.keep = keep
+        self.compact = compact
+
+    def _produce(self, source, batches):
+        try:
+            for batch in batched(source, self.batch_size):
+                batches.put(batch)
+        except Exception as e:
+            print(f"Draw source failed: {e}")
+        finally:
+            batches.put(_DONE)
+
+    def _clean(self, batch):
+        """The valid draws of a batch in the store's shape, and how many were dropped"""
+        frame = pd.DataFrame(batch)
+        valid = validate_draws(frame)
+        frame = frame[valid].reset_index(drop=True)
+        if not frame.empty:
+            frame['draw_date'] = pd.to_datetime(frame['draw_date'], format='mixed').dt.normalize()
+            frame['main_numbers'] = frame['main_numbers'].map(lambda n: sorted(parse_numbers(n)))
+            frame['powerball'] = pd.to_numeric(frame['powerball']).astype(np.int64)
+            frame['draw_day'] = frame['draw_date'].dt.day_name()
+        return frame, int((~valid).sum())
+
+    def start(self):
+        """Begin a run: load the stored keys. Feed it with add(), end it with finish()"""
+        self._started = time.time()
+        self._known = np.zeros(0, dtype=np.int64)
+        if self.store is not None:
+            stored = self.store.keys()
+            self._known = np.unique(draw_keys(stored[stored['game_type'].isin(list(GAME_FILES))]))
+        self._kept = []
+        self.report = {'collected': 0, 'invalid': 0, 'duplicates': 0, 'stored': 0, 'batches': 0}
+
+    def add(self, batch):
+        """Validate, dedupe and store one list of draws; returns how many were new.
+
+        The draws are in the store when this returns, though out of date
+        order until finish().
+        """
+        self.report['collected'] += len(batch)
+        self.report['batches'] += 1
+        frame, invalid = self._clean(batch)
+        self.report['invalid'] += invalid
+        if frame.empty:
+            return 0
+
+        # First sighting of a key wins, whether in the store or earlier in the run
+        keys = draw_keys(frame)
+        first = np.zeros(len(keys), dtype=bool)
+        first[np.unique(keys, return_index=True)[1]] = True
+        new = first & ~np.isin(keys, self._known)
+        self.report['duplicates'] += int((~new).sum())
+        if not new.any():
+            return 0
+
+        frame = frame[new]
+        self._known = np.concatenate([self._known, keys[new]])
+        if self.store is not None:
+            self.store.append(frame)
+        self.report['stored'] += len(frame)
+        if self.keep:
+            self._kept.append(frame)
+        return len(frame)
+
+    def finish(self):
+        """Report on the run, compacting the store first if asked to"""
+        report = self.report
+        if self.compact and self.store is not None and report['stored']:
+            self.store.compact()
+
+        report['seconds'] = round(time.time() - self._started, 2)
+        if self.keep:
+            report['draws'] = pd.concat(self._kept, ignore_index=True) if self._kept else pd.DataFrame(columns=REQUIRED_FIELDS)
+        print(f"📥 {report['collected']} draws in, {report['invalid']} invalid, "
+              f"{report['duplicates']} already known, {report['stored']} new "
+              f"({report['batches']} batches, {report['seconds']:.2f}s)")
+        return report
+
+    def run(self, *sources):
+        """Stream every source into the store; returns counts for the run"""
+        self.start()
+        batches = queue.Queue(maxsize=self.buffer_size)
+        for source in sources:
+            threading.Thread(target=self._produce, args=(source, batches), daemon=True).start()
+
+        running = len(sources)
+        while running:
+            batch = batches.get()
+            if batch is _DONE:
+                running -= 1
+            else:
+                self.add(batch)
+        return self.finish()
@@ -0,0 +1,117 @@
+import os
+import pandas as pd
+
+GAME_FILES = {
+    'PowerBall': "powerball_data.csv",
+    'PowerBall Plus': "powerball_plus_data.csv",
+}
+COMBINED_FILE = "all_powerball_data.csv"
+
+
+class DrawStore:
+    """The collected draws on disk, keyed by (draw_date, game_type).
+
+    The combined CSV is the source of truth; the per-game files the
+    collectors have always written are kept alongside it. Collectors ask
+    for the latest stored date per game (the high-water mark), scrape
+    only what is newer, and stream those rows in through DrawPipeline,
+    which appends only unseen, valid draws; a draw already in the store
+    is never duplicated or overwritten by a partial scrape.
+    """
+
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.combined_file = os.path.join(data_dir, COMBINED_FILE)
+
+    def game_file(self, game_type):
+        return os.path.join(self.data_dir, GAME_FILES[game_type])
+
+    def load(self):
+        """Every stored draw, newest first"""
+        if os.path.exists(self.combined_file):
+            frames = [pd.read_csv(self.combined_file)]
+        else:
+            frames = [pd.read_csv(self.game_file(g)) for g in GAME_FILES if os.path.exists(self.game_file(g))]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        df['draw_date'] = pd.to_datetime(df['draw_date'])
+        return df.sort_values('draw_date', ascending=False, kind='stable').reset_index(drop=True)
+
+    def high_water_marks(self):
+        """{game_type: latest stored draw date}"""
+        df = self.load()
+        if df.empty:
+            return {}
+        return {game_type: date for game_type, date in df.groupby('game_type')['draw_date'].max().items()}
+
+    def latest_draw_date(self, game_type):
+        """Latest stored draw date for a game, or None if it has none yet"""
+        return self.high_water_marks().get(game_type)
+
+    def keys(self):
+        """(draw_date, game_type) of every stored draw, without reading the other columns"""
+        paths = [self.combined_file] if os.path.exists(self.combined_file) else \
+            [self.game_file(g) for g in GAME_FILES if os.path.exists(self.game_file(g))]
+        if not paths:
+            return pd.DataFrame(columns=['draw_date', 'game_type'])
+        df = pd.concat([pd.read_csv(p, usecols=['draw_date', 'game_type']) for p in paths], ignore_index=True)
+        df['draw_date'] = pd.to_datetime(df['draw_date']).dt.normalize()
+        return df
+
+    def _write(self, df, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{path}.tmp"
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, path)
+
+    def _append(self, df, path):
+        if not os.path.exists(path):
+            self._write(df, path)
+            return
+        header = pd.read_csv(path, nrows=0).columns
+        if not df.columns.isin(header).all():
+            # A column the file lacks (e.g. raw_text, source): widen the header with one rewrite
+            self._write(pd.concat([pd.read_csv(path), df], ignore_index=True), path)
+            return
+        # Line the new rows up with the file's own columns
+        df.reindex(columns=header).to_csv(path, mode='a', header=False, index=False)
+
+    def append(self, draws):
+        """Add draws already known to be valid and new, without rewriting the store.
+
+        For bulk loads: each call costs only the rows it adds, unless they
+        bring a column the files don't have yet, which rewrites the file
+        once. The rows land at the end of the files; load() sorts, and
+        compact() puts the files themselves back in date order after a
+        bulk load.
+        """
+        if draws.empty:
+            return
+        if not os.path.exists(self.combined_file) and any(os.path.exists(self.game_file(g)) for g in GAME_FILES):
+            self._write(self.load(), self.combined_file)  # older stores only had the per-game files
+
+        draws = draws.assign(draw_date=pd.to_datetime(draws['draw_date']).dt.strftime('%Y-%m-%d'))
+        for game_type, rows in draws.groupby('game_type', sort=False):
+            if game_type in GAME_FILES:
+                self._append(rows, self.game_file(game_type))
+        self._append(draws, self.combined_file)
+
+    def compact(self):
+        """Rewrite every file newest first, e.g. after a run of appends"""
+        df = self.load()
+        if df.empty:
+            return
+        df = df.drop_duplicates(['draw_date', 'game_type'])
+        for column in df.select_dtypes('float').columns:
+            # e.g. draw_number, read back as float once appended rows left it blank
+            if (df[column].dropna() % 1 == 0).all():
+                df[column] = df[column].astype('Int64')
+
+        for game_type in df['game_type'].unique():
+            if game_type in GAME_FILES:
+                self._write(df[df['game_type'] == game_type], self.game_file(game_type))
+        self._write(df, self.combined_file)
@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from page_readiness import PERFORMANCE_LOGGING
+from browser_profiles import apply_profile
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_PATH_FILE = os.path.join("data", "chromedriver_path.json")
+
+# How long acquire() waits for a session when every one is in use
+ACQUIRE_TIMEOUT = 120
+
+# Selenium and webdriver_manager are imported where a browser is started,
+# so the pool itself imports (and is tested) without them
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(cache_file=DRIVER_PATH_FILE):
+    """Locate the chromedriver binary once.
+
+    ChromeDriverManager().install() checks online for the latest version on
+    every call, so the path it returns is kept for the process and in
+    cache_file for later runs, and reused for as long as the binary exists.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f).get('path')
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return _driver_path
+        except (OSError, ValueError):
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            directory = os.path.dirname(cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({'path': _driver_path}, f)
+        except OSError as e:
+            print(f"Could not cache driver path: {e}")
+        return _driver_path
+
+
+def headless_options(user_agent=None, profile='full'):
+    """The headless Chrome options the collectors have always used, plus a browser profile"""
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    if user_agent:
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+    # Network events for PageReadiness's idle detection
+    chrome_options.set_capability(*PERFORMANCE_LOGGING)
+    return apply_profile(chrome_options, profile)
+
+
+class WebDriverPool:
+    """A small pool of warm Chrome sessions shared across page loads.
+
+    Sessions are created on demand up to `size` (or ahead of time with
+    warm()), checked for health before being handed out, and quit and
+    replaced after `max_uses` pages or after a page that raised.
+
+    One condition guards the idle sessions and the count of live ones:
+    a waiter is woken both when a session comes back and when one is
+    quit, since either way it may now take or start a session.
+    """
+
+    def __init__(self, size=2, max_uses=25, options_factory=headless_options, on_create=None,
+                 page_load_timeout=30):
+        self.size = size
+        self.max_uses = max_uses
+        self.options_factory = options_factory
+        self.on_create = on_create
+        self.page_load_timeout = page_load_timeout
+
+        self._idle = []  # most recently used last, so the warmest goes out first
+        self._uses = {}
+        self._available = threading.Condition()
+        self._created = 0
+        self.sessions_started = 0
+
+    def _create(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=self.options_factory())
+        driver.set_page_load_timeout(self.page_load_timeout)
+        if self.on_create:
+            self.on_create(driver)
+        self._uses[id(driver)] = 0
+        self.sessions_started += 1
+        return driver
+
+    def _quit(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._forget()
+
+    def _forget(self):
+        """A session slot is free again"""
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    @staticmethod
+    def is_healthy(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def warm(self, count=None):
+        """Start sessions ahead of time so the first pages don't wait for Chrome"""
+        for _ in range(min(count or self.size, self.size)):
+            with self._available:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                driver = self._create()
+            except Exception:
+                self._forget()
+                raise
+            self._put_idle(driver)
+
+    def _put_idle(self, driver):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Get a healthy session, starting one if the pool is not full.
+
+        Raises TimeoutError if none is free within timeout seconds
+        (timeout=None waits for as long as it takes).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while not self._idle and self._created >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No browser session free within {timeout}s")
+                    self._available.wait(remaining)
+
+                driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    self._created += 1
+
+            if driver is None:
+                try:
+                    return self._create()
+                except Exception:
+                    self._forget()
+                    raise
+
+            if self.is_healthy(driver):
+                return driver
+            self._quit(driver)
+
+    def release(self, driver, healthy=True):
+        """Return a session; it is recycled after max_uses or a failure"""
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        if not healthy or self._uses[id(driver)] >= self.max_uses:
+            self._quit(driver)
+        else:
+            self._put_idle(driver)
+
+    @contextmanager
+    def driver(self, timeout=ACQUIRE_TIMEOUT):
+        """with pool.driver() as driver: one page load on a pooled session"""
+        driver = self.acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def close(self):
+        """Quit every idle session"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,210 @@
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import urlsplit
+import pandas as pd
+from async_fetcher import AsyncFetcher
+from snapshot_cache import SnapshotCache, DEFAULT_SNAPSHOT_DIR
+from draw_extraction import DrawExtractor, ExtractionPlans, DEFAULT_PLAN_FILE
+from draw_store import DrawStore, GAME_FILES
+from draw_pipeline import DrawPipeline
+
+BASE_URL = "https://www.nationallottery.co.za/results"
+GAME_SLUGS = {'PowerBall': 'powerball', 'PowerBall Plus': 'powerball-plus'}
+
+# The results pages' history search: draws in a date range, or one page
+# of the full history, newest first
+RANGE_URL = "{base_url}/{slug}?fromDate={start:%Y-%m-%d}&toDate={end:%Y-%m-%d}"
+PAGE_URL = "{base_url}/{slug}?page={page}"
+
+SHARD_PERIODS = {'year': 'Y', 'month': 'M'}
+CHECKPOINT_FILE = "backfill_checkpoint.json"
+
+# One unit of backfill work: the draws of one game between start and end
+# (both inclusive) on one results page. key names it in the checkpoint.
+Shard = namedtuple('Shard', ['key', 'game_type', 'start', 'end', 'url'])
+
+
+def plan_shards(start, end, by='month', games=None, pages=None, base_url=BASE_URL):
+    """Split a date range into shards for every game.
+
+    by='year' or 'month' searches each period separately. by='page' walks
+    `pages` pages of the full history instead, keeping the draws in range;
+    pages move as new draws are published, so date shards are the safer
+    choice for a backfill that may be resumed days later.
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    games = list(games or GAME_FILES)
+    shards = []
+
+    for game_type in games:
+        slug = GAME_SLUGS[game_type]
+        if by == 'page':
+            for page in range(1, (pages or 1) + 1):
+                shards.append(Shard(f"{game_type}:page:{page}", game_type,
+                                    start.to_pydatetime(), end.to_pydatetime(),
+                                    PAGE_URL.format(base_url=base_url, slug=slug, page=page)))
+            continue
+
+        if by not in SHARD_PERIODS:
+            raise ValueError(f"Shards are by year, month or page, not {by!r}")
+        for period in pd.period_range(start, end, freq=SHARD_PERIODS[by]):
+            shard_start = max(period.start_time, start).to_pydatetime()
+            shard_end = min(period.end_time.normalize(), end).to_pydatetime()
+            shards.append(Shard(f"{game_type}:{shard_start:%Y-%m-%d}:{shard_end:%Y-%m-%d}", game_type,
+                                shard_start, shard_end,
+                                RANGE_URL.format(base_url=base_url, slug=slug, start=shard_start, end=shard_end)))
+    return shards
+
+
+class BackfillCheckpoint:
+    """Shards already in the store, kept in a JSON file so a stopped backfill resumes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.completed = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.completed = json.load(f)
+            except ValueError as e:
+                print(f"Ignoring unreadable backfill checkpoint {path}: {e}")
+
+    def __contains__(self, key):
+        return key in self.completed
+
+    def mark(self, key, draws, stored):
+        """Record a shard as stored: draws found, and how many of them were new"""
+        self.completed[key] = {'draws': draws, 'stored': stored,
+                               'completed_at': datetime.now().isoformat(timespec='seconds')}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.completed, f, indent=2)
+        os.replace(tmp_file, self.path)
+
+    def clear(self):
+        self.completed = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Each worker process builds its own fetcher and extractor: a connection
+# pool or an event loop can't be shared across processes
+_fetcher = None
+_extractor = None
+
+
+def _start_worker(rate, snapshot_dir, plan_file, replay):
+    global _fetcher, _extractor
+    snapshot_cache = SnapshotCache(snapshot_dir) if snapshot_dir else None
+    _fetcher = AsyncFetcher(rate=rate, burst=1, snapshot_cache=snapshot_cache, replay=replay)
+    _extractor = DrawExtractor(plans=ExtractionPlans(plan_file))
+
+
+def fetch_shard(shard):
+    """Fetch and parse one shard in a worker process; its draws in the shard's range"""
+    response = _fetcher.get(shard.url)
+    response.raise_for_status()
+
+    # Every shard of a game is the same page layout, so they share one plan
+    source = urlsplit(shard.url)._replace(query='').geturl()
+    draws = _extractor.extract(response.content, shard.game_type, source=source)
+    return [draw for draw in draws if shard.start <= draw['draw_date'] <= shard.end]
+
+
+class HistoricalBackfill:
+    """Load years of history as many small, resumable shards.
+
+    The date range is split into shards (see plan_shards) that run on a
+    process pool, each process with its own fetcher. The main process is
+    the only writer: one DrawPipeline runs for the whole backfill, each
+    finished shard is added to the store through it and then
+    checkpointed, and the store is sorted once at the end. A crash
+    between storing and checkpointing only repeats that shard, whose
+    draws the pipeline drops as already stored, so rerunning the same
+    backfill carries on where it stopped.
+
+    rate is the request rate for the whole pool, shared out between the
+    processes. A shard whose page loaded is checkpointed even if it had
+    no draws (e.g. months before PowerBall Plus began); shards that
+    failed are retried by the next run.
+    """
+
+    def __init__(self, data_dir="data", workers=4, by='month', rate=2.0, base_url=BASE_URL,
+                 snapshot_dir=DEFAULT_SNAPSHOT_DIR, plan_file=DEFAULT_PLAN_FILE, replay=False):
+        self.store = DrawStore(data_dir)
+        self.checkpoint = BackfillCheckpoint(os.path.join(data_dir, CHECKPOINT_FILE))
+        self.workers = workers
+        self.by = by
+        self.rate = rate
+        self.base_url = base_url
+        self.snapshot_dir = snapshot_dir
+        self.plan_file = plan_file
+        self.replay = replay
+
+    def shards(self, start, end=None, games=None, pages=None):
+        return plan_shards(start, end or datetime.now(), self.by, games, pages, self.base_url)
+
+    def run(self, start, end=None, games=None, pages=None, fresh=False):
+        """Backfill every shard not yet checkpointed; returns counts for the run.
+
+        fresh=True forgets the checkpoint and fetches every shard again.
+        """
+        start_time = time.time()
+        if fresh:
+            self.checkpoint.clear()
+        shards = self.shards(start, end, games, pages)
+        pending = [shard for shard in shards if shard.key not in self.checkpoint]
+
+        report = {'shards': len(shards), 'resumed': len(shards) - len(pending),
+                  'completed': 0, 'empty': 0, 'failed': 0, 'stored': 0}
+        print(f"🗂️  Backfill: {len(pending)} of {len(shards)} {self.by} shards to go "
+              f"({report['resumed']} already done)")
+
+        if pending:
+            # One pipeline for the whole run: stored keys are read once and
+            # the store is put back in date order once, at the end
+            pipeline = DrawPipeline(self.store, compact=True)
+            pipeline.start()
+            workers = min(self.workers, len(pending))
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                         initargs=(self.rate / workers, self.snapshot_dir, self.plan_file, self.replay)) as pool:
+                    futures = {pool.submit(fetch_shard, shard): shard for shard in pending}
+                    for future in as_completed(futures):
+                        shard = futures[future]
+                        try:
+                            draws = future.result()
+                        except Exception as e:
+                            report['failed'] += 1
+                            print(f"❌ {shard.key}: {e}")
+                            continue
+
+                        # Store first, then checkpoint; a page with no draws in range is done too
+                        stored = pipeline.add(draws) if draws else 0
+                        self.checkpoint.mark(shard.key, len(draws), stored)
+                        report['completed'] += 1
+                        report['empty'] += 0 if draws else 1
+                        report['stored'] += stored
+                        print(f"✅ {shard.key}: {len(draws)} draws, {stored} new "
+                              f"({report['completed'] + report['resumed']}/{len(shards)})")
+            finally:
+                pipeline.finish()
+
+        report['seconds'] = round(time.time() - start_time, 1)
+        print(f"🗂️  Backfill stored {report['stored']} new draws from {report['completed']} shards "
+              f"({report['empty']} with no draws) in {report['seconds']:.1f}s")
+        if report['failed']:
+            print(f"⚠️  {report['failed']} shards failed; rerun to retry them")
+        return report
+
+
+if __name__ == "__main__":
+    # Backfill both games from 2009 on; rerunning resumes from the checkpoint
+    HistoricalBackfill().run(datetime(2009, 1, 1))
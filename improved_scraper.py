@@ -2,8 +2,8 @@
 
 import requests
 from bs4 import BeautifulSoup
+from async_fetcher import get_fetcher
 import re
-import time
 import json
 from datetime import datetime
 import gzip
@@ -42,17 +42,16 @@ def test_website_access():
         }
     ]
     
+    # One shared keep-alive session; it paces and retries requests itself
+    fetcher = get_fetcher()
+    
     for i, headers in enumerate(headers_list, 1):
         print(f"\n📡 Attempt {i} with headers: {headers['User-Agent'][:50]}...")
         
         try:
-            # Create session to maintain cookies
-            session = requests.Session()
-            session.headers.update(headers)
-            
             # First, try to get the main page
             print("  Getting main page...")
-            response = session.get(url, timeout=20, allow_redirects=True)
+            response = fetcher.get(url, headers=headers, timeout=20, allow_redirects=True)
             
             print(f"  Status: {response.status_code}")
             print(f"  Content-Type: {response.headers.get('content-type', 'Unknown')}")
@@ -131,9 +130,6 @@ def test_website_access():
             print(f"  ❌ Request failed: {e}")
         except Exception as e:
             print(f"  ❌ Error: {e}")
-        
-        # Wait between attempts
-        time.sleep(2)
     
     return False
 
@@ -149,18 +145,23 @@ def test_alternative_approaches():
         "https://www.nationallottery.co.za/results",
     ]
     
-    for url in urls_to_try:
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Connection': 'keep-alive',
+    }
+    
+    # Fetch every URL at once, then look through the pages in order
+    responses = get_fetcher().get_many(urls_to_try, headers=headers, timeout=15)
+    
+    for url, response in zip(urls_to_try, responses):
         print(f"\n🌐 Trying URL: {url}")
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-            }
+            if isinstance(response, Exception):
+                raise response
             
-            response = requests.get(url, headers=headers, timeout=15)
             print(f"  Status: {response.status_code}")
             
             if response.status_code == 200:
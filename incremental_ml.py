@@ -0,0 +1,92 @@
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+from ml_features import feature_matrix, arrays_feature_matrix, FEATURE_WINDOW
+
+
+class IncrementalNumberModel:
+    """Per-number "drawn next time" classifiers trained with partial_fit.
+
+    One binary SGD logistic regression per main number plus one 20-class
+    model for the powerball, all fed the feature row of the previous draw.
+    A new draw costs one partial_fit per model on a single row, so
+    training and inference stay flat as the history grows.
+    """
+
+    # Strong regularization: with weaker penalties the per-number models
+    # overfit single draws and give near-0/1 probabilities out of sample
+    def __init__(self, alpha=0.1, epochs=5, random_state=42):
+        self.alpha = alpha
+        self.epochs = epochs
+        self.random_state = random_state
+        self.main_models = [self._new_model(i) for i in range(MAIN_NUMBERS)]
+        self.powerball_model = self._new_model(MAIN_NUMBERS)
+        # The last few draws, enough to rebuild the current feature row
+        self.recent_main = np.empty((0, NUMBERS_PER_DRAW), dtype=np.int64)
+        self.recent_powerball = np.empty(0, dtype=np.int64)
+        self.recent_dates = np.empty(0, dtype='datetime64[ns]')
+        self.current_features = None
+        self.n_draws = 0
+
+    def _new_model(self, index):
+        return SGDClassifier(loss='log_loss', alpha=self.alpha, random_state=self.random_state + index)
+
+    @classmethod
+    def from_arrays(cls, arrays, alpha=0.1, epochs=5, random_state=42):
+        """Train on a whole history, a few chronological passes of partial_fit"""
+        model = cls(alpha, epochs, random_state)
+        if len(arrays) == 0:
+            return model
+
+        features = arrays_feature_matrix(arrays)
+        if len(arrays) > 1:
+            model.fit_rows(features[:-1], arrays.incidence[1:], arrays.powerball[1:])
+        model._remember(arrays.main, arrays.powerball, arrays.draw_dates)
+        model.current_features = features[-1]
+        model.n_draws = len(arrays)
+        return model
+
+    def fit_rows(self, X, main_targets, powerball_targets, epochs=None):
+        main_classes = np.array([0, 1])
+        powerball_classes = np.arange(1, POWERBALL_NUMBERS + 1)
+        for _ in range(epochs or self.epochs):
+            for number, classifier in enumerate(self.main_models):
+                classifier.partial_fit(X, main_targets[:, number], classes=main_classes)
+            self.powerball_model.partial_fit(X, powerball_targets, classes=powerball_classes)
+
+    def _remember(self, main, powerball, draw_dates):
+        # One extra draw so the days-since-previous feature is available
+        keep = FEATURE_WINDOW + 1
+        self.recent_main = np.concatenate([self.recent_main, np.asarray(main, dtype=np.int64).reshape(-1, NUMBERS_PER_DRAW)])[-keep:]
+        self.recent_powerball = np.concatenate([self.recent_powerball, np.atleast_1d(powerball).astype(np.int64)])[-keep:]
+        self.recent_dates = np.concatenate([self.recent_dates, np.atleast_1d(np.asarray(draw_dates, dtype='datetime64[ns]'))])[-keep:]
+
+    def update(self, main_numbers, powerball, draw_date):
+        """Learn from one new draw, then move the feature row forward"""
+        if self.current_features is not None:
+            target = np.zeros((1, MAIN_NUMBERS), dtype=np.int64)
+            target[0, np.asarray(main_numbers) - 1] = 1
+            self.fit_rows(self.current_features[None, :], target, np.array([int(powerball)]), epochs=1)
+
+        self._remember(np.sort(np.asarray(main_numbers)), powerball, draw_date)
+        self.current_features = feature_matrix(self.recent_main, self.recent_powerball, self.recent_dates)[-1]
+        self.n_draws += 1
+
+    def predict_proba(self):
+        """Predicted probability of each main number and powerball in the next draw"""
+        if self.n_draws < 2:
+            return (np.full(MAIN_NUMBERS, NUMBERS_PER_DRAW / MAIN_NUMBERS),
+                    np.full(POWERBALL_NUMBERS, 1 / POWERBALL_NUMBERS))
+
+        main, powerball = self.predict_rows(self.current_features[None, :])
+        return main[0], powerball[0]
+
+    def predict_rows(self, X):
+        """Main-number and powerball probabilities for a batch of feature rows"""
+        # All 50 logistic models in one product instead of 50 predict_proba calls
+        coef = np.vstack([classifier.coef_[0] for classifier in self.main_models])
+        intercept = np.array([classifier.intercept_[0] for classifier in self.main_models])
+        main = 1 / (1 + np.exp(-(X @ coef.T + intercept)))
+        powerball = np.zeros((len(X), POWERBALL_NUMBERS))
+        powerball[:, self.powerball_model.classes_ - 1] = self.powerball_model.predict_proba(X)
+        return main, powerball
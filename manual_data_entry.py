@@ -4,6 +4,9 @@ import pandas as pd
 from datetime import datetime
 import os
 import json
+from draw_arrays import parse_numbers
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline, is_valid_draw
 
 class ManualDataEntry:
     def __init__(self):
@@ -14,68 +17,42 @@ class ManualDataEntry:
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = DrawStore(self.data_dir)
+    
+    def draw_data(self, draw_date, main_numbers, powerball, game_type="PowerBall"):
+        """A draw dict from entered values"""
+        # Parse date
+        if isinstance(draw_date, str):
+            draw_date = datetime.strptime(draw_date, '%Y-%m-%d')
+        
+        # "[1, 5, 12, 23, 45]", "1, 5, 12, 23, 45" or a list
+        main_numbers = sorted(parse_numbers(main_numbers))
+        
+        return {
+            'draw_date': draw_date.strftime('%Y-%m-%d'),
+            'main_numbers': main_numbers,
+            'powerball': int(powerball),
+            'game_type': game_type,
+            'draw_day': draw_date.strftime('%A'),
+            'source': 'manual_entry'
+        }
     
     def add_draw(self, draw_date, main_numbers, powerball, game_type="PowerBall"):
         """Add a single draw to the data"""
         try:
-            # Parse date
-            if isinstance(draw_date, str):
-                draw_date = datetime.strptime(draw_date, '%Y-%m-%d')
-            
-            # Ensure main_numbers is a list
-            if isinstance(main_numbers, str):
-                # Handle different formats
-                if main_numbers.startswith('[') and main_numbers.endswith(']'):
-                    main_numbers = eval(main_numbers)
-                else:
-                    # Split by comma and convert to int
-                    main_numbers = [int(x.strip()) for x in main_numbers.split(',')]
+            draw_data = self.draw_data(draw_date, main_numbers, powerball, game_type)
             
             # Validate numbers
-            if len(main_numbers) != 5:
-                raise ValueError(f"Must have exactly 5 main numbers, got {len(main_numbers)}")
-            
-            if not all(1 <= n <= 50 for n in main_numbers):
-                raise ValueError(f"Main numbers must be between 1-50, got {main_numbers}")
-            
-            if not (1 <= powerball <= 20):
-                raise ValueError(f"PowerBall must be between 1-20, got {powerball}")
-            
-            # Create draw data
-            draw_data = {
-                'draw_date': draw_date.strftime('%Y-%m-%d'),
-                'main_numbers': sorted(main_numbers),
-                'powerball': int(powerball),
-                'game_type': game_type,
-                'draw_day': draw_date.strftime('%A'),
-                'source': 'manual_entry'
-            }
+            if not is_valid_draw(draw_data):
+                raise ValueError(f"Need 5 different main numbers from 1-50 and a PowerBall from 1-20 "
+                                 f"for PowerBall or PowerBall Plus, got {draw_data['main_numbers']} + {powerball} ({game_type})")
             
-            # Load existing data
-            if os.path.exists(self.all_data_file):
-                df = pd.read_csv(self.all_data_file)
-            else:
-                df = pd.DataFrame()
+            report = DrawPipeline(self.store).run([draw_data])
+            if not report['stored']:
+                print(f"⚠️  {game_type} draw for {draw_data['draw_date']} is already stored")
+                return False
             
-            # Add new draw
-            new_row = pd.DataFrame([draw_data])
-            df = pd.concat([df, new_row], ignore_index=True)
-            
-            # Remove duplicates and sort
-            df = df.drop_duplicates(subset=['draw_date', 'game_type'])
-            df = df.sort_values('draw_date', ascending=False)
-            
-            # Save all data
-            df.to_csv(self.all_data_file, index=False)
-            
-            # Save separate files
-            powerball_data = df[df['game_type'] == 'PowerBall']
-            powerball_plus_data = df[df['game_type'] == 'PowerBall Plus']
-            
-            powerball_data.to_csv(self.powerball_file, index=False)
-            powerball_plus_data.to_csv(self.powerball_plus_file, index=False)
-            
-            print(f"✅ Added {game_type} draw: {draw_date.strftime('%Y-%m-%d')} - {sorted(main_numbers)} + {powerball}")
+            print(f"✅ Added {game_type} draw: {draw_data['draw_date']} - {draw_data['main_numbers']} + {powerball}")
             return True
             
         except Exception as e:
@@ -83,17 +60,20 @@ class ManualDataEntry:
             return False
     
     def add_multiple_draws(self, draws_data):
-        """Add multiple draws at once"""
+        """Add multiple draws at once, in one write to the store"""
         print(f"📝 Adding {len(draws_data)} draws...")
         
-        success_count = 0
-        for i, draw in enumerate(draws_data, 1):
-            print(f"  {i}/{len(draws_data)}: {draw}")
-            if self.add_draw(**draw):
-                success_count += 1
+        def entered_draws():
+            for i, draw in enumerate(draws_data, 1):
+                print(f"  {i}/{len(draws_data)}: {draw}")
+                try:
+                    yield self.draw_data(**draw)
+                except Exception as e:
+                    print(f"❌ Error in draw {i}: {e}")
         
-        print(f"✅ Successfully added {success_count}/{len(draws_data)} draws")
-        return success_count
+        report = DrawPipeline(self.store).run(entered_draws())
+        print(f"✅ Successfully added {report['stored']}/{len(draws_data)} draws")
+        return report['stored']
     
     def show_current_data(self):
         """Show current data status"""
@@ -101,14 +81,14 @@ class ManualDataEntry:
         print("=" * 30)
         
         if os.path.exists(self.all_data_file):
-            df = pd.read_csv(self.all_data_file)
+            df = self.store.load()
             print(f"Total draws: {len(df)}")
-            print(f"Date range: {df['draw_date'].min()} to {df['draw_date'].max()}")
+            print(f"Date range: {df['draw_date'].min():%Y-%m-%d} to {df['draw_date'].max():%Y-%m-%d}")
             print(f"Game types: {df['game_type'].value_counts().to_dict()}")
             
             print(f"\nRecent draws:")
             for i, row in df.head(5).iterrows():
-                print(f"  {i+1}. {row['draw_date']} - {row['main_numbers']} + {row['powerball']} ({row['game_type']})")
+                print(f"  {i+1}. {row['draw_date']:%Y-%m-%d} - {row['main_numbers']} + {row['powerball']} ({row['game_type']})")
         else:
             print("No data found")
     
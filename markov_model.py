@@ -0,0 +1,113 @@
+import numpy as np
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+
+DEFAULT_LAGS = (1, 2)
+
+
+class TransitionModel:
+    """Markov transition counts between draws.
+
+    For each lag k, transitions[k][i, j] counts the draws t in which
+    number j came up when number i had come up k draws earlier, so row i
+    over its source count estimates P(j in draw t | i in draw t - k).
+    Each lag is conditioned on its own single earlier draw; lag 2 is not
+    a second-order chain on draws t - 1 and t - 2 jointly. The
+    same is kept conditioned on the previous powerball, both for the main
+    numbers (20 x 50) and the next powerball (20 x 20). Counts are built
+    from incidence-matrix products and updated in O(25) per new draw.
+    """
+
+    def __init__(self, lags=DEFAULT_LAGS, smoothing=1.0):
+        self.lags = tuple(sorted(lags))
+        self.smoothing = float(smoothing)
+        self.transitions = {k: np.zeros((MAIN_NUMBERS, MAIN_NUMBERS), dtype=np.int64) for k in self.lags}
+        self.sources = {k: np.zeros(MAIN_NUMBERS, dtype=np.int64) for k in self.lags}
+        self.powerball_main = np.zeros((POWERBALL_NUMBERS, MAIN_NUMBERS), dtype=np.int64)
+        self.powerball_powerball = np.zeros((POWERBALL_NUMBERS, POWERBALL_NUMBERS), dtype=np.int64)
+        self.powerball_sources = np.zeros(POWERBALL_NUMBERS, dtype=np.int64)
+        # Most recent draws first, as many as the longest lag needs
+        self.recent_main = []
+        self.recent_powerball = []
+        self.n_draws = 0
+
+    @classmethod
+    def from_arrays(cls, arrays, lags=DEFAULT_LAGS, smoothing=1.0):
+        """Count every transition in a history with one matrix product per lag"""
+        model = cls(lags, smoothing)
+        n_draws = len(arrays)
+        if n_draws == 0:
+            return model
+
+        incidence = arrays.incidence.astype(np.int64)
+        powerball_incidence = arrays.powerball_incidence.astype(np.int64)
+        for k in model.lags:
+            if n_draws > k:
+                model.transitions[k] = incidence[:-k].T @ incidence[k:]
+                model.sources[k] = incidence[:-k].sum(axis=0)
+        if n_draws > 1:
+            model.powerball_main = powerball_incidence[:-1].T @ incidence[1:]
+            model.powerball_powerball = powerball_incidence[:-1].T @ powerball_incidence[1:]
+            model.powerball_sources = powerball_incidence[:-1].sum(axis=0)
+
+        depth = max(model.lags)
+        model.recent_main = [arrays.main[-1 - i] - 1 for i in range(min(depth, n_draws))]
+        model.recent_powerball = [int(arrays.powerball[-1]) - 1]
+        model.n_draws = n_draws
+        return model
+
+    def update(self, main_numbers, powerball):
+        """Count the transitions into one new draw"""
+        main = np.asarray(main_numbers) - 1
+        powerball = int(powerball) - 1
+        for k in self.lags:
+            if len(self.recent_main) >= k:
+                previous = self.recent_main[k - 1]
+                self.transitions[k][previous[:, None], main[None, :]] += 1
+                self.sources[k][previous] += 1
+        if self.recent_powerball:
+            previous = self.recent_powerball[0]
+            self.powerball_main[previous, main] += 1
+            self.powerball_powerball[previous, powerball] += 1
+            self.powerball_sources[previous] += 1
+
+        self.recent_main = ([main] + self.recent_main)[:max(self.lags)]
+        self.recent_powerball = [powerball]
+        self.n_draws += 1
+
+    def _conditional(self, counts, sources, expected):
+        """Smoothed P(column | row), shrunk towards the uniform rate"""
+        return (counts + self.smoothing * expected) / (sources[:, None] + self.smoothing)
+
+    def transition_matrix(self, lag=1):
+        """P(number j in the next draw | number i lag draws back), rows summing to 5"""
+        return self._conditional(self.transitions[lag], self.sources[lag], NUMBERS_PER_DRAW / MAIN_NUMBERS)
+
+    def powerball_matrices(self):
+        """P(main j | previous powerball) and P(powerball q | previous powerball)"""
+        return (self._conditional(self.powerball_main, self.powerball_sources, NUMBERS_PER_DRAW / MAIN_NUMBERS),
+                self._conditional(self.powerball_powerball, self.powerball_sources, 1 / POWERBALL_NUMBERS))
+
+    def next_draw_scores(self):
+        """Expected inclusion probability of each number in the next draw.
+
+        Main numbers average the predictions of every lag and of the
+        previous powerball; each lag's prediction is the mean of the
+        transition rows of the numbers drawn k draws back.
+        """
+        predictions = []
+        for k in self.lags:
+            if len(self.recent_main) >= k:
+                predictions.append(self.transition_matrix(k)[self.recent_main[k - 1]].mean(axis=0))
+
+        if self.recent_powerball:
+            main_given_powerball, powerball_given_powerball = self.powerball_matrices()
+            predictions.append(main_given_powerball[self.recent_powerball[0]])
+            powerball_scores = powerball_given_powerball[self.recent_powerball[0]]
+        else:
+            powerball_scores = np.full(POWERBALL_NUMBERS, 1 / POWERBALL_NUMBERS)
+
+        if predictions:
+            main_scores = np.mean(predictions, axis=0)
+        else:
+            main_scores = np.full(MAIN_NUMBERS, NUMBERS_PER_DRAW / MAIN_NUMBERS)
+        return main_scores, powerball_scores
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW, incidence_matrix
+
+# Number of recent draws the rolling features look back over
+FEATURE_WINDOW = 5
+
+FEATURE_NAMES = (
+    [f'last_main_{n}' for n in range(1, MAIN_NUMBERS + 1)] +
+    [f'recent_main_{n}' for n in range(1, MAIN_NUMBERS + 1)] +
+    [f'last_powerball_{n}' for n in range(1, POWERBALL_NUMBERS + 1)] +
+    [f'weekday_{d}' for d in range(7)] +
+    ['days_since_previous', 'recent_mean', 'recent_std']
+)
+
+
+def feature_matrix(main, powerball, draw_dates, window=FEATURE_WINDOW):
+    """Feature rows describing the history up to and including each draw.
+
+    Row t is what a model sees when predicting draw t + 1: the numbers and
+    powerball of draw t, how often each number came up in the last
+    `window` draws, the weekday and days since the previous draw, and the
+    mean and spread of the recent numbers. Rolling values come from
+    cumulative sums, so the whole matrix is built without a Python loop.
+    """
+    n_draws = len(main)
+    main = np.asarray(main, dtype=np.int64)
+    incidence = incidence_matrix(main, MAIN_NUMBERS).astype(np.float64)
+    powerball_incidence = incidence_matrix(np.asarray(powerball), POWERBALL_NUMBERS).astype(np.float64)
+
+    # Rolling sums over the last `window` draws (fewer at the start)
+    end = np.arange(1, n_draws + 1)
+    start = np.maximum(0, end - window)
+    in_window = (end - start)[:, None]
+
+    def rolling(values):
+        cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+        return cumulative[end] - cumulative[start]
+
+    recent_counts = rolling(incidence) / in_window
+    recent_sum = rolling(main.sum(axis=1, keepdims=True).astype(np.float64))
+    recent_squares = rolling((main ** 2).sum(axis=1, keepdims=True).astype(np.float64))
+    recent_mean = recent_sum / (NUMBERS_PER_DRAW * in_window)
+    recent_std = np.sqrt(np.maximum(recent_squares / (NUMBERS_PER_DRAW * in_window) - recent_mean ** 2, 0))
+
+    dates = pd.DatetimeIndex(draw_dates)
+    weekdays = np.zeros((n_draws, 7))
+    weekdays[np.arange(n_draws), dates.weekday] = 1
+    days_since = np.full((n_draws, 1), 7.0)
+    if n_draws > 1:
+        days_since[1:, 0] = np.diff(dates.values).astype('timedelta64[D]').astype(np.float64)
+
+    return np.hstack([
+        incidence,
+        recent_counts,
+        powerball_incidence,
+        weekdays,
+        days_since / 7,
+        recent_mean / MAIN_NUMBERS,
+        recent_std / MAIN_NUMBERS
+    ])
+
+
+def arrays_feature_matrix(arrays, window=FEATURE_WINDOW):
+    """feature_matrix for a DrawArrays history"""
+    return feature_matrix(arrays.main, arrays.powerball, arrays.draw_dates, window)
@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+from draw_arrays import DrawArrays, MAIN_NUMBERS, NUMBERS_PER_DRAW
+from ml_features import arrays_feature_matrix
+from incremental_ml import IncrementalNumberModel
+
+DEFAULT_CONFIG_FILE = "data/model_config.json"
+
+# Settings get_ml_predictions used before any tuning
+DEFAULT_PARAMS = {
+    'machine_learning': {'n_estimators': 100, 'max_depth': None, 'min_samples_leaf': 1},
+    'incremental_ml': {'alpha': 0.1, 'epochs': 5},
+}
+
+PARAM_GRIDS = {
+    'machine_learning': {'n_estimators': [50, 100, 200], 'max_depth': [None, 8], 'min_samples_leaf': [1, 5]},
+    'incremental_ml': {'alpha': [0.01, 0.1, 1.0], 'epochs': [1, 5]},
+}
+
+# Score each strategy is ranked by, and whether higher is better
+METRICS = {
+    'machine_learning': ('hit_rate', True),
+    'incremental_ml': ('log_loss', False),
+}
+
+# Feature matrix and targets shared by every fold; set once per worker process
+_shared = {}
+
+
+def _share(features, main, powerball):
+    _shared['X'] = features[:-1]
+    _shared['main'] = main[1:]
+    _shared['powerball'] = powerball[1:]
+    incidence = np.zeros((len(main) - 1, MAIN_NUMBERS), dtype=np.int64)
+    incidence[np.arange(len(main) - 1)[:, None], main[1:] - 1] = 1
+    _shared['incidence'] = incidence
+
+
+def _evaluate(strategy, params, train_stop, test_stop):
+    """Fit on rows [0, train_stop) and score on [train_stop, test_stop)"""
+    X, main, powerball, incidence = _shared['X'], _shared['main'], _shared['powerball'], _shared['incidence']
+    train, test = slice(0, train_stop), slice(train_stop, test_stop)
+
+    if strategy == 'machine_learning':
+        # One forest per sorted position, as in get_ml_predictions
+        picks = np.column_stack([
+            RandomForestClassifier(random_state=42, **params).fit(X[train], main[train, i]).predict(X[test])
+            for i in range(NUMBERS_PER_DRAW)
+        ])
+        picked = np.zeros((len(picks), MAIN_NUMBERS), dtype=np.int64)
+        picked[np.arange(len(picks))[:, None], picks - 1] = 1
+        return float((picked * incidence[test]).sum(axis=1).mean() / NUMBERS_PER_DRAW)
+
+    model = IncrementalNumberModel(**params)
+    model.fit_rows(X[train], incidence[train], powerball[train])
+    main_proba, powerball_proba = model.predict_rows(X[test])
+    main_proba = np.clip(main_proba, 1e-6, 1 - 1e-6)
+    actual = incidence[test]
+    main_loss = -(actual * np.log(main_proba) + (1 - actual) * np.log(1 - main_proba)).mean()
+    powerball_loss = -np.log(np.maximum(powerball_proba[np.arange(len(actual)), powerball[test] - 1], 1e-6)).mean()
+    return float(main_loss + powerball_loss / MAIN_NUMBERS)
+
+
+def tune_models(arrays, strategies=None, n_splits=5, n_workers=None):
+    """Expanding-window time-series cross-validation over each strategy's grid.
+
+    The feature matrix is built once and handed to each worker process on
+    start-up; every (parameters, fold) pair is then an independent job.
+    """
+    strategies = strategies or list(PARAM_GRIDS)
+    n_workers = n_workers or os.cpu_count() or 1
+    features = arrays_feature_matrix(arrays)
+    main = arrays.main.astype(np.int64)
+    powerball = arrays.powerball.astype(np.int64)
+
+    folds = [(int(train[-1]) + 1, int(test[-1]) + 1) for train, test in TimeSeriesSplit(n_splits=n_splits).split(features[:-1])]
+    jobs = [
+        (strategy, params, train_stop, test_stop)
+        for strategy in strategies
+        for params in ParameterGrid(PARAM_GRIDS[strategy])
+        for train_stop, test_stop in folds
+    ]
+
+    start = time.time()
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_share, initargs=(features, main, powerball)) as pool:
+            scores = list(pool.map(_evaluate, *zip(*jobs)))
+    else:
+        _share(features, main, powerball)
+        scores = [_evaluate(*job) for job in jobs]
+
+    results = {}
+    for strategy in strategies:
+        metric, higher_is_better = METRICS[strategy]
+        candidates = []
+        for params in ParameterGrid(PARAM_GRIDS[strategy]):
+            fold_scores = [score for (s, p, _, _), score in zip(jobs, scores) if s == strategy and p == params]
+            candidates.append({
+                'params': params,
+                'mean': float(np.mean(fold_scores)),
+                'std': float(np.std(fold_scores)),
+                'fold_scores': fold_scores
+            })
+        candidates.sort(key=lambda c: -c['mean'] if higher_is_better else c['mean'])
+        results[strategy] = {
+            'params': candidates[0]['params'],
+            'metric': metric,
+            'score': candidates[0]['mean'],
+            'candidates': candidates
+        }
+
+    return {
+        'dataset_version': arrays.version(),
+        'total_draws': len(arrays),
+        'n_splits': n_splits,
+        'tuned_at': datetime.now().isoformat(timespec='seconds'),
+        'elapsed_seconds': round(time.time() - start, 2),
+        'strategies': results
+    }
+
+
+def load_model_config(config_file=DEFAULT_CONFIG_FILE):
+    """Read stored tuning results ({} if none)"""
+    try:
+        with open(config_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_model_config(config, config_file=DEFAULT_CONFIG_FILE):
+    """Write tuning results atomically"""
+    directory = os.path.dirname(config_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_file = f"{config_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(config, f, indent=2, default=str)
+    os.replace(tmp_file, config_file)
+
+
+def tuned_params(config, game_type, strategy, dataset_version=None):
+    """Best parameters for a strategy, falling back to the untuned defaults.
+
+    With dataset_version given, parameters tuned on a different version
+    of the game's draws are stale and the defaults are used instead.
+    """
+    params = dict(DEFAULT_PARAMS[strategy])
+    tuned = config.get(game_type, {})
+    if dataset_version is not None and tuned and tuned.get('dataset_version') != dataset_version:
+        print(f"⚠️  {game_type} {strategy} settings were tuned on dataset {tuned.get('dataset_version')}, "
+              f"not {dataset_version}; using the defaults until model_tuning.py is rerun")
+        return params
+    params.update(tuned.get('strategies', {}).get(strategy, {}).get('params', {}))
+    return params
+
+
+def tune_data_file(data_file="data/all_powerball_data.csv", config_file=DEFAULT_CONFIG_FILE, n_splits=5, n_workers=None):
+    """Tune every game in a data file and store the results"""
+    df = pd.read_csv(data_file)
+    config = load_model_config(config_file)
+    for game_type in df['game_type'].dropna().unique():
+        arrays = DrawArrays.from_frame(df, game_type)
+        if len(arrays) < 10 * (n_splits + 1):
+            print(f"Skipping {game_type}: only {len(arrays)} draws")
+            continue
+        config[game_type] = tune_models(arrays, n_splits=n_splits, n_workers=n_workers)
+        for strategy, result in config[game_type]['strategies'].items():
+            print(f"{game_type} {strategy}: {result['params']} ({result['metric']} {result['score']:.4f})")
+    save_model_config(config, config_file)
+    return config
+
+
+if __name__ == "__main__":
+    tune_data_file()
@@ -0,0 +1,301 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+
+# Which tail of the null distribution counts as "extreme" for each statistic
+STATISTIC_TAILS = {
+    'main_max_frequency': 'upper',
+    'main_min_frequency': 'lower',
+    'main_chi_square': 'upper',
+    'powerball_max_frequency': 'upper',
+    'powerball_min_frequency': 'lower',
+    'powerball_chi_square': 'upper',
+    'even_odd_ratio': 'two_sided',
+    'low_high_ratio': 'two_sided',
+    'avg_consecutive': 'two_sided',
+    'sum_mean': 'two_sided',
+    'sum_std': 'two_sided',
+    'gap_mean': 'two_sided',
+    'gap_std': 'two_sided',
+}
+
+# Per-number count distributions, kept as histograms rather than samples
+COUNT_HISTOGRAMS = ('main_number_frequency', 'powerball_number_frequency')
+
+# Compare-exchange pairs of an optimal 5-element sorting network
+_SORT5_NETWORK = ((0, 1), (3, 4), (2, 4), (2, 3), (0, 3), (0, 2), (1, 4), (1, 3), (1, 2))
+
+
+def _sort5(draws):
+    """Sort a (5, M) array along axis 0 in place, column by column"""
+    for i, j in _SORT5_NETWORK:
+        low = np.minimum(draws[i], draws[j])
+        np.maximum(draws[i], draws[j], out=draws[j])
+        draws[i] = low
+    return draws
+
+
+def sample_main_numbers(rng, n_rows):
+    """Sample n_rows uniform 5-of-50 draws as a sorted (5, n_rows) 0-based array"""
+    draws = _sort5(rng.integers(0, MAIN_NUMBERS, size=(NUMBERS_PER_DRAW, n_rows), dtype=np.uint8))
+
+    # Resample the ~19% of rows that picked the same number twice
+    redo = np.flatnonzero((draws[1:] == draws[:-1]).any(axis=0))
+    while redo.size:
+        fresh = _sort5(rng.integers(0, MAIN_NUMBERS, size=(NUMBERS_PER_DRAW, redo.size), dtype=np.uint8))
+        draws[:, redo] = fresh
+        redo = redo[(fresh[1:] == fresh[:-1]).any(axis=0)]
+
+    return draws
+
+
+def history_statistics(main, powerball):
+    """Compute the analyzer's report statistics for a batch of histories.
+
+    main is a sorted (5, B, N) array of 0-based main numbers and powerball a
+    (B, N) array of 0-based powerballs. Every statistic comes back as a (B,)
+    array, plus the per-number count matrices.
+    """
+    _, n_histories, n_draws = main.shape
+    offsets = (np.arange(n_histories, dtype=np.int32) * MAIN_NUMBERS)[None, :, None]
+    main_counts = np.bincount((main + offsets).ravel(), minlength=n_histories * MAIN_NUMBERS)
+    main_counts = main_counts.reshape(n_histories, MAIN_NUMBERS)
+
+    offsets = (np.arange(n_histories, dtype=np.int32) * POWERBALL_NUMBERS)[:, None]
+    powerball_counts = np.bincount((powerball + offsets).ravel(), minlength=n_histories * POWERBALL_NUMBERS)
+    powerball_counts = powerball_counts.reshape(n_histories, POWERBALL_NUMBERS)
+
+    total_main = n_draws * NUMBERS_PER_DRAW
+    expected_main = total_main / MAIN_NUMBERS
+    expected_powerball = n_draws / POWERBALL_NUMBERS
+
+    # Sums of the 1-based numbers in each draw
+    sums = main.sum(axis=0, dtype=np.int32) + NUMBERS_PER_DRAW
+    gaps = (main[1:] - main[:-1]).astype(np.int16)
+
+    stats = {
+        'main_max_frequency': main_counts.max(axis=1),
+        'main_min_frequency': main_counts.min(axis=1),
+        'main_chi_square': ((main_counts - expected_main) ** 2).sum(axis=1) / expected_main,
+        'powerball_max_frequency': powerball_counts.max(axis=1),
+        'powerball_min_frequency': powerball_counts.min(axis=1),
+        'powerball_chi_square': ((powerball_counts - expected_powerball) ** 2).sum(axis=1) / expected_powerball,
+        # 0-based odd indices are the even numbers 2, 4, ..., 50
+        'even_odd_ratio': main_counts[:, 1::2].sum(axis=1) / total_main,
+        'low_high_ratio': main_counts[:, :MAIN_NUMBERS // 2].sum(axis=1) / total_main,
+        'avg_consecutive': (gaps == 1).sum(axis=(0, 2)) / n_draws,
+        'sum_mean': sums.mean(axis=1),
+        'sum_std': sums.std(axis=1),
+        'gap_mean': gaps.mean(axis=(0, 2)),
+        'gap_std': gaps.std(axis=(0, 2)),
+    }
+    stats = {name: np.asarray(value, dtype=np.float64) for name, value in stats.items()}
+
+    return stats, main_counts, powerball_counts
+
+
+def observed_statistics(arrays):
+    """Statistics of a real history, computed exactly like the simulated ones"""
+    main = (arrays.main.T - 1).astype(np.uint8)[:, None, :]
+    powerball = (arrays.powerball - 1).astype(np.int32)[None, :]
+    stats, main_counts, powerball_counts = history_statistics(main, powerball)
+    observed = {name: float(value[0]) for name, value in stats.items()}
+    return observed, main_counts[0], powerball_counts[0]
+
+
+def chunk_sizes(total, chunk):
+    """Split total items into chunks of at most chunk items"""
+    sizes = [chunk] * (total // chunk)
+    if total % chunk:
+        sizes.append(total % chunk)
+    return sizes
+
+
+def run_chunks(function, jobs, n_workers):
+    """Run function(*job) for every job, on a process pool when it pays off"""
+    if n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(jobs))) as pool:
+            return list(pool.map(function, *zip(*jobs)))
+    return [function(*job) for job in jobs]
+
+
+def empirical_p_value(observed, samples, tail='two_sided'):
+    """Monte Carlo p-value of an observed value against sorted samples"""
+    observed = np.asarray(observed, dtype=samples.dtype)
+    n = len(samples)
+    lower = (np.searchsorted(samples, observed, side='right') + 1) / (n + 1)
+    upper = (n - np.searchsorted(samples, observed, side='left') + 1) / (n + 1)
+
+    if tail == 'upper':
+        return float(upper)
+    if tail == 'lower':
+        return float(lower)
+    return float(min(1.0, 2 * min(lower, upper)))
+
+
+def _simulate_chunk(n_draws, n_histories, seed_sequence):
+    """Simulate one chunk of uniform histories (runs inside a pool worker)"""
+    rng = np.random.default_rng(seed_sequence)
+    main = sample_main_numbers(rng, n_histories * n_draws).reshape(NUMBERS_PER_DRAW, n_histories, n_draws)
+    powerball = rng.integers(0, POWERBALL_NUMBERS, size=(n_histories, n_draws), dtype=np.int32)
+
+    stats, main_counts, powerball_counts = history_statistics(main, powerball)
+    stats = {name: value.astype(np.float32) for name, value in stats.items()}
+    histograms = {
+        'main_number_frequency': np.bincount(main_counts.ravel(), minlength=n_draws + 1),
+        'powerball_number_frequency': np.bincount(powerball_counts.ravel(), minlength=n_draws + 1),
+    }
+    return stats, histograms
+
+
+class MonteCarloEngine:
+    """Null-model simulator for the statistics PowerBallAnalyzer reports.
+
+    Synthetic histories of uniform 5-of-50 + 1-of-20 draws are generated in
+    vectorized chunks, spread over a process pool with independent seed
+    streams, and cached per (history length, statistic).
+    """
+
+    def __init__(self, n_histories=10000, rows_per_chunk=1000000, n_workers=None,
+                 seed=None, confidence=0.95, cache_file=None):
+        self.n_histories = n_histories
+        self.rows_per_chunk = rows_per_chunk
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.seed = seed
+        self.confidence = confidence
+        self.cache_file = cache_file
+
+        # (n_draws, statistic) -> sorted float32 samples / count histogram
+        self._samples = {}
+        self._histograms = {}
+        self.load_cache()
+
+    def load_cache(self):
+        """Load previously simulated distributions from the cache file"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with np.load(self.cache_file) as cached:
+                for key in cached.files:
+                    kind, statistic, n_draws = key.split('|')
+                    store = self._histograms if kind == 'histogram' else self._samples
+                    store[(int(n_draws), statistic)] = cached[key]
+        except Exception as e:
+            print(f"Error loading Monte Carlo cache: {e}")
+
+    def save_cache(self):
+        """Write all cached distributions to the cache file"""
+        if not self.cache_file:
+            return
+        arrays = {f"samples|{stat}|{n}": values for (n, stat), values in self._samples.items()}
+        arrays.update({f"histogram|{stat}|{n}": values for (n, stat), values in self._histograms.items()})
+
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, self.cache_file)
+
+    def is_cached(self, n_draws, n_histories=None):
+        n_histories = n_histories or self.n_histories
+        cached = self._samples.get((n_draws, 'main_chi_square'))
+        return cached is not None and len(cached) >= n_histories
+
+    def simulate(self, n_draws, n_histories=None):
+        """Null distributions of every statistic for histories of n_draws draws"""
+        n_histories = n_histories or self.n_histories
+        if n_draws < 1:
+            return {}
+
+        if not self.is_cached(n_draws, n_histories):
+            start = time.time()
+            self._run_simulation(n_draws, n_histories)
+            print(f"Simulated {n_histories:,} histories of {n_draws} draws in {time.time() - start:.1f}s")
+            self.save_cache()
+
+        return {stat: self._samples[(n_draws, stat)] for stat in STATISTIC_TAILS}
+
+    def _run_simulation(self, n_draws, n_histories):
+        sizes = chunk_sizes(n_histories, max(1, self.rows_per_chunk // n_draws))
+
+        # Independent, reproducible stream per chunk regardless of worker count
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        jobs = [(n_draws, size, seed) for size, seed in zip(sizes, seeds)]
+        results = run_chunks(_simulate_chunk, jobs, self.n_workers)
+
+        for stat in STATISTIC_TAILS:
+            self._samples[(n_draws, stat)] = np.sort(np.concatenate([stats[stat] for stats, _ in results]))
+        for name in COUNT_HISTOGRAMS:
+            self._histograms[(n_draws, name)] = np.sum([histograms[name] for _, histograms in results], axis=0)
+
+    def p_value(self, statistic, observed, samples):
+        """p-value of an observed statistic in the tail that matters for it"""
+        return empirical_p_value(observed, samples, STATISTIC_TAILS.get(statistic, 'two_sided'))
+
+    def band(self, samples):
+        """Central confidence band of a null distribution"""
+        alpha = 1 - self.confidence
+        low, high = np.quantile(samples, [alpha / 2, 1 - alpha / 2])
+        return [float(low), float(high)]
+
+    def evaluate(self, arrays, n_histories=None):
+        """p-values and confidence bands for every statistic of one history"""
+        if len(arrays) == 0:
+            return {}
+
+        observed, _, _ = observed_statistics(arrays)
+        null = self.simulate(len(arrays), n_histories)
+
+        results = {}
+        for stat, samples in null.items():
+            p_value = self.p_value(stat, observed[stat], samples)
+            results[stat] = {
+                'observed': observed[stat],
+                'p_value': p_value,
+                'band': self.band(samples),
+                'null_mean': float(samples.mean()),
+                'significant': p_value < 1 - self.confidence
+            }
+        return results
+
+    def number_frequency_bands(self, arrays, n_histories=None):
+        """Per-number frequency bands and p-values for main numbers and powerballs"""
+        if len(arrays) == 0:
+            return {}
+
+        n_draws = len(arrays)
+        self.simulate(n_draws, n_histories)
+        _, main_counts, powerball_counts = observed_statistics(arrays)
+
+        report = {}
+        for name, counts in (('main_number_frequency', main_counts), ('powerball_number_frequency', powerball_counts)):
+            histogram = self._histograms[(n_draws, name)]
+            cdf = np.cumsum(histogram) / histogram.sum()
+            alpha = 1 - self.confidence
+
+            # P(count <= c) and P(count >= c) for each observed count
+            lower = cdf[counts]
+            upper = 1 - np.concatenate([[0.0], cdf])[counts]
+            p_values = np.minimum(1.0, 2 * np.minimum(lower, upper))
+
+            report[name] = {
+                'band': [int(np.searchsorted(cdf, alpha / 2)), int(np.searchsorted(cdf, 1 - alpha / 2))],
+                'numbers': [
+                    {'number': i + 1, 'frequency': int(count), 'p_value': float(p)}
+                    for i, (count, p) in enumerate(zip(counts, p_values))
+                ]
+            }
+        return report
+
+
+if __name__ == "__main__":
+    engine = MonteCarloEngine(n_histories=100000, seed=42)
+    start = time.time()
+    engine.simulate(600)
+    elapsed = time.time() - start
+    print(f"100,000 histories of 600 draws on {engine.n_workers} workers: {elapsed:.1f}s "
+          f"(~{elapsed * 10:.0f}s per million)")
@@ -0,0 +1,201 @@
+import numpy as np
+from draw_arrays import MAIN_NUMBERS
+
+# Slope (per draw) beyond which a feature counts as trending, per feature
+DEFAULT_TREND_THRESHOLDS = {
+    'sum': 1.0,
+    'even_count': 0.02,
+    'low_count': 0.02,
+    'spread': 0.5,
+    'powerball': 0.1,
+}
+
+DEFAULT_WINDOW_SIZES = (10, 30, 100)
+
+
+def draw_features(main, powerball):
+    """Per-draw feature values for one draw or an (N, 5) batch"""
+    main = np.atleast_2d(main)
+    return {
+        'sum': main.sum(axis=1),
+        'even_count': (main % 2 == 0).sum(axis=1),
+        'low_count': (main <= MAIN_NUMBERS // 2).sum(axis=1),
+        'spread': main.max(axis=1) - main.min(axis=1),
+        'powerball': np.atleast_1d(powerball),
+    }
+
+
+# The features draw_features produces, in its order
+FEATURES = tuple(draw_features(np.arange(1, 6), 1))
+
+
+def fit_from_sums(n, sx, sy, sxy, sxx, syy):
+    """Slope, intercept and R^2 of a least-squares line from its accumulators"""
+    if n < 2:
+        return {'n': int(n), 'slope': 0.0, 'intercept': float(sy / n) if n else 0.0, 'r_squared': 0.0}
+
+    sxx_c = n * sxx - sx * sx
+    syy_c = n * syy - sy * sy
+    sxy_c = n * sxy - sx * sy
+    slope = sxy_c / sxx_c if sxx_c else 0.0
+    intercept = (sy - slope * sx) / n
+    r_squared = (sxy_c * sxy_c) / (sxx_c * syy_c) if sxx_c and syy_c else 0.0
+    return {'n': int(n), 'slope': float(slope), 'intercept': float(intercept), 'r_squared': float(r_squared)}
+
+
+class RunningRegression:
+    """Least-squares accumulators with O(1) add and remove"""
+
+    def __init__(self):
+        self.n = 0
+        self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+
+    def add(self, x, y):
+        self.n += 1
+        self.sx += x
+        self.sy += y
+        self.sxy += x * y
+        self.sxx += x * x
+        self.syy += y * y
+
+    def remove(self, x, y):
+        self.n -= 1
+        self.sx -= x
+        self.sy -= y
+        self.sxy -= x * y
+        self.sxx -= x * x
+        self.syy -= y * y
+
+    def fit(self):
+        return fit_from_sums(self.n, self.sx, self.sy, self.sxy, self.sxx, self.syy)
+
+
+class FeatureTrends:
+    """Running trend lines for per-draw features.
+
+    Keeps full-history and fixed sliding-window accumulators that are
+    updated on every new draw, plus prefix sums of y, y^2 and x*y so the
+    fit for any [start, stop) window is O(1). x is the draw index.
+    """
+
+    def __init__(self, window_sizes=DEFAULT_WINDOW_SIZES, thresholds=None):
+        unknown = set(thresholds or {}) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"No trend feature named {', '.join(sorted(unknown))}; expected one of {FEATURES}")
+        self.window_sizes = tuple(window_sizes)
+        self.thresholds = dict(DEFAULT_TREND_THRESHOLDS, **(thresholds or {}))
+        self.features = list(self.thresholds)
+        self.n_draws = 0
+
+        # Per-feature values and prefix sums of (y, y^2, x*y), grown by doubling
+        self._values = {f: np.zeros(64, dtype=np.int64) for f in self.features}
+        self._prefix = {f: np.zeros((3, 65), dtype=np.int64) for f in self.features}
+        self.full = {f: RunningRegression() for f in self.features}
+        self.windows = {size: {f: RunningRegression() for f in self.features} for size in self.window_sizes}
+
+    @classmethod
+    def from_arrays(cls, arrays, window_sizes=DEFAULT_WINDOW_SIZES, thresholds=None):
+        """Build accumulators for a whole history at once"""
+        trends = cls(window_sizes, thresholds)
+        if len(arrays) == 0:
+            return trends
+
+        n_draws = len(arrays)
+        x = np.arange(n_draws, dtype=np.int64)
+        for feature, y in draw_features(arrays.main, arrays.powerball).items():
+            if feature not in trends.thresholds:
+                continue
+            y = y.astype(np.int64)
+            trends._values[feature] = y.copy()
+            trends._prefix[feature] = np.concatenate(
+                [np.zeros((3, 1), dtype=np.int64), np.cumsum([y, y * y, x * y], axis=1)], axis=1
+            )
+            full = trends.full[feature]
+            full.n, full.sx, full.sy = n_draws, float(x.sum()), float(y.sum())
+            full.sxy, full.sxx, full.syy = float((x * y).sum()), float((x * x).sum()), float((y * y).sum())
+
+            for size in trends.window_sizes:
+                start = max(0, n_draws - size)
+                window = trends.windows[size][feature]
+                for t in range(start, n_draws):
+                    window.add(t, y[t])
+
+        trends.n_draws = n_draws
+        return trends
+
+    def _ensure_capacity(self, feature, size):
+        values = self._values[feature]
+        if len(values) >= size:
+            return
+        capacity = max(64, 2 * len(values), size)
+        grown = np.zeros(capacity, dtype=np.int64)
+        grown[:len(values)] = values
+        self._values[feature] = grown
+        prefix = np.zeros((3, capacity + 1), dtype=np.int64)
+        prefix[:, :self._prefix[feature].shape[1]] = self._prefix[feature]
+        self._prefix[feature] = prefix
+
+    def append(self, main_numbers, powerball):
+        """Fold one new draw into every accumulator in O(1)"""
+        t = self.n_draws
+        for feature, value in draw_features(main_numbers, powerball).items():
+            if feature not in self.thresholds:
+                continue
+            y = int(value[0])
+            self._ensure_capacity(feature, t + 1)
+            self._values[feature][t] = y
+            prefix = self._prefix[feature]
+            prefix[:, t + 1] = prefix[:, t] + [y, y * y, t * y]
+            self.full[feature].add(t, y)
+
+            for size, windows in self.windows.items():
+                windows[feature].add(t, y)
+                if t - size >= 0:
+                    windows[feature].remove(t - size, int(self._values[feature][t - size]))
+        self.n_draws += 1
+
+    def window_fit(self, feature, start=0, stop=None):
+        """Trend line of one feature over draws [start, stop) in O(1)"""
+        stop = self.n_draws if stop is None else min(stop, self.n_draws)
+        start = max(0, start)
+        n = max(0, stop - start)
+        prefix = self._prefix[feature]
+        sy, syy, sxy = (prefix[:, stop] - prefix[:, start]).astype(np.float64)
+
+        # Sums of x and x^2 over consecutive integers have closed forms
+        sx = (start + stop - 1) * n / 2
+        sxx = ((stop - 1) * stop * (2 * stop - 1) - (start - 1) * start * (2 * start - 1)) / 6 if n else 0.0
+        fit = fit_from_sums(n, sx, sy, sxy, sxx, syy)
+        # Report the intercept at the window's first draw
+        fit['intercept'] = fit['intercept'] + fit['slope'] * start
+        return fit
+
+    def classify(self, feature, slope):
+        threshold = self.thresholds[feature]
+        if slope > threshold:
+            return "increasing"
+        elif slope < -threshold:
+            return "decreasing"
+        return "stable"
+
+    def report(self, start=0, stop=None):
+        """Fit and direction of every feature over a window of draws"""
+        report = {}
+        for feature in self.features:
+            fit = self.window_fit(feature, start, stop)
+            fit['direction'] = self.classify(feature, fit['slope']) if fit['n'] >= 2 else "insufficient_data"
+            fit['threshold'] = self.thresholds[feature]
+            report[feature] = fit
+        return report
+
+    def sliding_report(self):
+        """Fits of the fixed sliding windows kept up to date on every draw"""
+        report = {}
+        for size, windows in self.windows.items():
+            report[size] = {}
+            for feature, regression in windows.items():
+                fit = regression.fit()
+                fit['intercept'] = fit['intercept'] + fit['slope'] * (self.n_draws - fit['n'])
+                fit['direction'] = self.classify(feature, fit['slope']) if fit['n'] >= 2 else "insufficient_data"
+                report[size][feature] = fit
+        return report
@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+
+RESULT_TABLE = ".results-table"
+RESULT_ROWS = ".draw-item, .result-item, tr"
+
+# Chrome capability that exposes DevTools network events through driver.get_log('performance')
+PERFORMANCE_LOGGING = ('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+class PageReadiness:
+    """Condition-based waits for the Selenium collectors.
+
+    Instead of sleeping a fixed time after a page load or a scroll, wait
+    for what the scraper needs: the results table, more result rows, or
+    the network going quiet. Network activity comes from the DevTools
+    performance log when the session has PERFORMANCE_LOGGING enabled,
+    and from the page's resource timings otherwise.
+
+    Every wait is bounded (timeout for a page load, growth_timeout after
+    a scroll or click) and gives up early once the network has been idle
+    for quiet_period with nothing new on the page. Each wait is tallied
+    against the fixed sleep it replaces, so a collection run can report
+    the time saved.
+
+    Reading the performance log drains Chrome's buffer, so the poller is
+    the one place that reads it: it also tallies the requests, bytes and
+    blocked requests it sees since the last page load (see traffic()).
+    """
+
+    def __init__(self, timeout=10.0, growth_timeout=2.0, quiet_period=0.5, poll_interval=0.1,
+                 table_selector=RESULT_TABLE, row_selector=RESULT_ROWS):
+        self.timeout = timeout
+        self.growth_timeout = growth_timeout
+        self.quiet_period = quiet_period
+        self.poll_interval = poll_interval
+        self.table_selector = table_selector
+        self.row_selector = row_selector
+
+        self._lock = threading.Lock()
+        self._network = {}
+        self.reset()
+
+    def reset(self):
+        """Start a new collection run's tally"""
+        with self._lock:
+            self.waits = 0
+            self.waited = 0.0
+            self.replaced = 0.0
+
+    def _record(self, started, replaces):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.waits += 1
+            self.waited += elapsed
+            # None: the old code waited on a condition here too, so nothing was saved
+            self.replaced += elapsed if replaces is None else replaces
+
+    def row_count(self, driver):
+        from selenium.webdriver.common.by import By
+        return len(driver.find_elements(By.CSS_SELECTOR, self.row_selector))
+
+    def _network_state(self, driver, reset=False):
+        state = self._network.get(id(driver))
+        if state is None or reset:
+            use_log = state['use_log'] if state else True
+            state = {'inflight': set(), 'last_activity': time.monotonic(), 'resources': None, 'use_log': use_log,
+                     'requests': set(), 'bytes': 0, 'blocked': 0}
+            self._network[id(driver)] = state
+        return state
+
+    def _poll_network(self, driver, state):
+        now = time.monotonic()
+        if state['use_log']:
+            try:
+                entries = driver.get_log('performance')
+            except Exception:
+                state['use_log'] = False
+            else:
+                for entry in entries:
+                    message = json.loads(entry['message']).get('message', {})
+                    method = message.get('method')
+                    params = message.get('params', {})
+                    request_id = params.get('requestId')
+                    if method == 'Network.requestWillBeSent':
+                        state['inflight'].add(request_id)
+                        state['requests'].add(request_id)
+                    elif method == 'Network.loadingFinished':
+                        state['inflight'].discard(request_id)
+                        state['bytes'] += params.get('encodedDataLength', 0)
+                    elif method == 'Network.loadingFailed':
+                        state['inflight'].discard(request_id)
+                        state['blocked'] += 1 if params.get('blockedReason') else 0
+                    else:
+                        continue
+                    state['last_activity'] = now
+                return
+
+        # Without the DevTools log, newly completed resources stand in for traffic
+        resources = driver.execute_script("return performance.getEntriesByType('resource').length")
+        if resources != state['resources']:
+            state['resources'] = resources
+            state['last_activity'] = now
+
+    def network_idle(self, driver):
+        """No request in flight, and none started or finished for quiet_period"""
+        state = self._network_state(driver)
+        self._poll_network(driver, state)
+        return not state['inflight'] and time.monotonic() - state['last_activity'] >= self.quiet_period
+
+    def traffic(self, driver):
+        """Requests, bytes and blocked requests since the last wait_for_results.
+
+        Drains the performance log once more first, so events logged after
+        the last poll are counted too. Zeros without the DevTools log.
+        """
+        state = self._network_state(driver)
+        if state['use_log']:
+            self._poll_network(driver, state)
+        return {'bytes': state['bytes'], 'requests': len(state['requests']), 'blocked': state['blocked']}
+
+    def wait_for_results(self, driver, replaces=None):
+        """After driver.get: wait for the results table, or for a loaded page
+        whose network has gone quiet. Returns the number of result rows."""
+        from selenium.webdriver.common.by import By
+        started = time.monotonic()
+        self._network_state(driver, reset=True)
+        deadline = started + self.timeout
+
+        while True:
+            rows = self.row_count(driver)
+            if driver.execute_script("return document.readyState") == "complete":
+                if driver.find_elements(By.CSS_SELECTOR, self.table_selector) or self.network_idle(driver):
+                    break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+        self._record(started, replaces)
+        return rows
+
+    def wait_for_more_rows(self, driver, previous_rows, replaces=None):
+        """After a scroll or click: wait until there are more than previous_rows
+        result rows. Returns the new count, or previous_rows if nothing more
+        loaded before growth_timeout or the network went quiet."""
+        started = time.monotonic()
+        self._network_state(driver)['last_activity'] = started
+        deadline = started + self.growth_timeout
+
+        while True:
+            rows = self.row_count(driver)
+            if rows > previous_rows or time.monotonic() >= deadline or self.network_idle(driver):
+                break
+            time.sleep(self.poll_interval)
+
+        self._record(started, replaces)
+        return rows
+
+    def report(self):
+        """Time spent waiting this run, against the fixed sleeps it replaced"""
+        with self._lock:
+            return {
+                'waits': self.waits,
+                'waited_seconds': round(self.waited, 2),
+                'fixed_sleep_seconds': round(self.replaced, 2),
+                'saved_seconds': round(self.replaced - self.waited, 2)
+            }
+
+    def summary(self):
+        report = self.report()
+        return (f"⏱️  {report['waits']} page waits took {report['waited_seconds']:.1f}s; "
+                f"fixed sleeps would have taken {report['fixed_sleep_seconds']:.1f}s "
+                f"(saved {report['saved_seconds']:.1f}s)")
@@ -8,12 +8,35 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import warnings
 import os
+import copy
+import hashlib
+from draw_arrays import DrawArrays, unseen_draws, MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+from decay_scores import DecayedFrequencyScores, DEFAULT_HALF_LIVES
+from bayesian_model import DirichletNumberModel
+from result_cache import cached_result
+from markov_model import TransitionModel
+from incremental_ml import IncrementalNumberModel
+from ml_features import arrays_feature_matrix
+from model_tuning import load_model_config, tuned_params
 warnings.filterwarnings('ignore')
 
 class PowerBallPredictor:
-    def __init__(self, data_file="data/all_powerball_data.csv"):
+    def __init__(self, data_file="data/all_powerball_data.csv", model_config_file=None, result_cache=None):
         self.data_file = data_file
+        self.result_cache = result_cache
+        self.model_config_file = model_config_file or os.path.join(os.path.dirname(data_file), "model_config.json")
         self.data = None
+        self._dataset_version = None
+        self._model_config = None
+        self._features = {}
+        self._draw_arrays = {}
+        self._decay_scores = {}
+        self._bayesian_models = {}
+        self._transition_models = {}
+        self._incremental_models = {}
+        # Every strategy draws from these, so a seed can make a call reproducible
+        self.random = random.Random()
+        self.rng = np.random.default_rng()
         self.load_data()
         
     def load_data(self):
@@ -22,23 +45,126 @@ class PowerBallPredictor:
             if os.path.exists(self.data_file):
                 df = pd.read_csv(self.data_file)
                 df['draw_date'] = pd.to_datetime(df['draw_date'])
-                self.data = df
+                # Newest first; the store appends new draws at the end of the file
+                self.data = df.sort_values('draw_date', ascending=False, kind='stable').reset_index(drop=True)
             else:
                 print(f"Data file {self.data_file} not found. Please run data collection first.")
                 self.data = pd.DataFrame()
         except Exception as e:
             print(f"Error loading data: {e}")
             self.data = pd.DataFrame()
+        self._dataset_version = None
+        self._draw_arrays = {}
+        self._decay_scores = {}
+        self._bayesian_models = {}
+        self._transition_models = {}
+        self._incremental_models = {}
+        self._model_config = None
+        self._features = {}
     
-    def get_frequency_predictions(self, game_type="PowerBall", top_n=10):
+    def get_dataset_version(self):
+        """Short hash of the loaded draws, used to key cached results"""
+        if self._dataset_version is None:
+            hashed = pd.util.hash_pandas_object(self.data, index=False).to_numpy() if not self.data.empty else np.empty(0)
+            self._dataset_version = hashlib.sha1(hashed.tobytes()).hexdigest()[:12]
+        return self._dataset_version
+    
+    def apply_new_draws(self, new_draws):
+        """Append newly collected draws and update the running models in place.
+        
+        Decay scores, posteriors, transition counts and the incremental
+        classifiers learn from draws later than everything already loaded.
+        A backfilled older draw drops that game's models instead, so they are
+        rebuilt on next use.
+        """
+        new_draws = unseen_draws(self.data, new_draws)
+        if new_draws.empty:
+            return 0
+        
+        previous = {game_type: self.get_draw_arrays(game_type) for game_type in new_draws['game_type'].dropna().unique()}
+        self.data = pd.concat([new_draws, self.data], ignore_index=True)
+        self.data = self.data.sort_values('draw_date', ascending=False, kind='stable').reset_index(drop=True)
+        self._dataset_version = None
+        self._draw_arrays = {}
+        
+        for game_type, old_arrays in previous.items():
+            arrays = DrawArrays.from_frame(new_draws, game_type)
+            self._features.pop(game_type, None)
+            # Models that also track the draw date get it passed along
+            dated = [self._decay_scores.get(game_type), self._incremental_models.get(game_type)]
+            dated = [model for model in dated if model is not None]
+            undated = [model for key, model in self._bayesian_models.items() if key[0] == game_type]
+            if game_type in self._transition_models:
+                undated.append(self._transition_models[game_type])
+            
+            if len(old_arrays) and len(arrays) and arrays.draw_dates[0] <= old_arrays.draw_dates[-1]:
+                self._decay_scores.pop(game_type, None)
+                self._transition_models.pop(game_type, None)
+                self._incremental_models.pop(game_type, None)
+                self._bayesian_models = {key: model for key, model in self._bayesian_models.items() if key[0] != game_type}
+                continue
+            
+            for main, powerball, draw_date in zip(arrays.main, arrays.powerball, arrays.draw_dates):
+                for model in dated:
+                    model.update(main, powerball, draw_date)
+                for model in undated:
+                    model.update(main, powerball)
+        
+        return len(new_draws)
+    
+    def get_draw_arrays(self, game_type="PowerBall"):
+        """Get the parsed, chronologically ordered draw arrays for a game"""
+        if game_type not in self._draw_arrays:
+            self._draw_arrays[game_type] = DrawArrays.from_frame(self.data, game_type)
+        return self._draw_arrays[game_type]
+    
+    def get_decay_scores(self, game_type="PowerBall"):
+        """Get the running time-decayed frequency scores for a game"""
+        if game_type not in self._decay_scores:
+            self._decay_scores[game_type] = DecayedFrequencyScores.from_arrays(self.get_draw_arrays(game_type))
+        return self._decay_scores[game_type]
+    
+    def get_bayesian_model(self, game_type="PowerBall", decay=1.0):
+        """Get the Dirichlet posterior number model for a game"""
+        key = (game_type, decay)
+        if key not in self._bayesian_models:
+            self._bayesian_models[key] = DirichletNumberModel.from_arrays(self.get_draw_arrays(game_type), decay=decay)
+        return self._bayesian_models[key]
+    
+    def get_transition_model(self, game_type="PowerBall"):
+        """Get the draw-to-draw Markov transition model for a game"""
+        if game_type not in self._transition_models:
+            self._transition_models[game_type] = TransitionModel.from_arrays(self.get_draw_arrays(game_type))
+        return self._transition_models[game_type]
+    
+    def get_feature_matrix(self, game_type="PowerBall"):
+        """Get the ML feature matrix for a game, one row per draw"""
+        if game_type not in self._features:
+            self._features[game_type] = arrays_feature_matrix(self.get_draw_arrays(game_type))
+        return self._features[game_type]
+    
+    def get_model_params(self, game_type="PowerBall", strategy="machine_learning"):
+        """Hyperparameters for an ML strategy, as chosen by model_tuning.py for the current draws"""
+        if self._model_config is None:
+            self._model_config = load_model_config(self.model_config_file)
+        return tuned_params(self._model_config, game_type, strategy, self.get_draw_arrays(game_type).version())
+    
+    def get_incremental_model(self, game_type="PowerBall"):
+        """Get the incrementally trained per-number classifiers for a game"""
+        if game_type not in self._incremental_models:
+            params = self.get_model_params(game_type, 'incremental_ml')
+            self._incremental_models[game_type] = IncrementalNumberModel.from_arrays(self.get_draw_arrays(game_type), **params)
+        return self._incremental_models[game_type]
+    
+    def get_frequency_predictions(self, game_type="PowerBall", top_n=10, count=5):
         """Predict based on most frequently drawn numbers"""
         if self.data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         # Filter by game type
         game_data = self.data[self.data['game_type'] == game_type].copy()
         if game_data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         # Count frequency of main numbers
         all_main_numbers = []
@@ -63,25 +189,25 @@ class PowerBallPredictor:
         powerball_counter = Counter(all_powerballs)
         
         # Get top numbers for main numbers (1-50)
-        top_main = [num for num, count in main_counter.most_common() if 1 <= num <= 50][:top_n]
+        top_main = [num for num, freq in main_counter.most_common() if 1 <= num <= 50][:top_n]
         
         # Get top numbers for powerball (1-20)
-        top_powerball = [num for num, count in powerball_counter.most_common() if 1 <= num <= 20][:top_n]
+        top_powerball = [num for num, freq in powerball_counter.most_common() if 1 <= num <= 20][:top_n]
         
         # Generate predictions
         predictions = []
-        for i in range(5):  # Generate 5 different combinations
+        for i in range(count):  # Generate different combinations
             # Select 5 unique main numbers from top frequent
-            main_nums = random.sample(top_main, min(5, len(top_main)))
+            main_nums = self.random.sample(top_main, min(5, len(top_main)))
             if len(main_nums) < 5:
                 # Fill with random numbers if not enough frequent numbers
                 remaining = [n for n in range(1, 51) if n not in main_nums]
-                main_nums.extend(random.sample(remaining, 5 - len(main_nums)))
+                main_nums.extend(self.random.sample(remaining, 5 - len(main_nums)))
             
             main_nums = sorted(main_nums[:5])
             
             # Select powerball from top frequent
-            powerball = random.choice(top_powerball) if top_powerball else random.randint(1, 20)
+            powerball = self.random.choice(top_powerball) if top_powerball else self.random.randint(1, 20)
             
             predictions.append({
                 'main_numbers': main_nums,
@@ -92,14 +218,14 @@ class PowerBallPredictor:
         
         return predictions
     
-    def get_cold_numbers_predictions(self, game_type="PowerBall", top_n=10):
+    def get_cold_numbers_predictions(self, game_type="PowerBall", top_n=10, count=5):
         """Predict based on least frequently drawn numbers (cold numbers)"""
         if self.data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         game_data = self.data[self.data['game_type'] == game_type].copy()
         if game_data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         # Count frequency of all numbers
         all_main_numbers = []
@@ -124,22 +250,22 @@ class PowerBallPredictor:
         # Get cold numbers (least frequent)
         all_main_nums = list(range(1, 51))
         cold_main = [num for num in all_main_nums if num not in main_counter or main_counter[num] == 0]
-        cold_main.extend([num for num, count in main_counter.most_common()[-top_n:] if num not in cold_main])
+        cold_main.extend([num for num, freq in main_counter.most_common()[-top_n:] if num not in cold_main])
         
         all_powerball_nums = list(range(1, 21))
         cold_powerball = [num for num in all_powerball_nums if num not in powerball_counter or powerball_counter[num] == 0]
-        cold_powerball.extend([num for num, count in powerball_counter.most_common()[-top_n:] if num not in cold_powerball])
+        cold_powerball.extend([num for num, freq in powerball_counter.most_common()[-top_n:] if num not in cold_powerball])
         
         # Generate predictions
         predictions = []
-        for i in range(5):
-            main_nums = random.sample(cold_main, min(5, len(cold_main)))
+        for i in range(count):
+            main_nums = self.random.sample(cold_main, min(5, len(cold_main)))
             if len(main_nums) < 5:
                 remaining = [n for n in range(1, 51) if n not in main_nums]
-                main_nums.extend(random.sample(remaining, 5 - len(main_nums)))
+                main_nums.extend(self.random.sample(remaining, 5 - len(main_nums)))
             
             main_nums = sorted(main_nums[:5])
-            powerball = random.choice(cold_powerball) if cold_powerball else random.randint(1, 20)
+            powerball = self.random.choice(cold_powerball) if cold_powerball else self.random.randint(1, 20)
             
             predictions.append({
                 'main_numbers': main_nums,
@@ -150,23 +276,23 @@ class PowerBallPredictor:
         
         return predictions
     
-    def get_pattern_predictions(self, game_type="PowerBall"):
+    def get_pattern_predictions(self, game_type="PowerBall", count=5):
         """Predict based on number patterns and sequences"""
         if self.data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         game_data = self.data[self.data['game_type'] == game_type].copy()
         if game_data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         # Analyze patterns
         patterns = self._analyze_patterns(game_data)
         
         predictions = []
-        for i in range(5):
+        for i in range(count):
             # Generate based on patterns
             main_nums = self._generate_pattern_based_numbers(patterns)
-            powerball = random.randint(1, 20)  # Powerball is less predictable
+            powerball = self.random.randint(1, 20)  # Powerball is less predictable
             
             predictions.append({
                 'main_numbers': main_nums,
@@ -177,47 +303,31 @@ class PowerBallPredictor:
         
         return predictions
     
-    def get_ml_predictions(self, game_type="PowerBall"):
+    def get_ml_predictions(self, game_type="PowerBall", count=5):
         """Predict using machine learning approach"""
         if self.data.empty or len(self.data) < 100:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         try:
-            game_data = self.data[self.data['game_type'] == game_type].copy()
-            if game_data.empty:
-                return self._get_random_predictions()
+            arrays = self.get_draw_arrays(game_type)
+            if len(arrays) < 51:
+                return self._get_random_predictions(count)
             
-            # Prepare features
-            features = self._prepare_ml_features(game_data)
-            if features is None or len(features) < 50:
-                return self._get_random_predictions()
+            # Row t of the feature matrix predicts draw t + 1
+            features = self.get_feature_matrix(game_type)
+            X = features[:-1]
+            next_features = features[-1].reshape(1, -1)
+            params = self.get_model_params(game_type, 'machine_learning')
             
             # Train models for each number position
             predictions = []
             
             for i in range(5):  # 5 main numbers
-                model = RandomForestClassifier(n_estimators=100, random_state=42)
-                
-                # Prepare target (next number in position i)
-                X = features[:-1]  # All but last
-                y = []
-                
-                for j in range(len(game_data) - 1):
-                    try:
-                        numbers = eval(game_data.iloc[j+1]['main_numbers']) if isinstance(game_data.iloc[j+1]['main_numbers'], str) else game_data.iloc[j+1]['main_numbers']
-                        y.append(numbers[i] if i < len(numbers) else random.randint(1, 50))
-                    except:
-                        y.append(random.randint(1, 50))
-                
-                if len(X) != len(y):
-                    continue
-                
-                # Train model
-                model.fit(X, y)
+                model = RandomForestClassifier(random_state=42, **params)
+                model.fit(X, arrays.main[1:, i])
                 
                 # Predict next number
-                next_features = features[-1].reshape(1, -1)
-                predicted_number = model.predict(next_features)[0]
+                predicted_number = int(model.predict(next_features)[0])
                 
                 # Ensure number is in valid range
                 predicted_number = max(1, min(50, predicted_number))
@@ -226,14 +336,14 @@ class PowerBallPredictor:
             
             # Generate 5 different combinations
             final_predictions = []
-            for i in range(5):
-                main_nums = sorted(random.sample(predictions, min(5, len(predictions))))
+            for i in range(count):
+                main_nums = sorted(self.random.sample(predictions, min(5, len(predictions))))
                 if len(main_nums) < 5:
                     remaining = [n for n in range(1, 51) if n not in main_nums]
-                    main_nums.extend(random.sample(remaining, 5 - len(main_nums)))
+                    main_nums.extend(self.random.sample(remaining, 5 - len(main_nums)))
                 
                 main_nums = sorted(main_nums[:5])
-                powerball = random.randint(1, 20)
+                powerball = self.random.randint(1, 20)
                 
                 final_predictions.append({
                     'main_numbers': main_nums,
@@ -246,17 +356,54 @@ class PowerBallPredictor:
             
         except Exception as e:
             print(f"ML prediction error: {e}")
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
+    
+    def get_decayed_frequency_predictions(self, game_type="PowerBall", half_life=DEFAULT_HALF_LIVES[1], count=5):
+        """Predict by sampling numbers weighted by time-decayed frequency"""
+        scores = self.get_decay_scores(game_type)
+        if scores.n_draws == 0 or half_life not in scores.half_lives:
+            return self._get_random_predictions(count)
+        
+        main_weights, powerball_weights = scores.weights(half_life)
+        return self._sample_tickets(main_weights, powerball_weights, 'decayed_frequency', count)
     
-    def get_balanced_predictions(self, game_type="PowerBall"):
+    def get_bayesian_predictions(self, game_type="PowerBall", decay=1.0, count=5):
+        """Predict by sampling whole tickets from the posterior predictive"""
+        model = self.get_bayesian_model(game_type, decay)
+        if model.n_draws == 0:
+            return self._get_random_predictions(count)
+        
+        main, powerballs = model.sample_tickets(count, rng=self.rng)
+        main_weights, powerball_weights = model.posterior_means()
+        return self._format_tickets(main, powerballs, main_weights, powerball_weights, 'bayesian')
+    
+    def get_markov_predictions(self, game_type="PowerBall", count=5):
+        """Predict from transition probabilities given the last draws"""
+        model = self.get_transition_model(game_type)
+        if model.n_draws < 2:
+            return self._get_random_predictions(count)
+        
+        main_weights, powerball_weights = model.next_draw_scores()
+        return self._sample_tickets(main_weights, powerball_weights, 'markov', count)
+    
+    def get_incremental_ml_predictions(self, game_type="PowerBall", count=5):
+        """Predict from per-number classifiers updated with every new draw"""
+        model = self.get_incremental_model(game_type)
+        if model.n_draws < 50:
+            return self._get_random_predictions(count)
+        
+        main_weights, powerball_weights = model.predict_proba()
+        return self._sample_tickets(main_weights, powerball_weights, 'incremental_ml', count)
+    
+    def get_balanced_predictions(self, game_type="PowerBall", count=5):
         """Combine multiple strategies for balanced predictions"""
         if self.data.empty:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
         
         # Get predictions from different strategies
-        freq_preds = self.get_frequency_predictions(game_type, top_n=15)
-        cold_preds = self.get_cold_numbers_predictions(game_type, top_n=15)
-        pattern_preds = self.get_pattern_predictions(game_type)
+        freq_preds = self.get_frequency_predictions(game_type, top_n=15, count=count)
+        cold_preds = self.get_cold_numbers_predictions(game_type, top_n=15, count=count)
+        pattern_preds = self.get_pattern_predictions(game_type, count=count)
         
         # Combine and balance
         all_predictions = freq_preds + cold_preds + pattern_preds
@@ -270,32 +417,57 @@ class PowerBallPredictor:
             if combo not in used_combinations:
                 selected.append(pred)
                 used_combinations.add(combo)
-                if len(selected) >= 5:
+                if len(selected) >= count:
                     break
         
-        return selected[:5]
+        return selected[:count]
+    
+    def _seeded(self, seed):
+        """A shallow copy drawing from generators seeded with seed; it shares
+        the data and fitted models, so nothing is rebuilt"""
+        seeded = copy.copy(self)
+        seeded.random, seeded.rng = random.Random(seed), np.random.default_rng(seed)
+        return seeded
+    
+    @cached_result(seeded_only=True)
+    def get_predictions(self, strategy="frequency", game_type="PowerBall", count=5, seed=None):
+        """Get predictions based on specified strategy.
+        
+        Tickets are random: without a seed every call draws new ones (serve
+        those from PredictionPool); with a seed they are reproducible, and
+        cached until the data changes.
+        """
+        predictor = self if seed is None else self._seeded(seed)
+        return predictor._predict(strategy, game_type, count)
     
-    def get_predictions(self, strategy="frequency", game_type="PowerBall"):
-        """Get predictions based on specified strategy"""
+    def _predict(self, strategy, game_type, count):
         if strategy == "frequency":
-            return self.get_frequency_predictions(game_type)
+            return self.get_frequency_predictions(game_type, count=count)
         elif strategy == "cold_numbers":
-            return self.get_cold_numbers_predictions(game_type)
+            return self.get_cold_numbers_predictions(game_type, count=count)
         elif strategy == "pattern":
-            return self.get_pattern_predictions(game_type)
+            return self.get_pattern_predictions(game_type, count=count)
         elif strategy == "machine_learning":
-            return self.get_ml_predictions(game_type)
+            return self.get_ml_predictions(game_type, count=count)
         elif strategy == "balanced":
-            return self.get_balanced_predictions(game_type)
+            return self.get_balanced_predictions(game_type, count=count)
+        elif strategy == "decayed_frequency":
+            return self.get_decayed_frequency_predictions(game_type, count=count)
+        elif strategy == "bayesian":
+            return self.get_bayesian_predictions(game_type, count=count)
+        elif strategy == "markov":
+            return self.get_markov_predictions(game_type, count=count)
+        elif strategy == "incremental_ml":
+            return self.get_incremental_ml_predictions(game_type, count=count)
         else:
-            return self._get_random_predictions()
+            return self._get_random_predictions(count)
     
-    def _get_random_predictions(self):
+    def _get_random_predictions(self, count=5):
         """Generate random predictions as fallback"""
         predictions = []
-        for i in range(5):
-            main_nums = sorted(random.sample(range(1, 51), 5))
-            powerball = random.randint(1, 20)
+        for i in range(count):
+            main_nums = sorted(self.random.sample(range(1, 51), 5))
+            powerball = self.random.randint(1, 20)
             predictions.append({
                 'main_numbers': main_nums,
                 'powerball': powerball,
@@ -304,6 +476,37 @@ class PowerBallPredictor:
             })
         return predictions
     
+    def _sample_tickets(self, main_weights, powerball_weights, strategy, count=5, rng=None):
+        """Sample a batch of tickets from per-number weights.
+        
+        Main numbers are drawn without replacement proportionally to their
+        weights via the Gumbel top-k trick, so the whole batch is one array
+        operation.
+        """
+        rng = rng or self.rng
+        gumbel = rng.gumbel(size=(count, MAIN_NUMBERS))
+        keys = np.log(np.maximum(main_weights, 1e-12)) + gumbel
+        main = np.sort(np.argpartition(-keys, NUMBERS_PER_DRAW, axis=1)[:, :NUMBERS_PER_DRAW], axis=1) + 1
+        powerballs = rng.choice(POWERBALL_NUMBERS, size=count, p=powerball_weights / powerball_weights.sum()) + 1
+        return self._format_tickets(main, powerballs, main_weights, powerball_weights, strategy)
+    
+    def _format_tickets(self, main, powerballs, main_weights, powerball_weights, strategy):
+        """Turn (count, 5) main and (count,) powerball arrays into prediction dicts"""
+        # Confidence: average weight of the picks relative to the heaviest number
+        main_conf = main_weights[main - 1].mean(axis=1) / main_weights.max()
+        powerball_conf = powerball_weights[powerballs - 1] / powerball_weights.max()
+        confidence = np.clip((main_conf + powerball_conf) / 2, 0.1, 1.0)
+        
+        return [
+            {
+                'main_numbers': main[i].tolist(),
+                'powerball': int(powerballs[i]),
+                'strategy': strategy,
+                'confidence': float(confidence[i])
+            }
+            for i in range(len(main))
+        ]
+    
     def _calculate_confidence(self, main_nums, powerball, main_counter, powerball_counter):
         """Calculate confidence score for predictions"""
         try:
@@ -367,74 +570,21 @@ class PowerBallPredictor:
         
         # Even numbers
         even_nums = [n for n in range(2, 51, 2)]
-        numbers.extend(random.sample(even_nums, min(even_needed, len(even_nums))))
+        numbers.extend(self.random.sample(even_nums, min(even_needed, len(even_nums))))
         
         # Odd numbers
         odd_nums = [n for n in range(1, 51, 2)]
-        numbers.extend(random.sample(odd_nums, min(odd_needed, len(odd_nums))))
+        numbers.extend(self.random.sample(odd_nums, min(odd_needed, len(odd_nums))))
         
         # Fill remaining slots
         while len(numbers) < 5:
             remaining = [n for n in range(1, 51) if n not in numbers]
             if remaining:
-                numbers.append(random.choice(remaining))
+                numbers.append(self.random.choice(remaining))
             else:
                 break
         
         return sorted(numbers[:5])
-    
-    def _prepare_ml_features(self, data):
-        """Prepare features for machine learning"""
-        try:
-            features = []
-            
-            for i in range(len(data) - 1):
-                feature_row = []
-                
-                # Previous draw numbers
-                try:
-                    prev_numbers = eval(data.iloc[i]['main_numbers']) if isinstance(data.iloc[i]['main_numbers'], str) else data.iloc[i]['main_numbers']
-                    feature_row.extend(prev_numbers)
-                except:
-                    feature_row.extend([0] * 5)
-                
-                # Draw day of week (encoded)
-                draw_date = pd.to_datetime(data.iloc[i]['draw_date'])
-                feature_row.append(draw_date.weekday())
-                
-                # Time since last draw
-                if i > 0:
-                    prev_date = pd.to_datetime(data.iloc[i-1]['draw_date'])
-                    days_diff = (draw_date - prev_date).days
-                    feature_row.append(days_diff)
-                else:
-                    feature_row.append(7)  # Default weekly
-                
-                # Rolling averages
-                if i >= 5:
-                    recent_numbers = []
-                    for j in range(i-5, i):
-                        try:
-                            nums = eval(data.iloc[j]['main_numbers']) if isinstance(data.iloc[j]['main_numbers'], str) else data.iloc[j]['main_numbers']
-                            recent_numbers.extend(nums)
-                        except:
-                            continue
-                    
-                    if recent_numbers:
-                        feature_row.append(np.mean(recent_numbers))
-                        feature_row.append(np.std(recent_numbers))
-                    else:
-                        feature_row.extend([25, 15])  # Defaults
-                else:
-                    feature_row.extend([25, 15])  # Defaults
-                
-                features.append(feature_row)
-            
-            return np.array(features)
-            
-        except Exception as e:
-            print(f"Feature preparation error: {e}")
-            return None
 
 if __name__ == "__main__":
     predictor = PowerBallPredictor()
@@ -0,0 +1,155 @@
+import os
+import time
+import numpy as np
+from draw_arrays import NUMBERS_PER_DRAW
+
+DEFAULT_POOL_FILE = "data/prediction_pools.npz"
+DEFAULT_POOL_SIZE = 1000
+
+STRATEGIES = (
+    "frequency", "cold_numbers", "pattern", "machine_learning", "balanced",
+    "decayed_frequency", "bayesian", "markov", "incremental_ml",
+)
+GAME_TYPES = ("PowerBall", "PowerBall Plus")
+
+
+class PredictionPool:
+    """Pre-generated tickets for every (strategy, game_type), served in O(k).
+
+    Each pool is a set of compact arrays (main numbers, powerball,
+    confidence, strategy label). Pools are rebuilt off the request path
+    whenever the data changes and written atomically, and the in-memory
+    dict is swapped in one assignment so readers never see a half-built
+    pool.
+    """
+
+    def __init__(self, pool_file=DEFAULT_POOL_FILE):
+        self.pool_file = pool_file
+        self.pools = {}
+        self.dataset_version = None
+        self.generated_at = None
+        self._cursors = {}
+
+    @staticmethod
+    def _to_arrays(predictions):
+        return {
+            'main': np.array([p['main_numbers'] for p in predictions], dtype=np.uint8).reshape(-1, NUMBERS_PER_DRAW),
+            'powerball': np.array([p['powerball'] for p in predictions], dtype=np.uint8),
+            'confidence': np.array([p['confidence'] for p in predictions], dtype=np.float32),
+            'strategy': np.array([p['strategy'] for p in predictions], dtype=str)
+        }
+
+    def generate(self, predictor, strategies=STRATEGIES, game_types=GAME_TYPES, pool_size=DEFAULT_POOL_SIZE):
+        """Build fresh pools from a predictor and swap them in"""
+        pools = {}
+        for game_type in game_types:
+            for strategy in strategies:
+                start = time.time()
+                predictions = predictor.get_predictions(strategy, game_type, count=pool_size)
+                if predictions:
+                    pools[(strategy, game_type)] = self._to_arrays(predictions)
+                print(f"Pooled {len(predictions)} {strategy} tickets for {game_type} in {time.time() - start:.2f}s")
+
+        self.pools = pools
+        self.dataset_version = predictor.get_dataset_version()
+        self.generated_at = time.time()
+        self._cursors = {}
+        return self
+
+    def is_current(self, predictor):
+        return bool(self.pools) and self.dataset_version == predictor.get_dataset_version()
+
+    def refresh(self, predictor, strategies=STRATEGIES, game_types=GAME_TYPES, pool_size=DEFAULT_POOL_SIZE):
+        """Regenerate and save the pools if the predictor's data has changed"""
+        if self.is_current(predictor):
+            return False
+        self.generate(predictor, strategies, game_types, pool_size)
+        self.save()
+        return True
+
+    def save(self):
+        """Write all pools to one npz file atomically"""
+        arrays = {
+            'dataset_version': np.array(self.dataset_version or ''),
+            'generated_at': np.array(self.generated_at or 0.0)
+        }
+        for (strategy, game_type), pool in self.pools.items():
+            arrays.update({f"{name}|{strategy}|{game_type}": values for name, values in pool.items()})
+
+        directory = os.path.dirname(self.pool_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.pool_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, self.pool_file)
+
+    def load(self):
+        """Load pools from disk; returns False if there are none"""
+        if not os.path.exists(self.pool_file):
+            return False
+        try:
+            with np.load(self.pool_file) as data:
+                pools = {}
+                for key in data.files:
+                    if '|' not in key:
+                        continue
+                    name, strategy, game_type = key.split('|')
+                    pools.setdefault((strategy, game_type), {})[name] = data[key]
+                self.dataset_version = str(data['dataset_version'])
+                self.generated_at = float(data['generated_at'])
+        except Exception as e:
+            print(f"Error loading prediction pools: {e}")
+            return False
+
+        self.pools = pools
+        self._cursors = {}
+        return True
+
+    def take(self, strategy, game_type="PowerBall", count=5, rng=None, sequential=False):
+        """Hand out count tickets from a pool as prediction dicts.
+
+        By default the tickets are a random subset of the pool; with
+        sequential=True successive calls walk through the pool in slices.
+        Returns None when there is no pool for the pair.
+        """
+        pool = self.pools.get((strategy, game_type))
+        if pool is None or len(pool['main']) == 0:
+            return None
+
+        size = len(pool['main'])
+        count = min(count, size)
+        if sequential:
+            cursor = self._cursors.get((strategy, game_type), 0)
+            rows = (cursor + np.arange(count)) % size
+            self._cursors[(strategy, game_type)] = (cursor + count) % size
+        else:
+            rng = rng or np.random.default_rng()
+            rows = rng.choice(size, size=count, replace=False)
+
+        return [
+            {
+                'main_numbers': pool['main'][i].tolist(),
+                'powerball': int(pool['powerball'][i]),
+                'strategy': str(pool['strategy'][i]),
+                'confidence': float(pool['confidence'][i])
+            }
+            for i in rows
+        ]
+
+
+def regenerate_pools(data_file="data/all_powerball_data.csv", pool_file=DEFAULT_POOL_FILE, pool_size=DEFAULT_POOL_SIZE):
+    """Background job: rebuild the pools after a data update"""
+    from prediction_engine import PowerBallPredictor
+
+    pool = PredictionPool(pool_file)
+    pool.load()
+    if pool.refresh(PowerBallPredictor(data_file), pool_size=pool_size):
+        print(f"Prediction pools regenerated for data version {pool.dataset_version}")
+    else:
+        print(f"Prediction pools already current ({pool.dataset_version})")
+    return pool
+
+
+if __name__ == "__main__":
+    regenerate_pools()
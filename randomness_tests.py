@@ -0,0 +1,172 @@
+import os
+import numpy as np
+from scipy import stats
+from draw_arrays import MAIN_NUMBERS, POWERBALL_NUMBERS, NUMBERS_PER_DRAW
+from monte_carlo_engine import chunk_sizes, run_chunks, empirical_p_value
+
+# Expected shared main numbers between two independent 5-of-50 draws, and the
+# hypergeometric variance of that count
+EXPECTED_MAIN_REPEATS = NUMBERS_PER_DRAW * NUMBERS_PER_DRAW / MAIN_NUMBERS
+MAIN_REPEAT_VARIANCE = (
+    NUMBERS_PER_DRAW * (NUMBERS_PER_DRAW / MAIN_NUMBERS)
+    * (1 - NUMBERS_PER_DRAW / MAIN_NUMBERS)
+    * (MAIN_NUMBERS - NUMBERS_PER_DRAW) / (MAIN_NUMBERS - 1)
+)
+EXPECTED_POWERBALL_REPEATS = 1 / POWERBALL_NUMBERS
+
+
+def draw_sequences(arrays):
+    """Derive every per-draw series the tests need in one vectorized pass"""
+    main = arrays.main
+    return {
+        'main': main,
+        'powerball': arrays.powerball,
+        # A draw is "even" / "low" when at least 3 of its 5 numbers are
+        'parity': (main % 2 == 0).sum(axis=1) > NUMBERS_PER_DRAW // 2,
+        'low_high': (main <= MAIN_NUMBERS // 2).sum(axis=1) > NUMBERS_PER_DRAW // 2,
+        'sums': main.sum(axis=1).astype(np.float64),
+    }
+
+
+def count_runs(binary):
+    """Number of runs in each row of a (P, N) boolean array"""
+    binary = np.atleast_2d(binary)
+    return 1 + (binary[:, 1:] != binary[:, :-1]).sum(axis=1)
+
+
+def serial_correlation(values):
+    """Lag-1 autocorrelation of each row of a (P, N) array"""
+    values = np.atleast_2d(values)
+    centered = values - values.mean(axis=1, keepdims=True)
+    denominator = (centered ** 2).sum(axis=1)
+    numerator = (centered[:, 1:] * centered[:, :-1]).sum(axis=1)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def repeat_counts(main, powerball):
+    """Main numbers and powerballs repeated from the previous draw, per draw.
+
+    main is (..., N, 5) and powerball (..., N); leading axes are kept so
+    a whole batch of permuted histories is handled at once.
+    """
+    shared = (main[..., 1:, :, None] == main[..., :-1, None, :]).sum(axis=(-2, -1))
+    return shared, powerball[..., 1:] == powerball[..., :-1]
+
+
+def order_statistics(sequences):
+    """The order-dependent statistics that get permutation p-values"""
+    main_repeats, powerball_repeats = repeat_counts(sequences['main'], sequences['powerball'])
+    return {
+        'parity_runs': count_runs(sequences['parity']),
+        'low_high_runs': count_runs(sequences['low_high']),
+        'sums_serial_correlation': serial_correlation(sequences['sums']),
+        'main_repeat_rate': np.atleast_1d(main_repeats.mean(axis=-1)),
+        'powerball_repeat_rate': np.atleast_1d(powerball_repeats.mean(axis=-1)),
+    }
+
+
+def _permutation_chunk(sequences, n_permutations, seed_sequence):
+    """Shuffle the draw order n_permutations times (runs inside a pool worker)"""
+    rng = np.random.default_rng(seed_sequence)
+    n_draws = len(sequences['sums'])
+    order = rng.random((n_permutations, n_draws)).argsort(axis=1)
+    permuted = {name: values[order] for name, values in sequences.items()}
+    return order_statistics(permuted)
+
+
+def chi_square_uniformity(counts, expected):
+    statistic = float(((counts - expected) ** 2 / expected).sum())
+    df = len(counts) - 1
+    return {
+        'statistic': statistic,
+        'df': df,
+        'p_value': float(stats.chi2.sf(statistic, df))
+    }
+
+
+def runs_test(binary):
+    """Wald-Wolfowitz runs test with the normal approximation"""
+    n1 = int(binary.sum())
+    n2 = len(binary) - n1
+    n = n1 + n2
+    runs = int(count_runs(binary)[0])
+    if n1 == 0 or n2 == 0:
+        return {'runs': runs, 'expected_runs': float(runs), 'z_score': 0.0, 'p_value': 1.0}
+
+    expected = 2 * n1 * n2 / n + 1
+    variance = 2 * n1 * n2 * (2 * n1 * n2 - n) / (n ** 2 * (n - 1))
+    z_score = (runs - expected) / np.sqrt(variance) if variance > 0 else 0.0
+    return {
+        'runs': runs,
+        'expected_runs': float(expected),
+        'z_score': float(z_score),
+        'p_value': float(2 * stats.norm.sf(abs(z_score)))
+    }
+
+
+def run_randomness_tests(arrays, n_permutations=2000, seed=None, n_workers=None, permutations_per_chunk=250):
+    """Run the whole randomness suite on one game's draw arrays"""
+    n_draws = len(arrays)
+    if n_draws < 3:
+        return {}
+
+    sequences = draw_sequences(arrays)
+    observed = {name: float(value[0]) for name, value in order_statistics(sequences).items()}
+
+    # Permutation nulls for everything that depends on draw order
+    null = {}
+    if n_permutations:
+        sizes = chunk_sizes(n_permutations, permutations_per_chunk)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(sequences, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+        results = run_chunks(_permutation_chunk, jobs, n_workers or os.cpu_count() or 1)
+        null = {name: np.sort(np.concatenate([r[name] for r in results]).astype(np.float64)) for name in observed}
+
+    def permutation_p_value(name):
+        return empirical_p_value(observed[name], null[name]) if null else None
+
+    main_counts = np.bincount(arrays.main.ravel() - 1, minlength=MAIN_NUMBERS)
+    powerball_counts = np.bincount(arrays.powerball - 1, minlength=POWERBALL_NUMBERS)
+
+    runs = {}
+    for name in ('parity', 'low_high'):
+        runs[name] = runs_test(sequences[name])
+        runs[name]['permutation_p_value'] = permutation_p_value(f'{name}_runs')
+
+    # Serial correlation of sums: r1 ~ N(-1/n, 1/n) under independence
+    r1 = observed['sums_serial_correlation']
+    z_score = (r1 + 1 / n_draws) * np.sqrt(n_draws)
+    serial = {
+        'lag1': r1,
+        'z_score': float(z_score),
+        'p_value': float(2 * stats.norm.sf(abs(z_score))),
+        'permutation_p_value': permutation_p_value('sums_serial_correlation')
+    }
+
+    n_pairs = n_draws - 1
+    repeats = {}
+    for name, expected, variance in (
+        ('main', EXPECTED_MAIN_REPEATS, MAIN_REPEAT_VARIANCE),
+        ('powerball', EXPECTED_POWERBALL_REPEATS, EXPECTED_POWERBALL_REPEATS * (1 - EXPECTED_POWERBALL_REPEATS)),
+    ):
+        rate = observed[f'{name}_repeat_rate']
+        z_score = (rate - expected) / np.sqrt(variance / n_pairs)
+        repeats[name] = {
+            'rate': rate,
+            'expected_rate': expected,
+            'z_score': float(z_score),
+            'p_value': float(2 * stats.norm.sf(abs(z_score))),
+            'permutation_p_value': permutation_p_value(f'{name}_repeat_rate')
+        }
+
+    return {
+        'total_draws': n_draws,
+        'n_permutations': n_permutations,
+        'chi_square': {
+            'main': chi_square_uniformity(main_counts, n_draws * NUMBERS_PER_DRAW / MAIN_NUMBERS),
+            'powerball': chi_square_uniformity(powerball_counts, n_draws / POWERBALL_NUMBERS)
+        },
+        'runs': runs,
+        'serial_correlation': {'sums': serial},
+        'repeats': repeats
+    }
@@ -1,31 +1,28 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import time
 import json
 import os
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from functools import partial
+from driver_pool import WebDriverPool, headless_options
+from page_readiness import PageReadiness
+from browser_profiles import start_session
+from collection_orchestrator import CollectionOrchestrator, PageJob
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline
+from async_fetcher import get_fetcher
+from draw_extraction import DrawExtractor, get_extraction_plans
 import warnings
 warnings.filterwarnings('ignore')
 
 class RealPowerBallCollector:
-    def __init__(self):
+    def __init__(self, driver_pool=None, max_workers=2, fetcher=None, browser_profile='full', data_dir="data"):
         self.base_url = "https://www.nationallottery.co.za/results"
-        self.data_dir = "data"
+        self.data_dir = data_dir
         self.powerball_file = os.path.join(self.data_dir, "powerball_data.csv")
         self.powerball_plus_file = os.path.join(self.data_dir, "powerball_plus_data.csv")
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = DrawStore(self.data_dir)
         
         # PowerBall number ranges
         self.main_numbers_range = (1, 50)  # 5 numbers from 1-50
@@ -41,314 +38,154 @@ class RealPowerBallCollector:
             'Upgrade-Insecure-Requests': '1',
         }
         
+        # Keep-alive HTTP connections shared with every other collector
+        self.fetcher = fetcher or get_fetcher()
+        
+        # Warm Chrome sessions shared by every page; created on first use.
+        # browser_profile='lean' blocks images, fonts, styles and trackers.
+        self.browser_profile = browser_profile
+        self.driver_pool = driver_pool
+        self._owns_driver_pool = driver_pool is None
+        
+        # Result pages fetched at once; the driver pool gets a session per worker
+        self.max_workers = max_workers
+        
+        # Waits on page conditions instead of fixed sleeps
+        self.readiness = PageReadiness()
+        
+        # Draw parsing shared with the other collectors, reusing the
+        # extraction plan each results page was last parsed with
+        self.extractor = DrawExtractor(keep_raw_text=True, plans=get_extraction_plans())
+        
+    def driver_options(self):
+        """Chrome options for web scraping"""
+        return headless_options(user_agent=self.headers['User-Agent'], profile=self.browser_profile)
+    
+    def get_driver_pool(self):
+        """Get the driver pool, creating a private one if none was passed in"""
+        if self.driver_pool is None:
+            self.driver_pool = WebDriverPool(
+                size=self.max_workers,
+                options_factory=self.driver_options,
+                on_create=partial(start_session, profile=self.browser_profile)
+            )
+        return self.driver_pool
+    
     def setup_driver(self):
-        """Setup Chrome driver for web scraping"""
+        """Get a Chrome session for web scraping from the driver pool"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            return driver
+            return self.get_driver_pool().acquire()
         except Exception as e:
             print(f"Error setting up Chrome driver: {e}")
             return None
     
+    def close(self):
+        """Quit the pooled sessions if this collector started them"""
+        if self._owns_driver_pool and self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
+    
     def try_requests_scraping(self, url):
-        """Try to scrape using requests and BeautifulSoup"""
+        """Try to load a page with requests; returns its HTML"""
         try:
             print(f"Trying requests method for: {url}")
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.fetcher.get(url, headers=self.headers, timeout=15)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
             print(f"✓ Successfully loaded page with requests")
-            return soup
+            return response.content
         except Exception as e:
             print(f"Requests method failed: {e}")
             return None
     
+    def page_unchanged(self, url):
+        """Whether the last fetch of url got the same content as the one before"""
+        cache = getattr(self.fetcher, 'snapshot_cache', None)
+        return cache is not None and cache.unchanged(url)
+    
     def try_selenium_scraping(self, url):
-        """Try to scrape using Selenium"""
+        """Try to load a page with Selenium; returns its HTML"""
         try:
             print(f"Trying Selenium method for: {url}")
-            driver = self.setup_driver()
-            if not driver:
-                return None
+            # Borrow a warm session; it goes back to the pool for the next page
+            with self.get_driver_pool().driver() as driver:
+                driver.get(url)
+                rows = self.readiness.wait_for_results(driver, replaces=3)
                 
-            driver.get(url)
-            time.sleep(3)  # Wait for page to load
-            
-            # Try to scroll to load more content
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            driver.quit()
+                # Try to scroll to load more content
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                self.readiness.wait_for_more_rows(driver, rows, replaces=2)
+                
+                html = driver.page_source
             print(f"✓ Successfully loaded page with Selenium")
-            return soup
+            return html
         except Exception as e:
             print(f"Selenium method failed: {e}")
             return None
     
-    def parse_draw_date(self, date_str):
-        """Parse various date formats from the website"""
-        try:
-            # Clean the date string
-            date_str = date_str.strip().replace('\n', ' ').replace('\t', ' ')
-            date_str = re.sub(r'\s+', ' ', date_str)  # Remove extra spaces
-            
-            # Try different date formats
-            formats = [
-                "%d %B %Y",      # 15 January 2024
-                "%d %b %Y",      # 15 Jan 2024
-                "%d/%m/%Y",      # 15/01/2024
-                "%Y-%m-%d",      # 2024-01-15
-                "%d-%m-%Y",      # 15-01-2024
-                "%B %d, %Y",     # January 15, 2024
-                "%b %d, %Y",     # Jan 15, 2024
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            # If all formats fail, try to extract date from string
-            date_match = re.search(r'(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{4})', date_str)
-            if date_match:
-                day, month, year = date_match.groups()
-                return datetime(int(year), int(month), int(day))
-            
-            # Try to extract from text like "15 January 2024"
-            month_names = {
-                'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                'september': 9, 'october': 10, 'november': 11, 'december': 12
-            }
-            
-            for month_name, month_num in month_names.items():
-                if month_name in date_str.lower():
-                    # Extract day and year
-                    day_match = re.search(r'(\d{1,2})', date_str)
-                    year_match = re.search(r'(\d{4})', date_str)
-                    if day_match and year_match:
-                        return datetime(int(year_match.group(1)), month_num, int(day_match.group(1)))
-                
-        except Exception as e:
-            print(f"Error parsing date '{date_str}': {e}")
-            
-        return None
-    
-    def extract_numbers_from_text(self, text):
-        """Extract numbers from text content"""
-        # Find all numbers in the text
-        numbers = re.findall(r'\b(\d{1,2})\b', text)
-        numbers = [int(n) for n in numbers if n.isdigit()]
-        
-        # Filter numbers by range
-        main_numbers = [n for n in numbers if self.main_numbers_range[0] <= n <= self.main_numbers_range[1]]
-        powerballs = [n for n in numbers if self.powerball_range[0] <= n <= self.powerball_range[1]]
-        
-        return main_numbers, powerballs
-    
-    def scrape_powerball_data(self):
-        """Scrape PowerBall data from the website"""
-        print("🎯 Scraping PowerBall data...")
+    def scrape_results_page(self, url, game_type, since=None):
+        """Scrape one results page for a game, keeping draws newer than since"""
+        print(f"🎯 Scraping {game_type} data from {url}...")
         
-        url = f"{self.base_url}/powerball"
-        soup = self.try_requests_scraping(url)
+        html = self.try_requests_scraping(url)
         
-        if not soup:
-            soup = self.try_selenium_scraping(url)
-        
-        if not soup:
-            print("❌ Failed to load PowerBall page")
+        # Same bytes as last time and the store is up to date: nothing new to parse
+        if html and since is not None and self.page_unchanged(url):
+            print(f"⏭️  {game_type} page unchanged since the last fetch, skipping parse")
             return []
         
-        draws = []
-        
-        # Look for different possible selectors
-        selectors = [
-            '.results-table tr',
-            '.draw-item',
-            '.result-item',
-            '.lottery-result',
-            'tr[data-draw]',
-            '.draw-row',
-            'table tr'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"Found {len(elements)} elements with selector: {selector}")
-                break
+        if not html:
+            html = self.try_selenium_scraping(url)
         
-        if not elements:
-            print("No draw elements found, trying alternative approach...")
-            # Try to find any table or list of results
-            tables = soup.find_all('table')
-            if tables:
-                elements = tables[0].find_all('tr')
-                print(f"Found {len(elements)} table rows")
+        if not html:
+            print(f"❌ Failed to load {game_type} page")
+            return []
         
-        for element in elements:
-            try:
-                draw_data = self.extract_draw_from_element(element, 'PowerBall')
-                if draw_data:
-                    draws.append(draw_data)
-            except Exception as e:
-                continue
+        draws = [d for d in self.extractor.extract(html, game_type, source=url) if since is None or d['draw_date'] > since]
         
-        print(f"✓ Extracted {len(draws)} PowerBall draws")
+        print(f"✓ Extracted {len(draws)} {'new ' if since is not None else ''}{game_type} draws")
         return draws
     
+    def scrape_powerball_data(self):
+        """Scrape PowerBall data from the website"""
+        return self.scrape_results_page(f"{self.base_url}/powerball", 'PowerBall')
+    
     def scrape_powerball_plus_data(self):
         """Scrape PowerBall Plus data from the website"""
-        print("🎯 Scraping PowerBall Plus data...")
-        
-        url = f"{self.base_url}/powerball-plus"
-        soup = self.try_requests_scraping(url)
-        
-        if not soup:
-            soup = self.try_selenium_scraping(url)
-        
-        if not soup:
-            print("❌ Failed to load PowerBall Plus page")
-            return []
-        
-        draws = []
-        
-        # Look for different possible selectors
-        selectors = [
-            '.results-table tr',
-            '.draw-item',
-            '.result-item',
-            '.lottery-result',
-            'tr[data-draw]',
-            '.draw-row',
-            'table tr'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"Found {len(elements)} elements with selector: {selector}")
-                break
-        
-        if not elements:
-            print("No draw elements found, trying alternative approach...")
-            tables = soup.find_all('table')
-            if tables:
-                elements = tables[0].find_all('tr')
-                print(f"Found {len(elements)} table rows")
-        
-        for element in elements:
-            try:
-                draw_data = self.extract_draw_from_element(element, 'PowerBall Plus')
-                if draw_data:
-                    draws.append(draw_data)
-            except Exception as e:
-                continue
-        
-        print(f"✓ Extracted {len(draws)} PowerBall Plus draws")
-        return draws
+        return self.scrape_results_page(f"{self.base_url}/powerball-plus", 'PowerBall Plus')
     
-    def extract_draw_from_element(self, element, game_type):
-        """Extract draw data from a single element"""
-        try:
-            text = element.get_text(strip=True)
-            if not text or len(text) < 10:  # Skip empty or very short elements
-                return None
-            
-            # Look for date patterns
-            date_patterns = [
-                r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-                r'(\d{1,2}\s+\w+\s+\d{4})',
-                r'(\w+\s+\d{1,2},?\s+\d{4})',
-                r'(\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2})'
-            ]
-            
-            draw_date = None
-            for pattern in date_patterns:
-                date_match = re.search(pattern, text)
-                if date_match:
-                    draw_date = self.parse_draw_date(date_match.group(1))
-                    if draw_date:
-                        break
-            
-            if not draw_date:
-                return None
-            
-            # Extract numbers
-            main_numbers, powerballs = self.extract_numbers_from_text(text)
-            
-            # Validate we have the right number of numbers
-            if len(main_numbers) >= 5 and len(powerballs) >= 1:
-                # Take first 5 main numbers and first powerball
-                main_numbers = sorted(main_numbers[:5])
-                powerball = powerballs[0]
-                
-                # Validate ranges
-                if all(self.main_numbers_range[0] <= n <= self.main_numbers_range[1] for n in main_numbers):
-                    if self.powerball_range[0] <= powerball <= self.powerball_range[1]:
-                        return {
-                            'draw_date': draw_date,
-                            'main_numbers': main_numbers,
-                            'powerball': powerball,
-                            'game_type': game_type,
-                            'draw_day': draw_date.strftime('%A'),
-                            'raw_text': text[:100]  # Store first 100 chars for debugging
-                        }
-            
-        except Exception as e:
-            return None
-        
-        return None
+    def result_pages(self, high_water_marks=None):
+        """Every results page to collect, one job per page"""
+        marks = high_water_marks or {}
+        return [
+            PageJob('PowerBall', f"{self.base_url}/powerball",
+                    partial(self.scrape_results_page, since=marks.get('PowerBall'))),
+            PageJob('PowerBall Plus', f"{self.base_url}/powerball-plus",
+                    partial(self.scrape_results_page, since=marks.get('PowerBall Plus')))
+        ]
     
     def collect_all_data(self):
         """Collect all historical data from both websites"""
         print("🚀 Starting real data collection from South African National Lottery...")
         print("=" * 70)
         
-        all_draws = []
+        # Only draws newer than what is already stored are kept
+        marks = self.store.high_water_marks()
+        self.readiness.reset()
         
-        # Collect PowerBall data
-        powerball_draws = self.scrape_powerball_data()
-        all_draws.extend(powerball_draws)
-        
-        # Collect PowerBall Plus data
-        powerball_plus_draws = self.scrape_powerball_plus_data()
-        all_draws.extend(powerball_plus_draws)
-        
-        # Save individual files
-        if powerball_draws:
-            df_pb = pd.DataFrame(powerball_draws)
-            df_pb = df_pb.sort_values('draw_date', ascending=False)
-            df_pb.to_csv(self.powerball_file, index=False)
-            print(f"💾 Saved {len(powerball_draws)} PowerBall draws to {self.powerball_file}")
+        # Fetch every page at once, streaming draws into the store as pages come in
+        try:
+            pages = CollectionOrchestrator(max_workers=self.max_workers).stream(self.result_pages(marks))
+            report = DrawPipeline(self.store, keep=True).run(pages)
+        finally:
+            self.close()
         
-        if powerball_plus_draws:
-            df_pbp = pd.DataFrame(powerball_plus_draws)
-            df_pbp = df_pbp.sort_values('draw_date', ascending=False)
-            df_pbp.to_csv(self.powerball_plus_file, index=False)
-            print(f"💾 Saved {len(powerball_plus_draws)} PowerBall Plus draws to {self.powerball_plus_file}")
+        all_draws = report['draws'].to_dict('records')
+        print(f"💾 Added {report['stored']} new draws to {self.store.combined_file}")
+        print(self.readiness.summary())
+        print(self.extractor.plans.summary())
         
-        # Save combined data
         if all_draws:
-            df_all = pd.DataFrame(all_draws)
-            df_all = df_all.sort_values('draw_date', ascending=False)
-            combined_file = os.path.join(self.data_dir, "all_powerball_data.csv")
-            df_all.to_csv(combined_file, index=False)
-            print(f"💾 Saved {len(all_draws)} total draws to {combined_file}")
-            
             # Show sample of collected data
             print("\n📊 Sample of collected data:")
             print("-" * 50)
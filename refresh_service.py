@@ -0,0 +1,207 @@
+import copy
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+from analysis_engine import PowerBallAnalyzer
+from prediction_engine import PowerBallPredictor
+from prediction_pool import PredictionPool, DEFAULT_POOL_FILE, DEFAULT_POOL_SIZE, STRATEGIES, GAME_TYPES
+from result_cache import ResultCache, next_draw_time, previous_draw_time, SAST
+from draw_arrays import unseen_draws
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline
+
+# Reports computed per game type, and the ones that cover both games at once
+GAME_REPORTS = (
+    'get_frequency_analysis', 'get_pattern_analysis', 'get_trend_analysis', 'get_draw_day_analysis',
+    'get_significance_analysis', 'get_lag_analysis', 'get_decayed_frequency_analysis', 'get_bayesian_analysis',
+    'create_frequency_chart', 'create_pattern_chart', 'create_lag_chart',
+)
+COMBINED_REPORTS = ('get_randomness_analysis', 'get_cross_game_analysis', 'create_cross_game_chart', 'get_draw_history')
+
+
+def default_collector(data_dir="data"):
+    from real_data_collector import RealPowerBallCollector
+    return RealPowerBallCollector(data_dir=data_dir)
+
+
+class RefreshService:
+    """Post-draw refresh loop that keeps every cache warm.
+
+    A configurable delay after each scheduled draw it collects draws,
+    applies the new ones to copies of the live analyzer and predictor
+    through their incremental update path, precomputes every report,
+    chart, model and prediction pool for the new dataset version, and
+    only then swaps the copies in. Readers call current() and never see
+    a half-refreshed state or pay for a recompute.
+
+    data_file is the DrawStore's combined file, and the store is its only
+    writer: collectors store what they find, and draws handed to
+    refresh() directly go in through DrawPipeline. collector_factory is
+    called with the store's data_dir, so the collector writes to the
+    same store the service reads.
+    """
+
+    def __init__(self, data_file="data/all_powerball_data.csv", collector_factory=default_collector,
+                 delay_minutes=30, retry_minutes=15, max_attempts=8, result_cache=None,
+                 pool_file=DEFAULT_POOL_FILE, pool_size=DEFAULT_POOL_SIZE, game_types=GAME_TYPES):
+        self.data_file = data_file
+        self.collector_factory = collector_factory
+        self.delay = timedelta(minutes=delay_minutes)
+        self.retry_interval = timedelta(minutes=retry_minutes)
+        self.max_attempts = max_attempts
+        self.pool_size = pool_size
+        self.game_types = tuple(game_types)
+        if result_cache is None:
+            result_cache = ResultCache(cache_dir=os.path.join(os.path.dirname(data_file), "result_cache"))
+        # Serve cached results until the last retry for a draw has run; the
+        # refresh swaps in a new dataset version, which misses them anyway
+        result_cache.grace = max(result_cache.grace, self.delay + self.max_attempts * self.retry_interval)
+        self.result_cache = result_cache
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_refresh = None
+        self.store = DrawStore(os.path.dirname(data_file) or ".")
+
+        self.analyzer = PowerBallAnalyzer(data_file, result_cache=result_cache)
+        self.predictor = PowerBallPredictor(data_file, result_cache=result_cache)
+        self.pool = PredictionPool(pool_file)
+        self.pool.load()
+
+    def current(self):
+        """The live (analyzer, predictor, pool), always from the same dataset version"""
+        with self._lock:
+            return self.analyzer, self.predictor, self.pool
+
+    def missed_draw(self, now=None):
+        """Whether the latest draw is past its collection time but was never collected,
+        e.g. the service (re)started after previous draw + delay"""
+        now = (now or datetime.now(SAST)).astimezone(SAST)
+        previous = previous_draw_time(now)
+        if previous + self.delay > now:
+            return False
+        if self.last_refresh is not None and self.last_refresh >= previous + self.delay:
+            return False
+        data = self.current()[0].data
+        if data is None or data.empty:
+            return True
+        return pd.to_datetime(data['draw_date']).max().date() < previous.date()
+
+    def next_refresh_time(self, now=None):
+        """When to collect next: now if the latest draw was missed, otherwise
+        the configured delay after the latest or next draw"""
+        now = (now or datetime.now(SAST)).astimezone(SAST)
+        after_previous = previous_draw_time(now) + self.delay
+        if after_previous > now:
+            return after_previous
+        if self.missed_draw(now):
+            return now
+        return next_draw_time(now) + self.delay
+
+    def collect(self):
+        """Run a collector and return what it found as a DataFrame"""
+        draws = self.collector_factory(self.store.data_dir).collect_all_data()
+        return pd.DataFrame(draws)
+
+    def _stage(self, engine):
+        # Copy everything except the objects the live engine shares
+        shared = {id(self.result_cache): self.result_cache}
+        if getattr(engine, 'monte_carlo', None) is not None:
+            shared[id(engine.monte_carlo)] = engine.monte_carlo
+        return copy.deepcopy(engine, shared)
+
+    def warm(self, analyzer, predictor, pool):
+        """Compute every report, model and prediction pool for a dataset version"""
+        start = time.time()
+        for game_type in self.game_types:
+            for report in GAME_REPORTS:
+                getattr(analyzer, report)(game_type=game_type)
+            predictor.get_incremental_model(game_type)
+            predictor.get_transition_model(game_type)
+        for report in COMBINED_REPORTS:
+            getattr(analyzer, report)()
+        for analysis_type in ('frequency', 'pattern', 'trend', 'draw_day'):
+            analyzer.get_analysis(analysis_type)
+
+        pool.generate(predictor, STRATEGIES, self.game_types, self.pool_size)
+        print(f"Warmed dataset version {predictor.get_dataset_version()} in {time.time() - start:.1f}s")
+
+    def refresh(self, collected=None):
+        """Collect, apply, warm and flip; returns the number of new draws"""
+        if collected is None:
+            try:
+                collected = self.collect()
+            except Exception as e:
+                print(f"Collection failed: {e}")
+                return 0
+
+        analyzer, predictor, pool = self.current()
+        new_draws = unseen_draws(analyzer.data, collected)
+        if new_draws.empty and pool.is_current(predictor):
+            print("No new draws")
+            return 0
+
+        staged_analyzer = self._stage(analyzer)
+        staged_predictor = self._stage(predictor)
+        staged_analyzer.apply_new_draws(new_draws)
+        staged_predictor.apply_new_draws(new_draws)
+
+        staged_pool = PredictionPool(pool.pool_file)
+        self.warm(staged_analyzer, staged_predictor, staged_pool)
+        # A collector has stored its draws already; the pipeline skips those
+        if not new_draws.empty:
+            DrawPipeline(self.store).run(new_draws.to_dict('records'))
+        staged_pool.save()
+
+        with self._lock:
+            self.analyzer, self.predictor, self.pool = staged_analyzer, staged_predictor, staged_pool
+        self.last_refresh = datetime.now(SAST)
+        print(f"Applied {len(new_draws)} new draws; now serving {staged_predictor.get_dataset_version()}")
+        return len(new_draws)
+
+    def _wait_until(self, moment):
+        """Sleep until moment; returns False if the service was stopped"""
+        return not self._stop.wait(max(0.0, (moment - datetime.now(SAST)).total_seconds()))
+
+    def run_forever(self):
+        """Refresh after every scheduled draw, retrying until new draws appear"""
+        # Make sure whatever is on disk is warm before the first draw comes round
+        analyzer, predictor, pool = self.current()
+        if not pool.is_current(predictor):
+            self.refresh(collected=pd.DataFrame())
+
+        while not self._stop.is_set():
+            trigger = self.next_refresh_time()
+            print(f"Next refresh at {trigger.isoformat()}")
+            if not self._wait_until(trigger):
+                break
+            for attempt in range(self.max_attempts):
+                if self.refresh():
+                    break
+                if not self._wait_until(datetime.now(SAST) + self.retry_interval):
+                    return
+            # Tried this draw either way; don't treat it as missed again
+            self.last_refresh = datetime.now(SAST)
+
+    def start(self):
+        """Run the refresh loop on a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="refresh-service", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    service = RefreshService()
+    try:
+        service.run_forever()
+    except KeyboardInterrupt:
+        service.stop()
@@ -0,0 +1,168 @@
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+# South African draws: Tuesday and Friday evenings, SAST (UTC+2, no DST)
+SAST = timezone(timedelta(hours=2), 'SAST')
+DRAW_WEEKDAYS = (1, 4)
+DRAW_HOUR, DRAW_MINUTE = 21, 0
+
+
+def next_draw_time(now=None):
+    """The next scheduled draw strictly after now, as an aware datetime"""
+    now = (now or datetime.now(SAST)).astimezone(SAST)
+    for days_ahead in range(8):
+        day = now + timedelta(days=days_ahead)
+        if day.weekday() not in DRAW_WEEKDAYS:
+            continue
+        draw = day.replace(hour=DRAW_HOUR, minute=DRAW_MINUTE, second=0, microsecond=0)
+        if draw > now:
+            return draw
+
+
+def previous_draw_time(now=None):
+    """The most recent scheduled draw at or before now"""
+    now = (now or datetime.now(SAST)).astimezone(SAST)
+    for days_back in range(8):
+        day = now - timedelta(days=days_back)
+        if day.weekday() not in DRAW_WEEKDAYS:
+            continue
+        draw = day.replace(hour=DRAW_HOUR, minute=DRAW_MINUTE, second=0, microsecond=0)
+        if draw <= now:
+            return draw
+
+
+class ResultCache:
+    """Two-tier cache for results that only change when a draw happens.
+
+    Entries are keyed by (method, arguments, dataset version) and expire
+    grace after the next scheduled draw. A new dataset version already
+    misses every old entry, so grace only has to cover the time until
+    the draw is collected: the refresh service sets it to its collection
+    deadline, so entries stay valid until the refresh that replaces them.
+    The memory tier is an LRU of max_entries; with cache_dir set, entries
+    are also pickled to disk so they survive a restart.
+    """
+
+    def __init__(self, max_entries=256, cache_dir=None, grace=timedelta(0)):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.grace = grace
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + '.pkl')
+
+    def get(self, key, default=None):
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        if self.cache_dir:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    stored_key, expires_at, value = pickle.load(f)
+                if stored_key == key and expires_at > now:
+                    self._remember(key, expires_at, value)
+                    self.disk_hits += 1
+                    return value
+            except (OSError, pickle.PickleError, EOFError, ValueError):
+                pass
+
+        self.misses += 1
+        return default
+
+    def _remember(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def expiry(self, now=None):
+        """When entries set now expire: grace after the next draw"""
+        return next_draw_time(now) + self.grace
+
+    def set(self, key, value, expires_at=None):
+        """Store a value until expires_at (epoch seconds, default see expiry())"""
+        expires_at = expires_at or self.expiry().timestamp()
+        self._remember(key, expires_at, value)
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(f"{path}.tmp", 'wb') as f:
+                    pickle.dump((key, expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(f"{path}.tmp", path)
+            except (OSError, pickle.PickleError) as e:
+                print(f"Could not write cache entry: {e}")
+
+    def invalidate(self):
+        """Drop every entry, in memory and on disk"""
+        self._entries.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'next_expiry': self.expiry().isoformat()
+        }
+
+
+def cached_result(method=None, *, seeded_only=False):
+    """Cache a PowerBallAnalyzer/PowerBallPredictor method in self.result_cache.
+
+    Arguments are normalized through the method signature (defaults
+    filled in), so f(x) and f(game_type=x) share an entry; a seed
+    argument, if the method has one, is part of the key like any other.
+    With seeded_only=True a call is cached only when given a seed, for
+    methods whose unseeded results are random. Values are copied into
+    and out of the cache, so no caller sees another's changes. Methods
+    run uncached when the object has no result_cache.
+    """
+    if method is None:
+        return functools.partial(cached_result, seeded_only=seeded_only)
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, 'result_cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        if seeded_only and bound.arguments.get('seed') is None:
+            return method(self, *args, **kwargs)
+        arguments = tuple((name, repr(value)) for name, value in bound.arguments.items() if name != 'self')
+        key = (type(self).__name__, method.__name__, arguments, self.get_dataset_version())
+
+        missing = object()
+        result = cache.get(key, missing)
+        if result is missing:
+            result = method(self, *args, **kwargs)
+            cache.set(key, copy.deepcopy(result))
+            return result
+        return copy.deepcopy(result)
+
+    return wrapper
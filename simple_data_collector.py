@@ -1,9 +1,9 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
+from async_fetcher import get_fetcher
+from draw_store import DrawStore
+from draw_pipeline import DrawPipeline
 import numpy as np
 from datetime import datetime, timedelta
-import time
 import json
 import os
 import re
@@ -17,83 +17,49 @@ class SimplePowerBallCollector:
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = DrawStore(self.data_dir)
         
         # PowerBall number ranges
         self.main_numbers_range = (1, 50)  # 5 numbers from 1-50
         self.powerball_range = (1, 20)     # 1 powerball from 1-20
         
-    def create_sample_data(self):
-        """Create sample data for testing when web scraping fails"""
-        print("Creating sample data for testing...")
-        
-        # Generate sample PowerBall data
-        powerball_data = []
-        powerball_plus_data = []
-        
-        # Start from 2020
+    def sample_draws(self):
+        """Random but realistic draws for both games, every Tuesday and Friday since 2020"""
         start_date = datetime(2020, 1, 1)
         current_date = datetime.now()
         
-        # Generate draws for Tuesday and Friday
         current = start_date
         draw_number = 1
         
         while current <= current_date:
             # Check if it's Tuesday (1) or Friday (4)
             if current.weekday() in [1, 4]:  # Tuesday=1, Friday=4
-                # Generate random but realistic numbers
-                main_numbers = sorted(np.random.choice(range(1, 51), 5, replace=False))
-                powerball = np.random.choice(range(1, 21))
-                
-                draw_data = {
-                    'draw_date': current.strftime('%Y-%m-%d'),
-                    'main_numbers': main_numbers,
-                    'powerball': powerball,
-                    'game_type': 'PowerBall',
-                    'draw_day': current.strftime('%A'),
-                    'draw_number': draw_number
-                }
-                powerball_data.append(draw_data)
-                
-                # PowerBall Plus (slightly different numbers)
-                main_numbers_plus = sorted(np.random.choice(range(1, 51), 5, replace=False))
-                powerball_plus = np.random.choice(range(1, 21))
-                
-                draw_data_plus = {
-                    'draw_date': current.strftime('%Y-%m-%d'),
-                    'main_numbers': main_numbers_plus,
-                    'powerball': powerball_plus,
-                    'game_type': 'PowerBall Plus',
-                    'draw_day': current.strftime('%A'),
-                    'draw_number': draw_number
-                }
-                powerball_plus_data.append(draw_data_plus)
+                # PowerBall Plus gets its own, slightly different numbers
+                for game_type in ('PowerBall', 'PowerBall Plus'):
+                    yield {
+                        'draw_date': current.strftime('%Y-%m-%d'),
+                        'main_numbers': sorted(np.random.choice(range(1, 51), 5, replace=False)),
+                        'powerball': np.random.choice(range(1, 21)),
+                        'game_type': game_type,
+                        'draw_day': current.strftime('%A'),
+                        'draw_number': draw_number
+                    }
                 
                 draw_number += 1
             
             current += timedelta(days=1)
+    
+    def create_sample_data(self):
+        """Create sample data for testing when web scraping fails"""
+        print("Creating sample data for testing...")
         
-        # Save PowerBall data
-        if powerball_data:
-            df_pb = pd.DataFrame(powerball_data)
-            df_pb.to_csv(self.powerball_file, index=False)
-            print(f"Created {len(powerball_data)} PowerBall draws")
-        
-        # Save PowerBall Plus data
-        if powerball_plus_data:
-            df_pbp = pd.DataFrame(powerball_plus_data)
-            df_pbp.to_csv(self.powerball_plus_file, index=False)
-            print(f"Created {len(powerball_plus_data)} PowerBall Plus draws")
-        
-        # Create combined data
-        all_data = powerball_data + powerball_plus_data
-        if all_data:
-            df_all = pd.DataFrame(all_data)
-            combined_file = os.path.join(self.data_dir, "all_powerball_data.csv")
-            df_all.to_csv(combined_file, index=False)
-            print(f"Combined data saved to {combined_file}")
+        # Dates the store already has keep their draws
+        report = DrawPipeline(self.store, keep=True, compact=True).run(self.sample_draws())
+        for game_type, count in report['draws']['game_type'].value_counts().items():
+            print(f"Created {count} {game_type} draws")
+        print(f"Combined data saved to {self.store.combined_file}")
         
-        return all_data
+        return report['draws'].to_dict('records')
     
     def try_web_scraping(self):
         """Try to scrape real data from the website"""
@@ -106,7 +72,7 @@ class SimplePowerBallCollector:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = get_fetcher().get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 print("Successfully connected to PowerBall website")
                 # Here you would parse the HTML to extract draw data
@@ -0,0 +1,149 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_SNAPSHOT_DIR = "data/snapshots"
+
+# Response headers kept with each snapshot
+KEPT_HEADERS = ('ETag', 'Last-Modified', 'Content-Type', 'Cache-Control', 'Date')
+
+
+class SnapshotCache:
+    """Every raw page the fetch layer receives, kept on disk.
+
+    Bodies are stored once per distinct content under their sha256
+    (gzipped, in objects/); index.jsonl gets one line per fetch with the
+    URL, status, headers, hash and timestamp. The latest snapshot of a
+    URL supplies If-None-Match/If-Modified-Since for the next fetch, and
+    can stand in for the network entirely in replay mode.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_SNAPSHOT_DIR):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        self._latest = {}
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    self._latest[record['url']] = record
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", digest[:2], f"{digest}.gz")
+
+    def latest(self, url):
+        """The most recent snapshot record for a URL, or None"""
+        return self._latest.get(url)
+
+    def latest_snapshots(self):
+        return list(self._latest.values())
+
+    def body(self, record):
+        with gzip.open(self._object_path(record['sha256']), 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, url):
+        """Validators from the last snapshot, for a conditional GET"""
+        record = self.latest(url)
+        if record is None:
+            return {}
+        headers = {}
+        if record['headers'].get('ETag'):
+            headers['If-None-Match'] = record['headers']['ETag']
+        if record['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = record['headers']['Last-Modified']
+        return headers
+
+    def unchanged(self, url):
+        """Whether the last fetch of url returned the same content as the one before"""
+        record = self.latest(url)
+        return record is not None and not record['changed']
+
+    def _append(self, record):
+        with self._lock:
+            with open(self.index_file, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            self._latest[record['url']] = record
+        return record
+
+    def record(self, url, status, headers, content):
+        """Store a response body (once per distinct content) and log the fetch"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_file, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_file, path)
+
+        previous = self.latest(url)
+        return self._append({
+            'url': url,
+            'sha256': digest,
+            'status': status,
+            'headers': {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'not_modified': False,
+            'changed': previous is None or previous['sha256'] != digest
+        })
+
+    def response(self, record):
+        """A requests.Response rebuilt from a snapshot"""
+        response = requests.Response()
+        response.status_code = record['status']
+        response.url = record['url']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.body(record)
+        response.unchanged = not record['changed']
+        return response
+
+    def store_response(self, url, response):
+        """Snapshot a live response; a 304 is answered from the stored copy.
+
+        The returned response has an `unchanged` attribute that is True
+        when the content is the same as the previous fetch of the URL.
+        """
+        previous = self.latest(url)
+        if response.status_code == 304 and previous is not None:
+            record = self._append(dict(
+                previous,
+                fetched_at=datetime.now().isoformat(timespec='seconds'),
+                not_modified=True,
+                changed=False
+            ))
+            return self.response(record)
+
+        if response.status_code != 200:
+            return response
+        record = self.record(url, response.status_code, response.headers, response.content)
+        response.unchanged = not record['changed']
+        return response
+
+    def replay(self, url):
+        """The latest snapshot of url as a response, with no network"""
+        record = self.latest(url)
+        if record is None:
+            raise LookupError(f"No snapshot of {url}")
+        response = self.response(record)
+        response.unchanged = False  # replay always reprocesses
+        return response
+
+
+if __name__ == "__main__":
+    # Offline reprocessing: parse, validate and store every cached page
+    from advanced_web_scraper import AdvancedPowerBallScraper
+    AdvancedPowerBallScraper().replay_snapshots(SnapshotCache())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+from collections import Counter
+import numpy as np
+import pandas as pd
+from analysis_engine import PowerBallAnalyzer
+from analytics_cube import AnalyticsCube
+from draw_arrays import DrawArrays
+
+
+def sample_history(seed=0):
+    """Tuesday and Friday draws for both games since 2020, like simple_data_collector's"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for date in pd.date_range('2020-01-01', '2025-12-31'):
+        if date.weekday() not in (1, 4):
+            continue
+        for game_type in ('PowerBall', 'PowerBall Plus'):
+            rows.append({
+                'draw_date': date.strftime('%Y-%m-%d'),
+                'main_numbers': str(sorted(int(n) for n in rng.choice(range(1, 51), 5, replace=False))),
+                'powerball': int(rng.integers(1, 21)),
+                'game_type': game_type,
+                'draw_day': date.strftime('%A'),
+            })
+    return pd.DataFrame(rows)
+
+
+def old_draw_day_analysis(data, game_type):
+    """The draw day report as it was computed before the analytics cube, from the draw_day column"""
+    game_data = data[data['game_type'] == game_type]
+    report = {}
+    for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+        day_data = game_data[game_data['draw_day'] == day]
+        if day_data.empty:
+            continue
+        draws = [eval(numbers) for numbers in day_data['main_numbers']]
+        report[day] = {
+            'total_draws': len(day_data),
+            'counts': Counter(n for numbers in draws for n in numbers),
+            'avg_sum': np.mean([sum(numbers) for numbers in draws]),
+        }
+    return report
+
+
+def test_draw_day_analysis_matches_old_report():
+    """Same days, draw counts, sums and per-number counts as the old report.
+
+    Weekdays now come from draw_date rather than the stored draw_day
+    column, and ties in the most/least frequent lists are ordered by
+    number; on well-formed data the two agree.
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        data_file = os.path.join(data_dir, "all_powerball_data.csv")
+        sample_history().to_csv(data_file, index=False)
+        analyzer = PowerBallAnalyzer(data_file)
+
+        for game_type in ('PowerBall', 'PowerBall Plus'):
+            old = old_draw_day_analysis(pd.read_csv(data_file), game_type)
+            new = analyzer.get_draw_day_analysis(game_type)
+            assert set(new) == set(old)
+            for day, report in new.items():
+                assert report['total_draws'] == old[day]['total_draws']
+                assert np.isclose(report['avg_sum'], old[day]['avg_sum'])
+                counts = old[day]['counts']
+                assert all(counts[n] == c for n, c in report['most_frequent'] + report['least_frequent'])
+                assert [c for _, c in report['most_frequent']] == [c for _, c in counts.most_common(5)]
+                assert [c for _, c in report['least_frequent']] == [c for _, c in counts.most_common()[-5:]]
+
+
+def test_out_of_range_filters_are_empty():
+    """Weekday and month numbers outside their range match no draws, like an unknown year"""
+    cube = AnalyticsCube.from_frame(sample_history())
+    assert cube.query(weekday=1)['draws'] > 0 and cube.query(month=12)['draws'] > 0
+    for selection in ({'weekday': 7}, {'weekday': -1}, {'month': 0}, {'month': 13}, {'year': 2019}):
+        assert cube.query('PowerBall', **selection)['draws'] == 0, selection
+
+
+def test_add_draws_across_new_year():
+    """Draws added a year at a time, growing the year axis, give the same cube as one pass"""
+    data = sample_history()
+    whole = AnalyticsCube.from_frame(data)
+    incremental = AnalyticsCube()
+    years = data['draw_date'].str[:4]
+    # Newest first, so each year is added before the start of the axis
+    for year in sorted(years.unique(), reverse=True):
+        incremental.add_frame(data[years == year])
+
+    assert incremental.years == whole.years and set(incremental.game_types) == set(whole.game_types)
+    for game_type in whole.game_types:
+        for year in whole.years:
+            expected, actual = whole.query(game_type, year=year), incremental.query(game_type, year=year)
+            assert actual['draws'] == expected['draws'] and actual['sum_total'] == expected['sum_total']
+            assert (actual['main_counts'] == expected['main_counts']).all()
+            assert (actual['powerball_counts'] == expected['powerball_counts']).all()
+
+    # One more draw in a year the cube hasn't seen yet
+    arrays = DrawArrays.from_frame(pd.DataFrame([{'draw_date': '2026-01-02', 'main_numbers': '[1, 2, 3, 4, 5]',
+                                                   'powerball': 6, 'game_type': 'PowerBall'}]), 'PowerBall')
+    incremental.add_draws('PowerBall', arrays)
+    new_year = incremental.query('PowerBall', year=2026)
+    assert incremental.years[-1] == 2026 and new_year['draws'] == 1 and new_year['sum_total'] == 15
+    assert incremental.query('PowerBall', year=2025)['draws'] == whole.query('PowerBall', year=2025)['draws']
+
+
+if __name__ == "__main__":
+    for test in (test_draw_day_analysis_matches_old_report, test_out_of_range_filters_are_empty,
+                 test_add_draws_across_new_year):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from bs4 import BeautifulSoup
+from async_fetcher import AsyncFetcher
+from snapshot_cache import SnapshotCache
+
+RESULTS_PAGE = b"""<html><head><title>PowerBall Results</title></head><body>
+<table class="results-table">
+<tr><td>15 January 2024</td><td>3 12 25 38 44</td><td>7</td></tr>
+<tr><td>12 January 2024</td><td>1 9 17 28 50</td><td>19</td></tr>
+</table></body></html>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the lottery site"""
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real site
+    connections = 0
+    flaky_failures = 0
+    not_modified = 0
+
+    def setup(self):
+        super().setup()
+        StandInHandler.connections += 1
+
+    def do_GET(self):
+        if self.path == '/flaky' and StandInHandler.flaky_failures < 2:
+            StandInHandler.flaky_failures += 1
+            self.send_page(503, b"busy")
+        elif self.path.startswith('/slow'):
+            time.sleep(0.5)
+            self.send_page(200, RESULTS_PAGE)
+        elif self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                StandInHandler.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self.send_page(200, RESULTS_PAGE, etag='"v1"')
+        elif self.path in ('/results/powerball', '/flaky'):
+            self.send_page(200, RESULTS_PAGE)
+        else:
+            self.send_page(404, b"not found")
+
+    def send_page(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in():
+    """Serve the stand-in on a free local port; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_connection_reuse():
+    """Sequential requests should share one keep-alive connection"""
+    server, base_url = start_stand_in()
+    fetcher = AsyncFetcher(rate=100, burst=100)
+    try:
+        StandInHandler.connections = 0
+        for _ in range(5):
+            response = fetcher.get(f"{base_url}/results/powerball")
+            assert response.status_code == 200
+        assert StandInHandler.connections == 1, f"{StandInHandler.connections} connections opened"
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        assert len(soup.select('.results-table tr')) == 2
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+def test_retry_with_backoff():
+    """503s are retried until the page comes back"""
+    server, base_url = start_stand_in()
+    fetcher = AsyncFetcher(rate=100, burst=100, retries=3, backoff=0.05)
+    try:
+        StandInHandler.flaky_failures = 0
+        response = fetcher.get(f"{base_url}/flaky")
+        assert response.status_code == 200
+        assert fetcher.retries_made == 2
+
+        # Non-retryable statuses come straight back
+        assert fetcher.get(f"{base_url}/missing").status_code == 404
+        assert fetcher.retries_made == 2
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+def test_concurrency_and_rate_limit():
+    """Pages run in parallel up to the host limit, paced by the token bucket"""
+    server, base_url = start_stand_in()
+    urls = [f"{base_url}/slow?page={i}" for i in range(4)]
+    try:
+        fetcher = AsyncFetcher(max_per_host=4, rate=100, burst=100)
+        start = time.time()
+        responses = fetcher.get_many(urls)
+        elapsed = time.time() - start
+        fetcher.close()
+        assert all(r.status_code == 200 for r in responses)
+        assert elapsed < 1.0, f"4 parallel pages took {elapsed:.2f}s"
+
+        # Two requests a second with no burst: four pages need at least 1.5s
+        fetcher = AsyncFetcher(max_per_host=4, rate=2, burst=1)
+        start = time.time()
+        fetcher.get_many([f"{base_url}/results/powerball"] * 4)
+        elapsed = time.time() - start
+        fetcher.close()
+        assert elapsed >= 1.4, f"rate limit not applied ({elapsed:.2f}s)"
+    finally:
+        server.shutdown()
+
+
+def test_snapshots_and_replay():
+    """Pages are snapshotted, refetched conditionally and replayed offline"""
+    server, base_url = start_stand_in()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fetcher = AsyncFetcher(rate=100, burst=100, snapshot_cache=SnapshotCache(cache_dir))
+        try:
+            StandInHandler.not_modified = 0
+            first = fetcher.get(f"{base_url}/etag")
+            assert first.status_code == 200 and not first.unchanged
+
+            # The refetch is conditional; the 304 is answered from the snapshot
+            second = fetcher.get(f"{base_url}/etag")
+            assert StandInHandler.not_modified == 1
+            assert second.status_code == 200 and second.unchanged
+            assert second.content == RESULTS_PAGE
+        finally:
+            fetcher.close()
+            server.shutdown()
+
+        # Replay needs no server at all, even from a fresh process's view of the cache
+        replay = AsyncFetcher(snapshot_cache=SnapshotCache(cache_dir), replay=True)
+        try:
+            assert replay.get(f"{base_url}/etag").content == RESULTS_PAGE
+            assert replay.requests_made == 0
+            try:
+                replay.get(f"{base_url}/never-fetched")
+                assert False, "replay of an unknown page should fail"
+            except LookupError:
+                pass
+        finally:
+            replay.close()
+
+    try:
+        AsyncFetcher(replay=True)
+        assert False, "replay without a snapshot cache should be refused"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    print("🚀 Testing the async fetcher against a local stand-in server")
+    print("=" * 60)
+
+    results = {}
+    for test in (test_connection_reuse, test_retry_with_backoff, test_concurrency_and_rate_limit,
+                 test_snapshots_and_replay):
+        try:
+            test()
+            results[test.__name__] = True
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            results[test.__name__] = False
+
+    print("\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"{name}: {'✅ Success' if passed else '❌ Failed'}")
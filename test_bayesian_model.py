@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from bayesian_model import DirichletNumberModel
+from draw_arrays import DrawArrays
+
+
+def random_arrays(n_draws=300, seed=0):
+    """Draws with random, valid numbers on consecutive days"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws).to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def test_updates_match_batch():
+    """Folding draws in one at a time gives the same posterior as building it in one pass"""
+    arrays = random_arrays()
+    for decay in (1.0, 0.97):
+        batch = DirichletNumberModel.from_arrays(arrays, prior=0.5, powerball_prior=2.0, decay=decay)
+        model = DirichletNumberModel(prior=0.5, powerball_prior=2.0, decay=decay)
+        for main, powerball in zip(arrays.main, arrays.powerball):
+            model.update(main, powerball)
+
+        assert model.n_draws == batch.n_draws == len(arrays)
+        assert np.allclose(model.main_counts, batch.main_counts)
+        assert np.allclose(model.powerball_counts, batch.powerball_counts)
+        for updated, built in zip(model.posterior_means(), batch.posterior_means()):
+            assert np.allclose(updated, built)
+
+
+def test_sampled_tickets_are_valid():
+    """Every ticket has five distinct main numbers in 1-50 and a powerball in 1-20"""
+    model = DirichletNumberModel.from_arrays(random_arrays(), decay=0.99)
+    main, powerballs = model.sample_tickets(count=2000, rng=np.random.default_rng(1))
+
+    assert main.shape == (2000, 5) and powerballs.shape == (2000,)
+    assert ((main >= 1) & (main <= 50)).all()
+    assert (np.diff(main, axis=1) > 0).all(), "main numbers should be sorted and distinct"
+    assert ((powerballs >= 1) & (powerballs <= 20)).all()
+    # Every number can come up
+    assert len(np.unique(main)) == 50 and len(np.unique(powerballs)) == 20
+
+
+if __name__ == "__main__":
+    for test in (test_updates_match_batch, test_sampled_tickets_are_valid):
+        test()
+        print(f"✅ {test.__name__}")
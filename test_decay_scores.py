@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from decay_scores import DecayedFrequencyScores, DEFAULT_HALF_LIVES
+from draw_arrays import DrawArrays
+
+
+def random_arrays(n_draws=300, seed=0):
+    """Draws with random, valid numbers on consecutive days"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws).to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def test_updates_match_batch():
+    """Scores kept up to date draw by draw equal the one-pass scores for every half-life"""
+    arrays = random_arrays()
+    half_lives = DEFAULT_HALF_LIVES + (1,)
+    batch = DecayedFrequencyScores.from_arrays(arrays, half_lives)
+
+    # Half the history in one pass, the rest one draw at a time
+    split = len(arrays) // 2
+    scores = DecayedFrequencyScores.from_arrays(arrays.subset(np.arange(len(arrays)) < split), half_lives)
+    for main, powerball, draw_date in zip(arrays.main[split:], arrays.powerball[split:], arrays.draw_dates[split:]):
+        scores.update(main, powerball, draw_date)
+
+    assert scores.n_draws == batch.n_draws and scores.last_draw_date == batch.last_draw_date
+    assert np.allclose(scores.total_weight, batch.total_weight)
+    for half_life in half_lives:
+        for updated, built in zip(scores.rates(half_life), batch.rates(half_life)):
+            assert np.allclose(updated, built), half_life
+        for updated, built in zip(scores.weights(half_life), batch.weights(half_life)):
+            assert np.allclose(updated, built), half_life
+
+
+def test_half_life_halves_weight():
+    """A draw half_life draws old counts half as much as the newest one"""
+    scores = DecayedFrequencyScores(half_lives=(4,))
+    scores.update([1, 2, 3, 4, 5], 1)
+    for _ in range(4):
+        scores.update([6, 7, 8, 9, 10], 2)
+    assert np.isclose(scores.main_scores[0, 0], 0.5)
+    assert np.isclose(scores.powerball_scores[0, 0], 0.5)
+
+
+if __name__ == "__main__":
+    for test in (test_updates_match_batch, test_half_life_halves_weight):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from driver_pool import WebDriverPool
+
+
+class FakeDriver:
+    """Stands in for a Chrome session"""
+
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.quit_called:
+            raise RuntimeError("session is gone")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakePool(WebDriverPool):
+    def _create(self):
+        driver = FakeDriver()
+        self._uses[id(driver)] = 0
+        self.sessions_started += 1
+        return driver
+
+
+def test_unhealthy_release_wakes_waiter():
+    """A waiter gets a fresh session when the one it waited on is quit"""
+    pool = FakePool(size=1)
+    first = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.2)
+    assert not acquired, "the pool is full, so the waiter should still be waiting"
+
+    pool.release(first, healthy=False)
+    waiter.join(timeout=2)
+    assert not waiter.is_alive(), "waiter was never woken"
+    assert acquired and acquired[0] is not first and first.quit_called
+    assert pool.sessions_started == 2
+
+
+def test_healthy_release_is_reused():
+    pool = FakePool(size=1)
+    first = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    pool.release(first)
+    waiter.join(timeout=2)
+    assert acquired == [first] and pool.sessions_started == 1
+
+
+def test_acquire_times_out():
+    pool = FakePool(size=1)
+    pool.acquire()
+    start = time.monotonic()
+    try:
+        pool.acquire(timeout=0.2)
+        assert False, "a full pool should time out"
+    except TimeoutError:
+        pass
+    assert time.monotonic() - start < 1.0
+
+
+if __name__ == "__main__":
+    for test in (test_unhealthy_release_wakes_waiter, test_healthy_release_is_reused, test_acquire_times_out):
+        test()
+        print(f"✅ {test.__name__}")
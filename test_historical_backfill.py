@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import pandas as pd
+from historical_backfill import HistoricalBackfill
+
+
+def history(start, end):
+    """Tuesday and Friday draws from 2024 on, with made-up numbers, newest first"""
+    dates = [d for d in pd.date_range(max(start, '2024-01-01'), end) if d.day_name() in ('Tuesday', 'Friday')]
+    return [(d, [(d.day + i * 7) % 50 + 1 for i in range(5)], d.month + 1) for d in reversed(dates)]
+
+
+class HistoryHandler(BaseHTTPRequestHandler):
+    """Stand-in for the results history search; one month fails until `broken` is cleared"""
+    broken = '2024-02-01'
+    requests = 0
+
+    def do_GET(self):
+        HistoryHandler.requests += 1
+        query = parse_qs(urlsplit(self.path).query)
+        start, end = query['fromDate'][0], query['toDate'][0]
+        if start == HistoryHandler.broken:
+            self.send_page(404, b"not found")
+            return
+
+        rows = "".join(f"<tr class='result'><td>{d:%d %B %Y}</td><td>{' '.join(map(str, main))}</td><td>{pb}</td></tr>"
+                       for d, main, pb in history(start, end))
+        self.send_page(200, f"<html><body><table>{rows}</table></body></html>".encode())
+
+    def send_page(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_backfill_resumes_from_checkpoint():
+    """A failed shard is retried by the next run; finished shards, empty ones
+    included, are not fetched again"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HistoryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/results"
+    expected = len(history('2024-01-01', '2024-04-30'))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        def backfill():
+            return HistoricalBackfill(data_dir, workers=2, rate=100, base_url=base_url,
+                                      snapshot_dir=None, plan_file=None)
+        try:
+            HistoryHandler.broken, HistoryHandler.requests = '2024-02-01', 0
+            first = backfill().run(datetime(2023, 12, 1), datetime(2024, 4, 30), games=['PowerBall'])
+            assert first['shards'] == 5 and first['completed'] == 4 and first['failed'] == 1
+            assert first['empty'] == 1  # December 2023, before the game "began"
+            assert first['stored'] == expected - len(history('2024-02-01', '2024-02-29'))
+
+            HistoryHandler.broken, HistoryHandler.requests = None, 0
+            second = backfill().run(datetime(2023, 12, 1), datetime(2024, 4, 30), games=['PowerBall'])
+            assert HistoryHandler.requests == 1
+            assert second['resumed'] == 4 and second['completed'] == 1
+
+            third = backfill().run(datetime(2023, 12, 1), datetime(2024, 4, 30), games=['PowerBall'])
+            assert third['completed'] == 0 and HistoryHandler.requests == 1
+
+            # Refetching everything stores nothing twice
+            fresh = backfill().run(datetime(2023, 12, 1), datetime(2024, 4, 30), games=['PowerBall'], fresh=True)
+            assert fresh['completed'] == 5 and fresh['stored'] == 0
+
+            stored = pd.read_csv(f"{data_dir}/powerball_data.csv")
+            assert len(stored) == expected and stored['draw_date'].is_unique
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    test_backfill_resumes_from_checkpoint()
+    print("✅ Backfill resumes from its checkpoint")
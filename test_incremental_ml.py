@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from draw_arrays import DrawArrays
+from incremental_ml import IncrementalNumberModel
+from ml_features import arrays_feature_matrix
+
+
+def random_arrays(n_draws=120, seed=0):
+    """Tuesday and Friday draws with random, valid numbers"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws * 4, freq='D')
+    dates = dates[dates.weekday.isin([1, 4])][:n_draws].to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def test_update_learns_one_row():
+    """A new draw is one partial_fit on the previous feature row, then the row moves on"""
+    arrays = random_arrays()
+    head = arrays.subset(np.arange(len(arrays)) < len(arrays) - 1)
+    model = IncrementalNumberModel.from_arrays(head)
+    features = arrays_feature_matrix(arrays)
+    assert np.allclose(model.current_features, features[-2])
+
+    # The same single step, taken by hand on a copy of the fitted classifiers
+    expected = IncrementalNumberModel.from_arrays(head)
+    target = arrays.incidence[-1:].astype(np.int64)
+    expected.fit_rows(features[-2:-1], target, arrays.powerball[-1:], epochs=1)
+
+    model.update(arrays.main[-1], arrays.powerball[-1], arrays.draw_dates[-1])
+    assert model.n_draws == len(arrays)
+    assert np.allclose(model.current_features, features[-1])
+    for updated, stepped in zip(model.main_models + [model.powerball_model],
+                                expected.main_models + [expected.powerball_model]):
+        assert np.allclose(updated.coef_, stepped.coef_) and np.allclose(updated.intercept_, stepped.intercept_)
+        assert updated.t_ == stepped.t_
+
+
+def test_probabilities_are_valid():
+    model = IncrementalNumberModel.from_arrays(random_arrays())
+    main, powerball = model.predict_proba()
+    assert main.shape == (50,) and powerball.shape == (20,)
+    assert ((main > 0) & (main < 1)).all()
+    assert np.isclose(powerball.sum(), 1) and (powerball >= 0).all()
+
+    # Too little history: the uniform rates
+    main, powerball = IncrementalNumberModel.from_arrays(random_arrays(n_draws=1)).predict_proba()
+    assert np.allclose(main, 0.1) and np.allclose(powerball, 0.05)
+
+
+if __name__ == "__main__":
+    for test in (test_update_learns_one_row, test_probabilities_are_valid):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from draw_arrays import DrawArrays
+from markov_model import TransitionModel
+
+
+def random_arrays(n_draws=200, seed=0):
+    """Draws with random, valid numbers on consecutive days"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws).to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def counted_transitions(arrays, lag):
+    """Lag transitions counted draw by draw: number i at t - lag to number j at t"""
+    counts = np.zeros((50, 50), dtype=np.int64)
+    sources = np.zeros(50, dtype=np.int64)
+    for t in range(lag, len(arrays)):
+        for i in arrays.main[t - lag]:
+            sources[i - 1] += 1
+            for j in arrays.main[t]:
+                counts[i - 1, j - 1] += 1
+    return counts, sources
+
+
+def test_transition_counts():
+    """Each lag counts pairs from exactly that many draws back, and nothing else"""
+    arrays = random_arrays()
+    model = TransitionModel.from_arrays(arrays, lags=(1, 2, 3))
+    for lag in (1, 2, 3):
+        counts, sources = counted_transitions(arrays, lag)
+        assert np.array_equal(model.transitions[lag], counts), lag
+        assert np.array_equal(model.sources[lag], sources), lag
+        assert model.transitions[lag].sum() == 25 * (len(arrays) - lag)
+
+    powerball_counts = np.zeros((20, 20), dtype=np.int64)
+    for previous, current in zip(arrays.powerball[:-1], arrays.powerball[1:]):
+        powerball_counts[previous - 1, current - 1] += 1
+    assert np.array_equal(model.powerball_powerball, powerball_counts)
+    assert model.powerball_main.sum() == 5 * (len(arrays) - 1)
+
+
+def test_lag_two_is_not_joint():
+    """A lag-2 transition is counted whatever the draw in between was"""
+    first, middle, last = [1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15]
+    model = TransitionModel(lags=(2,))
+    for main in (first, middle, last, middle, last):
+        model.update(main, 1)
+    # 1 -> 11 two draws apart once; 6 -> 6 and 11 -> 11 likewise
+    assert model.transitions[2][0, 10] == 1
+    assert model.transitions[2][5, 5] == 1 and model.transitions[2][10, 10] == 1
+    assert model.transitions[2].sum() == 25 * 3
+
+
+def test_updates_match_batch():
+    """Counting draws one at a time gives the same model as one pass"""
+    arrays = random_arrays()
+    batch = TransitionModel.from_arrays(arrays)
+    model = TransitionModel()
+    for main, powerball in zip(arrays.main, arrays.powerball):
+        model.update(main, powerball)
+
+    for lag in batch.lags:
+        assert np.array_equal(model.transitions[lag], batch.transitions[lag])
+        assert np.array_equal(model.sources[lag], batch.sources[lag])
+        assert np.allclose(model.transition_matrix(lag).sum(axis=1), 5)
+    assert np.array_equal(model.powerball_main, batch.powerball_main)
+    assert np.array_equal(model.powerball_powerball, batch.powerball_powerball)
+    for updated, built in zip(model.next_draw_scores(), batch.next_draw_scores()):
+        assert np.allclose(updated, built)
+
+
+if __name__ == "__main__":
+    for test in (test_transition_counts, test_lag_two_is_not_joint, test_updates_match_batch):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import ParameterGrid
+from draw_arrays import DrawArrays
+from model_tuning import (tune_models, tuned_params, load_model_config, save_model_config,
+                          PARAM_GRIDS, DEFAULT_PARAMS)
+
+
+def random_arrays(n_draws=90, seed=0):
+    """Tuesday and Friday draws with random, valid numbers"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws * 4, freq='D')
+    dates = dates[dates.weekday.isin([1, 4])][:n_draws].to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def test_grid_search_covers_every_candidate():
+    """Every grid point is scored on every fold, the best is chosen, and workers agree with one process"""
+    arrays = random_arrays()
+    serial = tune_models(arrays, strategies=['incremental_ml'], n_splits=3, n_workers=1)
+    pooled = tune_models(arrays, strategies=['incremental_ml'], n_splits=3, n_workers=2)
+
+    assert serial['dataset_version'] == arrays.version() and serial['total_draws'] == len(arrays)
+    result = serial['strategies']['incremental_ml']
+    assert result['metric'] == 'log_loss'
+    assert sorted(repr(c['params']) for c in result['candidates']) == \
+        sorted(repr(params) for params in ParameterGrid(PARAM_GRIDS['incremental_ml']))
+    assert all(len(c['fold_scores']) == 3 for c in result['candidates'])
+    # Lower log loss is better
+    assert result['score'] == min(c['mean'] for c in result['candidates'])
+    assert result['params'] == result['candidates'][0]['params']
+    assert [c['mean'] for c in pooled['strategies']['incremental_ml']['candidates']] == \
+        [c['mean'] for c in result['candidates']]
+
+
+def test_tuned_params_need_a_matching_dataset():
+    arrays = random_arrays()
+    tuned = {'alpha': 1.0, 'epochs': 1}
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_file = os.path.join(config_dir, "model_config.json")
+        save_model_config({'PowerBall': {'dataset_version': arrays.version(),
+                                         'strategies': {'incremental_ml': {'params': tuned}}}}, config_file)
+        config = load_model_config(config_file)
+
+    assert tuned_params(config, 'PowerBall', 'incremental_ml', arrays.version()) == tuned
+    assert tuned_params(config, 'PowerBall', 'incremental_ml') == tuned
+    # New draws since tuning, or nothing tuned for this game or strategy
+    assert tuned_params(config, 'PowerBall', 'incremental_ml', 'something-else') == DEFAULT_PARAMS['incremental_ml']
+    assert tuned_params(config, 'PowerBall Plus', 'incremental_ml', arrays.version()) == DEFAULT_PARAMS['incremental_ml']
+    assert tuned_params(config, 'PowerBall', 'machine_learning', arrays.version()) == DEFAULT_PARAMS['machine_learning']
+
+
+if __name__ == "__main__":
+    for test in (test_grid_search_covers_every_candidate, test_tuned_params_need_a_matching_dataset):
+        test()
+        print(f"✅ {test.__name__}")
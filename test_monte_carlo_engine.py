@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import numpy as np
+from monte_carlo_engine import MonteCarloEngine, sample_main_numbers, STATISTIC_TAILS, COUNT_HISTOGRAMS
+
+
+def test_sampled_draws_are_sorted_and_distinct():
+    """Every sampled row is five distinct numbers from 1-50, in increasing order"""
+    draws = sample_main_numbers(np.random.default_rng(3), 200000)
+    assert draws.shape == (5, 200000)
+    assert (np.diff(draws.astype(np.int16), axis=0) > 0).all()
+    assert draws.min() == 0 and draws.max() == 49
+    # Uniform over the 50 numbers
+    counts = np.bincount(draws.ravel(), minlength=50)
+    assert np.abs(counts / counts.mean() - 1).max() < 0.05
+
+
+def test_seeded_simulation_is_reproducible_across_workers():
+    """One seed gives the same distributions however many processes share the chunks
+    (400 histories of 100 draws are 8 chunks of 50)"""
+    def simulate(n_workers):
+        engine = MonteCarloEngine(n_histories=400, rows_per_chunk=5000, n_workers=n_workers, seed=11)
+        return engine.simulate(100), engine
+
+    serial, serial_engine = simulate(1)
+    pooled, pooled_engine = simulate(3)
+    for stat in STATISTIC_TAILS:
+        assert len(serial[stat]) == 400 and np.array_equal(serial[stat], pooled[stat]), stat
+    for name in COUNT_HISTOGRAMS:
+        assert np.array_equal(serial_engine._histograms[(100, name)], pooled_engine._histograms[(100, name)])
+
+    other = MonteCarloEngine(n_histories=400, rows_per_chunk=5000, n_workers=1, seed=12).simulate(100)
+    assert not np.array_equal(serial['main_chi_square'], other['main_chi_square'])
+
+
+def test_cache_round_trip():
+    """Distributions saved to the npz cache load back unchanged and are not simulated again"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_file = os.path.join(cache_dir, "mc", "null.npz")
+        engine = MonteCarloEngine(n_histories=200, n_workers=1, seed=5, cache_file=cache_file)
+        simulated = engine.simulate(50)
+        assert os.path.exists(cache_file)
+
+        reloaded = MonteCarloEngine(n_histories=200, n_workers=1, seed=99, cache_file=cache_file)
+        assert reloaded.is_cached(50) and not reloaded.is_cached(51)
+        assert not reloaded.is_cached(50, n_histories=201)
+        for stat, samples in reloaded.simulate(50).items():
+            assert samples.dtype == np.float32 and np.array_equal(samples, simulated[stat]), stat
+        for name in COUNT_HISTOGRAMS:
+            assert np.array_equal(reloaded._histograms[(50, name)], engine._histograms[(50, name)])
+
+
+if __name__ == "__main__":
+    for test in (test_sampled_draws_are_sorted_and_distinct, test_seeded_simulation_is_reproducible_across_workers,
+                 test_cache_round_trip):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from draw_arrays import DrawArrays
+from online_regression import FeatureTrends, RunningRegression, draw_features, FEATURES
+
+
+def random_arrays(n_draws=300, seed=0):
+    """Draws with random, valid numbers on consecutive days"""
+    rng = np.random.default_rng(seed)
+    main = np.sort(np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(n_draws)]), axis=1)
+    powerball = rng.integers(1, 21, n_draws)
+    dates = pd.date_range('2020-01-03', periods=n_draws).to_numpy()
+    return DrawArrays(main, powerball, dates, pd.DatetimeIndex(dates).day_name().to_numpy())
+
+
+def assert_fit(fit, x, y):
+    """A fit with its intercept at x[0] matches np.polyfit"""
+    slope, intercept = np.polyfit(x - x[0], y, 1)
+    assert fit['n'] == len(x)
+    assert np.isclose(fit['slope'], slope) and np.isclose(fit['intercept'], intercept)
+    assert np.isclose(fit['r_squared'], np.corrcoef(x, y)[0, 1] ** 2)
+
+
+def test_running_regression_matches_polyfit():
+    rng = np.random.default_rng(2)
+    x, y = np.arange(40), rng.integers(15, 240, 40)
+    regression = RunningRegression()
+    for t in range(40):
+        regression.add(t, y[t])
+    # Slide the first 10 points out
+    for t in range(10):
+        regression.remove(t, y[t])
+    fit = regression.fit()
+    slope, intercept = np.polyfit(x[10:], y[10:], 1)
+    assert fit['n'] == 30 and np.isclose(fit['slope'], slope) and np.isclose(fit['intercept'], intercept)
+
+
+def test_feature_trends_match_polyfit():
+    """Full-history, windowed and sliding fits equal polyfit, built at once or draw by draw"""
+    arrays = random_arrays()
+    features = draw_features(arrays.main, arrays.powerball)
+    x = np.arange(len(arrays))
+
+    split = 120
+    appended = FeatureTrends.from_arrays(arrays.subset(x < split))
+    for main, powerball in zip(arrays.main[split:], arrays.powerball[split:]):
+        appended.append(main, powerball)
+
+    for trends in (FeatureTrends.from_arrays(arrays), appended):
+        assert trends.n_draws == len(arrays)
+        for feature in FEATURES:
+            y = features[feature]
+            assert_fit(trends.window_fit(feature), x, y)
+            for start, stop in ((0, 50), (100, 250), (250, 300), (280, None)):
+                assert_fit(trends.window_fit(feature, start, stop), x[start:stop], y[start:stop])
+            for size, report in trends.sliding_report().items():
+                assert_fit(report[feature], x[-size:], y[-size:])
+
+
+def test_unknown_threshold_is_rejected():
+    try:
+        FeatureTrends(thresholds={'sums': 2.0})
+        assert False, "a threshold for a feature that doesn't exist should be rejected"
+    except ValueError as e:
+        assert 'sums' in str(e)
+    assert FeatureTrends(thresholds={'sum': 2.0}).thresholds['sum'] == 2.0
+
+
+if __name__ == "__main__":
+    for test in (test_running_regression_matches_polyfit, test_feature_trends_match_polyfit,
+                 test_unknown_threshold_is_rejected):
+        test()
+        print(f"✅ {test.__name__}")
@@ -2,6 +2,7 @@
 
 import requests
 from bs4 import BeautifulSoup
+from async_fetcher import get_fetcher
 import re
 from datetime import datetime
 
@@ -19,7 +20,7 @@ def test_powerball_scraping():
     
     try:
         print(f"📡 Connecting to: {url}")
-        response = requests.get(url, headers=headers, timeout=15)
+        response = get_fetcher().get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         print(f"✅ Successfully connected! Status: {response.status_code}")
@@ -109,7 +110,7 @@ def test_powerball_plus_scraping():
     
     try:
         print(f"📡 Connecting to: {url}")
-        response = requests.get(url, headers=headers, timeout=15)
+        response = get_fetcher().get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         print(f"✅ Successfully connected! Status: {response.status_code}")